@@ -4,6 +4,23 @@ import path from 'path'
 
 let pythonCVProcess: any = null
 
+const CV_SERVER_URL = 'http://localhost:5000'
+
+// Tunggu sampai server Flask menjawab /ready (port sudah terbuka). Warm-up kamera dan
+// detector berjalan di background: 200 = siap, 503 = masih warm-up
+async function waitForServer(timeoutMs: number) {
+  const deadline = Date.now() + timeoutMs
+  while (Date.now() < deadline && pythonCVProcess && !pythonCVProcess.killed) {
+    try {
+      const response = await fetch(`${CV_SERVER_URL}/ready`, { cache: 'no-store' })
+      return await response.json()
+    } catch (error) {
+      await new Promise(resolve => setTimeout(resolve, 200))
+    }
+  }
+  return null
+}
+
 export async function POST(request: NextRequest) {
   try {
     // Path ke Flask server
@@ -56,14 +73,17 @@ export async function POST(request: NextRequest) {
       console.error(`Python CV stderr: ${data.toString()}`)
     })
 
-    // Wait for server to start
-    await new Promise(resolve => setTimeout(resolve, 3000))
+    // Wait for server to bind its port
+    const readiness = await waitForServer(10000)
 
     if (pythonCVProcess && !pythonCVProcess.killed) {
       return NextResponse.json({ 
         success: true, 
         message: 'Python CV Flask server started successfully',
-        url: 'http://localhost:5000',
+        url: CV_SERVER_URL,
+        readyUrl: `${CV_SERVER_URL}/ready`,
+        ready: readiness?.ready ?? false,
+        startup: readiness,
         pid: pythonCVProcess.pid 
       })
     } else {
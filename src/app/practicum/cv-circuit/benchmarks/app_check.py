@@ -0,0 +1,79 @@
+"""
+App Check
+Cek cepat alur aplikasi secara headless (tanpa kamera, layar dan MediaPipe): komponen
+ditempatkan, kabel digambar lewat gesture pinch yang sama dengan aplikasi, lalu hasil
+perhitungan rangkaian dibandingkan dengan yang diharapkan
+
+Contoh:
+    python benchmarks/app_check.py
+"""
+
+import os
+import sys
+
+# Headless: pygame tanpa layar
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('CV_HAND_BACKEND', 'scripted')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from main import CircuitBuilderApp
+from src.streaming.frame_capture import SyntheticFrameSource
+
+
+def pinch(app, position, is_pinching=True, hand_id=1):
+    """Satu frame interaksi pinch untuk satu tangan"""
+    app.handle_pinch_interaction({'hand_id': hand_id, 'is_pinching': is_pinching,
+                                  'position': position})
+
+
+def draw_wire(app, start, end):
+    """Ambil kabel dari panel, sentuh komponen di start, lepas di komponen di end"""
+    wire_icon = app.component_panel.components['wire']['pos']
+    pinch(app, wire_icon)
+    pinch(app, start)
+    pinch(app, end)
+    pinch(app, end, is_pinching=False)
+
+
+def check_parallel_lamps():
+    """Dua lampu yang masing-masing dikabel ke kedua kutub baterai = rangkaian paralel"""
+    app = CircuitBuilderApp(frame_source=SyntheticFrameSource(fps=0))
+    battery = (300, 400)
+    lamps = [(500, 300), (500, 500)]
+    app.circuit.add('battery', battery, app._get_default_value('battery'))
+    for lamp in lamps:
+        app.circuit.add('lamp', lamp, app._get_default_value('lamp'))
+
+    # Perhitungan sebelum ada kabel (loop seri); kabel baru harus memicu perhitungan ulang
+    app.update_calculations()
+
+    # Terminal dipilih dari sisi yang disentuh: kanan baterai (+) ke kiri lampu, dst.
+    for x, y in lamps:
+        draw_wire(app, (battery[0] + 10, battery[1]), (x - 10, y))
+        draw_wire(app, (battery[0] - 10, battery[1]), (x + 10, y))
+
+    app.update_calculations()
+    wires = len(app.wire_system.get_connected_components())
+    circuit_type = app.calculator.circuit_type
+    app.cleanup()
+    return wires == 4 and circuit_type == 'parallel', f"kabel={wires}, tipe={circuit_type}"
+
+
+CHECKS = [check_parallel_lamps]
+
+
+def main():
+    failed = 0
+    for check in CHECKS:
+        ok, detail = check()
+        print(f"{'OK  ' if ok else 'GAGAL'} {check.__name__}: {detail}")
+        failed += not ok
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
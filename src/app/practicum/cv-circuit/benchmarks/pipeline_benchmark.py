@@ -0,0 +1,134 @@
+"""
+Pipeline Benchmark
+Menjalankan pipeline CircuitBuilderApp secara headless (tanpa kamera dan tanpa layar)
+dan melaporkan latensi per tahap (p50/p95/p99) serta FPS
+
+Contoh:
+    # Frame sintetis + tangan sintetis (tanpa MediaPipe)
+    python benchmarks/pipeline_benchmark.py --frames 300 --landmarks scripted
+
+    # Rekam sesi dengan kamera, lalu putar ulang dengan landmark hasil rekaman
+    python main.py --record recordings/sesi1
+    python benchmarks/pipeline_benchmark.py --source recordings/sesi1 --landmarks recorded
+
+    # Buat rekaman sintetis yang bisa dipakai ulang untuk membandingkan perubahan
+    python benchmarks/pipeline_benchmark.py --make-recording recordings/synthetic --frames 300
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Headless: pygame tanpa layar
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from main import CircuitBuilderApp
+from src.replay.recorder import META_FILE, SessionRecorder
+from src.replay.replay_engine import (RecordedLandmarkFeed, RecordingFrameSource, ReplayEngine,
+                                      ScriptedHandFeed, load_recording)
+from src.streaming.frame_capture import SyntheticFrameSource
+
+STAGE_ORDER = ('capture', 'detect', 'interaction', 'calculate', 'render', 'total')
+
+
+def open_source(spec):
+    """Buka sumber frame tanpa pacing: 'synthetic[:WxH]' atau direktori rekaman"""
+    if spec.startswith('synthetic'):
+        width, height = 640, 480
+        if ':' in spec:
+            width, height = (int(v) for v in spec.split(':', 1)[1].lower().split('x'))
+        return SyntheticFrameSource(width, height, fps=0)
+    if os.path.exists(os.path.join(spec, META_FILE)):
+        return RecordingFrameSource(spec)
+    raise ValueError(f"Sumber tidak dikenal: {spec} (pakai 'synthetic' atau direktori rekaman)")
+
+
+def make_landmark_feed(mode, source_spec, hands=1):
+    """Buat pengganti detector sesuai mode"""
+    if mode == 'detector':
+        return None
+    if mode == 'scripted':
+        return ScriptedHandFeed(hands=hands)
+    if mode == 'recorded':
+        _, records = load_recording(source_spec)
+        return RecordedLandmarkFeed(records)
+    raise ValueError(f"Mode landmark tidak dikenal: {mode}")
+
+
+def print_report(report):
+    """Cetak tabel latensi per tahap"""
+    print(f"\nFrames: {report['frames']}  Durasi: {report['duration_s']} s  FPS: {report['fps']}")
+    print(f"{'Tahap':<12}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    stages = report['stages']
+    for name in STAGE_ORDER + tuple(sorted(set(stages) - set(STAGE_ORDER))):
+        if name not in stages:
+            continue
+        s = stages[name]
+        print(f"{name:<12}{s['mean_ms']:>9.2f}{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}"
+              f"{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}")
+
+
+def make_recording(path, frames):
+    """Rekam frame sintetis + tangan sintetis melalui pipeline (untuk replay yang reproducible)"""
+    app = CircuitBuilderApp(frame_source=SyntheticFrameSource(fps=0),
+                            recorder=SessionRecorder(path))
+    try:
+        ReplayEngine(app, ScriptedHandFeed(), warmup=0).run(frames)
+    finally:
+        app.recorder.close()
+        app.cap.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pipeline frame CircuitBuilderApp')
+    parser.add_argument('--source', default='synthetic',
+                        help="'synthetic[:WxH]' atau direktori rekaman (main.py --record)")
+    parser.add_argument('--landmarks', default='detector',
+                        choices=['detector', 'scripted', 'recorded'],
+                        help='detector = backend landmark (lihat --backend), scripted = tangan '
+                             'sintetis, recorded = landmark dari rekaman')
+    parser.add_argument('--backend', default=None,
+                        help="Backend untuk --landmarks detector: 'auto', 'mediapipe[:0|1]', "
+                             "'onnx[:PATH]' atau 'scripted[:HANDS]' (default: env CV_HAND_BACKEND)")
+    parser.add_argument('--frames', type=int, default=300,
+                        help='Jumlah frame yang diukur (rekaman: maksimum)')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--json', default=None, help='Simpan laporan ke file JSON')
+    parser.add_argument('--hands', type=int, default=1,
+                        help='Jumlah tangan sintetis untuk --landmarks scripted')
+    parser.add_argument('--make-recording', default=None, metavar='DIR',
+                        help='Buat rekaman sintetis ke DIR lalu keluar')
+    args = parser.parse_args()
+
+    if args.make_recording:
+        make_recording(args.make_recording, args.frames)
+        return
+
+    if args.backend:
+        os.environ['CV_HAND_BACKEND'] = args.backend
+    app = CircuitBuilderApp(frame_source=open_source(args.source))
+    try:
+        engine = ReplayEngine(app, make_landmark_feed(args.landmarks, args.source, args.hands),
+                              warmup=args.warmup)
+        report = engine.run(args.frames)
+    finally:
+        app.cap.release()
+
+    report.update({'source': args.source, 'landmarks': args.landmarks,
+                   'backend': app.pinch_detector.backend_name,
+                   'circuit_components': len(app.circuit_components)})
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Laporan disimpan: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Stream Load Test
+Membuka banyak koneksi /video_feed sekaligus dan mengukur FPS per client serta
+latensi frame (waktu publish di server -> diterima client, via header X-Timestamp)
+
+Contoh:
+    CV_FRAME_SOURCE=synthetic python web_cv_server_async.py &
+    python benchmarks/stream_load_test.py --clients 200 --duration 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+
+def percentile(values, fraction):
+    """Hitung persentil sederhana (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def read_mjpeg_frames(response, on_frame):
+    """
+    Parse stream multipart MJPEG dari server (mengandalkan header Content-Length)
+
+    Args:
+        response: aiohttp ClientResponse
+        on_frame: Callback(headers_dict, jpeg_bytes)
+    """
+    buffer = b''
+    async for chunk in response.content.iter_any():
+        buffer += chunk
+        while True:
+            header_end = buffer.find(b'\r\n\r\n')
+            if header_end < 0:
+                break
+
+            headers = {}
+            for line in buffer[:header_end].split(b'\r\n'):
+                if b':' in line:
+                    key, value = line.split(b':', 1)
+                    headers[key.strip().lower().decode()] = value.strip().decode()
+
+            length = int(headers.get('content-length', -1))
+            body_start = header_end + 4
+            if length < 0 or len(buffer) < body_start + length + 2:
+                break
+
+            on_frame(headers, buffer[body_start:body_start + length])
+            buffer = buffer[body_start + length + 2:]
+
+
+async def run_client(session, url, duration, client_stats):
+    """Jalankan satu client penonton selama `duration` detik"""
+    started = time.perf_counter()
+    client_stats.update({'frames': 0, 'first_frame': None, 'latencies': [],
+                         'gaps': [], 'error': None})
+    last_arrival = None
+
+    def on_frame(headers, _data):
+        nonlocal last_arrival
+        now = time.perf_counter()
+        if client_stats['first_frame'] is None:
+            client_stats['first_frame'] = now - started
+        if last_arrival is not None:
+            client_stats['gaps'].append(now - last_arrival)
+        last_arrival = now
+
+        if 'x-timestamp' in headers:
+            client_stats['latencies'].append(time.time() - float(headers['x-timestamp']))
+        client_stats['frames'] += 1
+
+    try:
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=10)
+        async with session.get(url, timeout=timeout) as response:
+            await asyncio.wait_for(read_mjpeg_frames(response, on_frame), duration)
+    except asyncio.TimeoutError:
+        pass
+    except aiohttp.ClientError as error:
+        client_stats['error'] = str(error)
+    client_stats['elapsed'] = time.perf_counter() - started
+
+
+async def run_load_test(base_url, clients, duration, session_id, ramp_up):
+    """Jalankan semua client dan kembalikan statistik per client"""
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.post(f"{base_url}/start_stream", params={'session': session_id}) as response:
+            print(f"start_stream: {response.status} {await response.text()}")
+
+        url = f"{base_url}/video_feed?session={session_id}"
+        stats = [{} for _ in range(clients)]
+        tasks = []
+        for i in range(clients):
+            tasks.append(asyncio.create_task(run_client(session, url, duration, stats[i])))
+            if ramp_up:
+                await asyncio.sleep(ramp_up / clients)
+        await asyncio.gather(*tasks)
+    return stats
+
+
+def print_report(stats):
+    """Cetak ringkasan hasil load test"""
+    fps_values = [s['frames'] / s['elapsed'] for s in stats if s.get('elapsed')]
+    latencies = [l for s in stats for l in s['latencies']]
+    gaps = [g for s in stats for g in s['gaps']]
+    first_frames = [s['first_frame'] for s in stats if s['first_frame'] is not None]
+    errors = [s['error'] for s in stats if s['error']]
+
+    print("=" * 50)
+    print(f"Clients: {len(stats)}  (error: {len(errors)}, tanpa frame: {len(stats) - len(first_frames)})")
+    if fps_values:
+        print(f"FPS per client: mean {statistics.mean(fps_values):.1f}  "
+              f"min {min(fps_values):.1f}  p5 {percentile(fps_values, 0.05):.1f}  "
+              f"max {max(fps_values):.1f}")
+    if latencies:
+        print(f"Latensi frame (ms): p50 {percentile(latencies, 0.5) * 1000:.1f}  "
+              f"p95 {percentile(latencies, 0.95) * 1000:.1f}  "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f}  "
+              f"max {max(latencies) * 1000:.1f}")
+    if gaps:
+        print(f"Jeda antar frame (ms): p50 {percentile(gaps, 0.5) * 1000:.1f}  "
+              f"p99 {percentile(gaps, 0.99) * 1000:.1f}")
+    if first_frames:
+        print(f"Frame pertama (ms): p50 {percentile(first_frames, 0.5) * 1000:.1f}  "
+              f"p99 {percentile(first_frames, 0.99) * 1000:.1f}")
+    for error in sorted(set(errors))[:5]:
+        print(f"  error: {error}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Load test untuk endpoint /video_feed')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--session', default='loadtest')
+    parser.add_argument('--ramp-up', type=float, default=2.0,
+                        help='Waktu (detik) untuk membuka semua koneksi')
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load_test(args.url.rstrip('/'), args.clients, args.duration,
+                                      args.session, args.ramp_up))
+    print_report(stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,13 @@ Circuit Builder Computer Vision - Main Application
 Aplikasi untuk siswa SMA belajar rangkaian listrik menggunakan deteksi gesture tangan.
 """
 
+import time
+
+# Awal import modul aplikasi (fase 'imports' pada laporan cold start)
+_IMPORT_START = time.perf_counter()
+
+import argparse
+import threading
 import cv2
 import pygame
 import sys
@@ -11,66 +18,142 @@ import os
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
+from src.hand_detection.inference_pool import InferencePool
 from src.hand_detection.pinch_detector import PinchDetector
 from src.ui.component_panel import ComponentPanel
 from src.circuit_logic.wire_system import WireSystem
 from src.circuit_logic.calculator import CircuitCalculator
+from src.circuit_logic.circuit_model import CircuitModel
+from src.circuit_logic.spatial_index import COMPONENT_SIZES, DEFAULT_COMPONENT_SIZE
 from src.ui.interface import MainInterface
+from src.streaming.frame_capture import open_frame_source
+from src.replay.recorder import SessionRecorder
+from src.utils.frame_buffers import FrameBuffers
+from src.utils.metrics import METRICS
+from src.utils.profiling import NULL_TIMER
+from src.utils.startup import StartupReport
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
 
 class CircuitBuilderApp:
     """Main application class for Circuit Builder CV"""
     
-    def __init__(self):
-        """Initialize application"""
+    def __init__(self, frame_source=None, recorder=None):
+        """
+        Initialize application
+        
+        Args:
+            frame_source: Index kamera, 'synthetic', path file video atau objek sumber frame
+                          (default: env CV_FRAME_SOURCE atau kamera 0)
+            recorder: SessionRecorder opsional untuk merekam frame + output detector
+        """
+        # Durasi cold start per fase (dicetak setelah detector siap)
+        self.startup = StartupReport(started_at=_IMPORT_START)
+        self.startup.record('imports', _IMPORT_SECONDS)
+        
         # Initialize pygame
-        pygame.init()
-        self.screen_width = 1024
-        self.screen_height = 768
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Circuit Builder CV - Praktikum Listrik Statis")
+        with self.startup.phase('pygame_init'):
+            pygame.init()
+            self.screen_width = 1024
+            self.screen_height = 768
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+            pygame.display.set_caption("Circuit Builder CV - Praktikum Listrik Statis")
         
         # Initialize camera
-        self.cap = cv2.VideoCapture(0)
+        if frame_source is None:
+            frame_source = os.environ.get('CV_FRAME_SOURCE', '0')
+        with self.startup.phase('camera_open'):
+            self.cap = open_frame_source(frame_source)
+        self.recorder = recorder
         if not self.cap.isOpened():
             print("Error: Tidak dapat membuka kamera!")
             sys.exit(1)
             
+        # Inference di proses terpisah (CV_INFERENCE_WORKERS > 0) agar render tidak menunggu MediaPipe
+        inference_workers = int(os.environ.get('CV_INFERENCE_WORKERS', 0))
+        self.inference_pool = InferencePool(num_workers=inference_workers) if inference_workers > 0 else None
+        
         # Initialize components
-        self.pinch_detector = PinchDetector()
+        with self.startup.phase('detector_init'):
+            self.pinch_detector = PinchDetector(inference_pool=self.inference_pool)
+        # Warm-up detector di background (run()); selama berjalan frame tampil tanpa deteksi
+        self.detector_warmup = None
         self.component_panel = ComponentPanel(self.screen_width, self.screen_height)
         self.wire_system = WireSystem()
         self.calculator = CircuitCalculator()
+        # Buffer mirror/salinan frame dipakai ulang setiap frame (loop utama single-thread)
+        self.frame_buffers = FrameBuffers()
         self.interface = MainInterface(self.screen, self.screen_width, self.screen_height)
+        # Anotasi tangan di inset kamera (CV_DRAW_LANDMARKS=0: tidak digambar)
+        self.interface.draw_landmarks = os.environ.get('CV_DRAW_LANDMARKS', '1') != '0'
         
-        # Application state
-        self.dragging_component = None
-        self.dragging_offset = (0, 0)
-        self.dragging_existing_id = None  # Track ID of existing component being moved
-        self.circuit_components = []
+        # Application state: state drag per tangan (hand_id -> dict dari _new_drag)
+        self.hand_drags = {}
+        self.wire_hand = None  # Tangan yang sedang menarik kabel (kabel aktif hanya satu)
+        self.circuit = CircuitModel()
+        self.calculated_version = None  # (version rangkaian, version kabel) perhitungan terakhir
         self.clock = pygame.time.Clock()
         self.running = True
         
+        # HUD debug latensi per tahap (toggle dengan F3)
+        self.show_debug_hud = os.environ.get('CV_DEBUG_HUD') == '1'
+        
         print("Circuit Builder CV berhasil diinisialisasi!")
         print("Gunakan pinch gesture untuk berinteraksi dengan komponen.")
         
-    def handle_pinch_interaction(self, pinch_data):
-        """Handle pinch gesture interactions"""
+    def _new_drag(self):
+        """State drag kosong untuk satu tangan"""
+        return {
+            'component': None,     # Tipe komponen yang di-drag
+            'offset': (0, 0),
+            'existing_id': None,   # ID komponen lama yang dipindah (None = komponen baru)
+            'temp_pos': None       # Posisi sementara untuk render
+        }
+    
+    def handle_hands(self, hands):
+        """
+        Jalankan interaksi pinch untuk setiap tangan yang terlihat
+        
+        Tangan yang tidak lagi terlihat melepas komponen yang sedang di-drag-nya.
+        
+        Args:
+            hands: List data tangan dari PinchDetector.detect_hands
+        """
+        visible = set()
+        for pinch_data in hands:
+            visible.add(pinch_data['hand_id'])
+            self.handle_pinch_interaction(pinch_data)
+        
+        for hand_id in [hand_id for hand_id in self.hand_drags if hand_id not in visible]:
+            self.handle_pinch_interaction(None, hand_id)
+            del self.hand_drags[hand_id]
+    
+    def handle_pinch_interaction(self, pinch_data, hand_id=None):
+        """Handle pinch gesture interactions untuk satu tangan"""
+        if hand_id is None:
+            hand_id = pinch_data.get('hand_id', 0) if pinch_data else 0
+        drag = self.hand_drags.setdefault(hand_id, self._new_drag())
+        
         if not pinch_data or not pinch_data['is_pinching']:
-            # Release any dragging component
-            if self.dragging_component:
-                self._place_component(pinch_data['position'] if pinch_data else None)
+            # Release any dragging component (kabel yang tersambung di kedua ujung disimpan)
+            if drag['component'] == 'wire' and self.wire_hand == hand_id and self._finish_wire():
+                drag.update(self._new_drag())
+            elif drag['component']:
+                self._place_component(drag, pinch_data['position'] if pinch_data else None)
+            if self.wire_hand == hand_id:
+                self.wire_hand = None
             return
             
         pinch_pos = pinch_data['position']
         
         # Check if we're pinching an existing component first
-        if not self.dragging_component:
+        if not drag['component']:
             existing_component = self._check_existing_component_selection(pinch_pos)
             if existing_component:
                 # Start dragging existing component
-                self.dragging_component = existing_component['type']
-                self.dragging_existing_id = existing_component['id']
-                self.dragging_offset = (
+                drag['component'] = existing_component['type']
+                drag['existing_id'] = existing_component['id']
+                drag['offset'] = (
                     pinch_pos[0] - existing_component['position'][0],
                     pinch_pos[1] - existing_component['position'][1]
                 )
@@ -78,21 +161,25 @@ class CircuitBuilderApp:
                 return
         
         # Check component selection from panel
-        if not self.dragging_component:
+        if not drag['component']:
             selected = self.component_panel.check_component_selection(pinch_pos)
+            # Kabel aktif hanya satu: tangan lain tidak bisa ikut menarik kabel
+            if selected == 'wire' and self.wire_hand not in (None, hand_id):
+                selected = None
             if selected:
-                self.dragging_component = selected
-                self.dragging_existing_id = None  # New component
-                self.dragging_offset = (0, 0)
+                drag['component'] = selected
+                drag['existing_id'] = None  # New component
+                drag['offset'] = (0, 0)
                 print(f"Memilih komponen: {selected}")
         
         # Handle wire interaction
-        if self.dragging_component == 'wire':
+        if drag['component'] == 'wire':
+            self.wire_hand = hand_id
             self._handle_wire_interaction(pinch_pos)
         
         # Handle component dragging
-        elif self.dragging_component:
-            self._handle_component_drag(pinch_pos)
+        elif drag['component']:
+            self._handle_component_drag(drag, pinch_pos)
     
     def _check_existing_component_selection(self, pinch_pos):
         """Check if pinch position is over an existing component in workspace"""
@@ -100,20 +187,18 @@ class CircuitBuilderApp:
         if pinch_pos[1] <= self.component_panel.panel_height:
             return None
             
-        # Size map untuk detection area
-        size_map = {
-            'battery': (80, 50),
-            'lamp': (60, 60),
-            'resistor': (80, 30),
-            'switch': (80, 40),
-            'wire': (60, 20)
-        }
+        # Kandidat dari spatial index; area deteksi = bounding box + 10 pixel
+        candidates = self.circuit.query(pinch_pos, margin=10)
+        # Komponen yang sedang dipegang tangan lain tidak bisa diambil
+        held = {drag['existing_id'] for drag in self.hand_drags.values()}
         
         # Check each component (reverse order untuk priority komponen di atas)
-        for component in reversed(self.circuit_components):
+        for component in reversed(candidates):
+            if component['id'] in held:
+                continue
             comp_pos = component['position']
             comp_type = component['type']
-            comp_size = size_map.get(comp_type, (50, 50))
+            comp_size = COMPONENT_SIZES.get(comp_type, DEFAULT_COMPONENT_SIZE)
             
             # Area detection yang lebih besar untuk easier interaction
             detection_w = comp_size[0] + 20
@@ -126,14 +211,14 @@ class CircuitBuilderApp:
                 
         return None
     
-    def _handle_component_drag(self, pinch_pos):
+    def _handle_component_drag(self, drag, pinch_pos):
         """Handle dragging of components"""
         # Update component position during drag
-        drag_x = pinch_pos[0] - self.dragging_offset[0]
-        drag_y = pinch_pos[1] - self.dragging_offset[1]
+        drag_x = pinch_pos[0] - drag['offset'][0]
+        drag_y = pinch_pos[1] - drag['offset'][1]
         
         # Store temporary position for rendering
-        self.temp_component_pos = (drag_x, drag_y)
+        drag['temp_pos'] = (drag_x, drag_y)
     
     def _handle_wire_interaction(self, pinch_pos):
         """Handle wire placement and connection"""
@@ -145,45 +230,58 @@ class CircuitBuilderApp:
             self.wire_system.update_wire_end(pinch_pos)
             
             # Check for connections
-            connections = self.wire_system.check_connection(self.circuit_components)
-            if connections:
-                print(f"Koneksi terdeteksi: {connections}")
+            connections = self.wire_system.check_connection(self.circuit_components, self.circuit)
+            if self.wire_system.active_wire['start_connection'] is None:
+                # Kabel diambil dari ikon panel: mulai dari komponen pertama yang disentuh
+                touched = [c for c in connections if c['wire_end'] == 'end']
+                if touched:
+                    self.wire_system.start_wire_placement(pinch_pos)
+                    self.wire_system.apply_connections([dict(touched[0], wire_end='start')])
+                    print(f"Kabel dimulai dari {touched[0]['component']['type']}")
     
-    def _place_component(self, position):
+    def _finish_wire(self):
+        """
+        Sambungkan ujung kabel aktif ke komponen di bawahnya dan simpan kabelnya
+        
+        Returns:
+            bool: True jika kabel tersambung di kedua ujung (kabel disimpan); False =
+                  kabel aktif dibatalkan
+        """
+        wire = self.wire_system.active_wire
+        if wire is None:
+            return False
+        ends = [c for c in self.wire_system.check_connection(self.circuit_components, self.circuit)
+                if c['wire_end'] == 'end' and c['component']['id'] != wire['start_connection']]
+        self.wire_system.apply_connections(ends[-1:])
+        if not wire['is_connected']:
+            self.wire_system.cancel_wire_placement()
+            return False
+        self.wire_system.finish_wire_placement()
+        print(f"Kabel tersambung: komponen {wire['start_connection']} - {wire['end_connection']}")
+        return True
+    
+    def _place_component(self, drag, position):
         """Place component in circuit area"""
-        if self.dragging_component and position:
+        component = drag['component']
+        if component and position:
             # Only place if not in panel area
             if position[1] > self.component_panel.panel_height:
                 
-                if self.dragging_existing_id is not None:
+                if drag['existing_id'] is not None:
                     # Moving existing component
-                    for component in self.circuit_components:
-                        if component['id'] == self.dragging_existing_id:
-                            component['position'] = position
-                            print(f"Komponen {self.dragging_component} dipindah ke {position}")
-                            break
+                    if self.circuit.move(drag['existing_id'], position):
+                        print(f"Komponen {component} dipindah ke {position}")
                 else:
                     # Create new component
-                    new_component = {
-                        'type': self.dragging_component,
-                        'position': position,
-                        'id': len(self.circuit_components),
-                        'connections': [],
-                        'value': self._get_default_value(self.dragging_component)
-                    }
-                    
-                    self.circuit_components.append(new_component)
-                    print(f"Komponen {self.dragging_component} ditempatkan di {position}")
+                    self.circuit.add(component, position, self._get_default_value(component))
+                    print(f"Komponen {component} ditempatkan di {position}")
             else:
                 # If dragging existing component back to panel, remove it
-                if self.dragging_existing_id is not None:
-                    self.circuit_components = [c for c in self.circuit_components 
-                                             if c['id'] != self.dragging_existing_id]
-                    print(f"Komponen {self.dragging_component} dihapus")
-        
-        self.dragging_component = None
-        self.dragging_existing_id = None
-        self.temp_component_pos = None
+                if drag['existing_id'] is not None:
+                    self.circuit.remove(drag['existing_id'])
+                    print(f"Komponen {component} dihapus")
+        
+        drag.update(self._new_drag())
     
     def _get_default_value(self, component_type):
         """Get default values for components"""
@@ -197,27 +295,145 @@ class CircuitBuilderApp:
     
     def handle_switch_control(self, hand_landmarks):
         """Handle switch control with finger gestures"""
-        if hand_landmarks:
+        if hand_landmarks is not None:
             switch_action = self.calculator.detect_switch_control(hand_landmarks)
             
             if switch_action != 'UNCHANGED':
                 # Find switches in circuit and update their state
                 for component in self.circuit_components:
                     if component['type'] == 'switch':
-                        component['value']['state'] = switch_action
-                        print(f"Saklar: {switch_action}")
+                        if self.circuit.set_value(component['id'], 'state', switch_action):
+                            print(f"Saklar: {switch_action}")
+    
+    @property
+    def circuit_components(self):
+        """List komponen rangkaian (dikelola oleh CircuitModel)"""
+        return self.circuit.components
     
     def update_calculations(self):
-        """Update circuit calculations"""
-        if self.circuit_components:
-            results = self.calculator.calculate_circuit(self.circuit_components)
-            self.interface.update_calculations(results)
+        """Update circuit calculations (hanya jika komponen atau kabel berubah sejak perhitungan terakhir)"""
+        version = (self.circuit.version, self.wire_system.version)
+        if version == self.calculated_version:
+            return
+        self.calculated_version = version
+        # Netlist dari kabel yang digambar; selama belum ada kabel tersambung, komponen
+        # dianggap satu loop seri seperti sebelumnya
+        wire_connections = self.wire_system.get_connected_components() or None
+        results = self.calculator.calculate_circuit(self.circuit_components, wire_connections)
+        self.interface.update_calculations(results)
+    
+    def read_frame(self):
+        """
+        Baca satu frame kamera (sudah di-mirror)
+        
+        Returns:
+            Frame BGR atau None jika sumber frame habis/gagal
+        """
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        
+        # Flip frame horizontally (mirror effect), ke buffer yang dipakai ulang
+        return self.frame_buffers.mirror(frame)
+    
+    def process_frame(self, frame, timer=NULL_TIMER):
+        """
+        Jalankan satu langkah pipeline: deteksi, interaksi, perhitungan dan render
+        
+        Args:
+            frame: Frame BGR dari read_frame
+            timer: StageTimer untuk mengukur latensi per tahap (benchmark/replay)
+            
+        Returns:
+            dict: Data pinch tangan utama dari detector (atau None)
+        """
+        # Detector dan render tidak mengubah frame (anotasi digambar di inset), jadi
+        # recorder bisa menulis frame ini langsung tanpa salinan
+        views = self.frame_buffers.views(frame)
+        
+        # Detect pinch gesture (semua tangan; pinch_data = tangan utama)
+        with timer.stage('detect'):
+            if self.detector_warmup is not None and self.detector_warmup.is_alive():
+                hands = []
+            else:
+                hands = self.pinch_detector.detect_hands(frame, views)
+            pinch_data = hands[0] if hands else None
+            hand_landmarks = self.pinch_detector.get_hand_landmarks() if hands else None
+        
+        if self.recorder:
+            # Rekam landmark sebelum filter agar replay menjalankan filter yang sama
+            self.recorder.write(frame, self.pinch_detector.raw_landmarks,
+                                source=self.pinch_detector.landmark_source,
+                                pinch_data=pinch_data)
+        
+        # Handle interactions
+        with timer.stage('interaction'):
+            self.handle_hands(hands)
+            self.handle_switch_control(hand_landmarks)
+        
+        # Update calculations
+        with timer.stage('calculate'):
+            self.update_calculations()
+        
+        # Render interface
+        with timer.stage('render'):
+            self.interface.render(
+                frame=frame,
+                pinch_data=pinch_data,
+                hands=hands,
+                components=self.circuit_components,
+                component_index=self.circuit,
+                drags=[(drag['component'], drag['temp_pos']) for drag in self.hand_drags.values()],
+                wires=self.wire_system.wires,
+                active_wire=self.wire_system.active_wire,
+                layer_version=(self.circuit.layout_version, self.wire_system.version)
+            )
+            
+            if self.show_debug_hud:
+                self.interface.render_debug_hud(METRICS.summary(), self.clock.get_fps())
+            
+            # Update display (hanya area yang berubah)
+            pygame.display.update(self.interface.get_dirty_rects())
+        
+        return pinch_data
+    
+    def start_detector_warm_up(self, frame):
+        """
+        Pilih backend dan muat model detector di thread background, sehingga window sudah
+        menampilkan kamera selagi model dimuat (CV_WARMUP=0: detector dimuat di frame pertama)
+        
+        Args:
+            frame: Frame kamera pertama (disalin)
+        """
+        if os.environ.get('CV_WARMUP', '1') == '0':
+            return
+        frame = frame.copy()
+        
+        def warm_up():
+            try:
+                with self.startup.phase('detector_warmup'):
+                    self.pinch_detector.warm_up(frame)
+            except Exception as e:
+                # Deteksi dicoba lagi (dan error-nya terlihat) di frame berikutnya
+                self.startup.set_failed(e)
+                print(f"Warm-up detector gagal: {e}")
+                return
+            self.startup.set_ready()
+            print(self.startup.format())
+        
+        self.detector_warmup = threading.Thread(target=warm_up, name='DetectorWarmUp', daemon=True)
+        self.detector_warmup.start()
     
     def run(self):
         """Main application loop"""
         print("Memulai Circuit Builder CV...")
         print("Tekan ESC untuk keluar")
         
+        with self.startup.phase('camera_first_frame'):
+            frame = self.read_frame()
+        if frame is not None:
+            self.start_detector_warm_up(frame)
+        
         while self.running:
             # Handle pygame events
             for event in pygame.event.get():
@@ -228,42 +444,22 @@ class CircuitBuilderApp:
                         self.running = False
                     elif event.key == pygame.K_r:
                         # Reset circuit
-                        self.circuit_components.clear()
+                        self.circuit.clear()
                         self.wire_system.clear()
                         print("Rangkaian direset")
+                    elif event.key == pygame.K_F3:
+                        self.show_debug_hud = not self.show_debug_hud
             
             # Read camera frame
-            ret, frame = self.cap.read()
-            if not ret:
+            with METRICS.stage('capture'):
+                frame = self.read_frame()
+            if frame is None:
                 print("Error: Tidak dapat membaca frame kamera")
                 break
-                
-            # Flip frame horizontally (mirror effect)
-            frame = cv2.flip(frame, 1)
-            
-            # Detect pinch gesture
-            pinch_data = self.pinch_detector.detect_pinch(frame)
-            hand_landmarks = self.pinch_detector.get_hand_landmarks()
-            
-            # Handle interactions
-            self.handle_pinch_interaction(pinch_data)
-            self.handle_switch_control(hand_landmarks)
             
-            # Update calculations
-            self.update_calculations()
-            
-            # Render interface
-            self.interface.render(
-                frame=frame,
-                pinch_data=pinch_data,
-                components=self.circuit_components,
-                dragging_component=self.dragging_component,
-                temp_pos=getattr(self, 'temp_component_pos', None),
-                wires=self.wire_system.get_wires()
-            )
+            self.process_frame(frame, METRICS)
+            METRICS.inc('cv_frames_total')
             
-            # Update display
-            pygame.display.flip()
             self.clock.tick(30)  # 30 FPS
         
         # Cleanup
@@ -273,14 +469,26 @@ class CircuitBuilderApp:
         """Clean up resources"""
         print("Membersihkan resources...")
         self.cap.release()
+        if self.recorder:
+            self.recorder.close()
+        if self.inference_pool:
+            self.inference_pool.close()
         cv2.destroyAllWindows()
         pygame.quit()
         print("Circuit Builder CV ditutup")
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Circuit Builder CV')
+    parser.add_argument('--source', default=None,
+                        help="Index kamera, 'synthetic' atau path file video")
+    parser.add_argument('--record', default=None, metavar='DIR',
+                        help='Rekam frame kamera + output detector ke direktori ini')
+    args = parser.parse_args()
+    
     try:
-        app = CircuitBuilderApp()
+        recorder = SessionRecorder(args.record) if args.record else None
+        app = CircuitBuilderApp(frame_source=args.source, recorder=recorder)
         app.run()
     except Exception as e:
         print(f"Error: {e}")
@@ -4,5 +4,7 @@ Circuit Logic Module Initialization
 
 from .wire_system import WireSystem
 from .calculator import CircuitCalculator
+from .circuit_model import CircuitModel
+from .spatial_index import SpatialGrid
 
-__all__ = ['WireSystem', 'CircuitCalculator']
+__all__ = ['WireSystem', 'CircuitCalculator', 'CircuitModel', 'SpatialGrid']
@@ -4,117 +4,128 @@ Kalkulator untuk perhitungan rangkaian listrik berdasarkan Hukum Ohm
 """
 
 import math
+from collections import OrderedDict
+
+from ..hand_detection.landmarks import as_landmark_array, classify_finger_gesture
+from .mna_solver import (build_netlist, circuit_signature, classify_topology, prepare_netlist,
+                         solve_netlist, update_netlist_values)
+
+# Gesture jari -> aksi saklar
+SWITCH_GESTURES = {'PEACE_SIGN': 'OFF', 'INDEX_UP': 'ON'}
 
 class CircuitCalculator:
     """Kalkulator rangkaian listrik"""
     
-    def __init__(self):
-        """Initialize calculator"""
+    def __init__(self, cache_size=64):
+        """
+        Initialize calculator
+        
+        Args:
+            cache_size: Jumlah hasil rangkaian yang disimpan (key = topologi + nilai komponen)
+        """
         self.voltage = 0
         self.current = 0
         self.resistance = 0
         self.power = 0
-        self.circuit_type = 'open'  # 'series', 'parallel', 'mixed', 'open'
+        self.circuit_type = 'open'  # 'series', 'parallel', 'mixed', 'open', 'short'
+        self.branches = {}  # Hasil per komponen: {id: {voltage, current, power}}
+        
+        # Cache hasil per signature rangkaian + struktur MNA topologi terakhir
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._structure = None  # (topology_key, netlist, prepared)
+        self.cache_stats = {'hits': 0, 'incremental': 0, 'full': 0}
         
     def detect_switch_control(self, hand_landmarks):
         """
         Deteksi kontrol saklar menggunakan gesture jari
         
         Args:
-            hand_landmarks: Landmark tangan dari MediaPipe
+            hand_landmarks: Array landmark (21, 3) (atau NormalizedLandmarkList MediaPipe)
             
         Returns:
             str: 'ON', 'OFF', atau 'UNCHANGED'
         """
-        if not hand_landmarks:
-            return 'UNCHANGED'
-            
-        landmarks = hand_landmarks.landmark
+        # Gesture dihitung vectorized dari array landmark yang sama dengan detector
+        gesture = classify_finger_gesture(as_landmark_array(hand_landmarks))
         
-        # Cek jari telunjuk tegak (untuk ON)
-        index_tip = landmarks[8]
-        index_mcp = landmarks[5]
-        index_up = index_tip.y < index_mcp.y
-        
-        # Cek jari tengah tegak (untuk peace sign - OFF)
-        middle_tip = landmarks[12]
-        middle_mcp = landmarks[9]
-        middle_up = middle_tip.y < middle_mcp.y
-        
-        # Cek jari lain tertutup
-        ring_tip = landmarks[16]
-        ring_mcp = landmarks[13]
-        ring_down = ring_tip.y > ring_mcp.y
-        
-        pinky_tip = landmarks[20]
-        pinky_mcp = landmarks[17]
-        pinky_down = pinky_tip.y > pinky_mcp.y
-        
-        # Peace sign (2 jari) = OFF
-        if index_up and middle_up and ring_down and pinky_down:
-            return 'OFF'
-        # Hanya telunjuk = ON
-        elif index_up and not middle_up and ring_down and pinky_down:
-            return 'ON'
-        else:
-            return 'UNCHANGED'
+        # Peace sign (2 jari) = OFF, hanya telunjuk = ON
+        return SWITCH_GESTURES.get(gesture, 'UNCHANGED')
     
     def calculate_circuit(self, circuit_components, wire_connections=None):
         """
         Hitung nilai rangkaian berdasarkan komponen dan koneksi
         
+        Hasil di-cache per signature (topologi + nilai komponen). Jika hanya nilai yang berubah,
+        netlist dan pola matriks MNA dari topologi terakhir dipakai ulang.
+        
         Args:
             circuit_components: List komponen dalam rangkaian
-            wire_connections: List koneksi kabel (opsional)
+            wire_connections: List koneksi kabel dari WireSystem.get_connected_components()
+                              (None = semua komponen dianggap tersambung seri)
             
         Returns:
-            dict: Hasil perhitungan {voltage, current, resistance, power}
+            dict: Hasil perhitungan {voltage, current, resistance, power, circuit_type}
         """
-        # Reset values
-        self.voltage = 0
-        self.current = 0
-        self.resistance = 0
-        self.power = 0
-        self.circuit_type = 'open'
-        
         if not circuit_components:
+            self._set_state(0, 0, 0, 0, 'open', {})
             return self._get_results()
         
-        # Identifikasi komponen
-        batteries = [c for c in circuit_components if c['type'] == 'battery']
-        resistors = [c for c in circuit_components if c['type'] == 'resistor']
-        lamps = [c for c in circuit_components if c['type'] == 'lamp']
-        switches = [c for c in circuit_components if c['type'] == 'switch']
-        
-        # Cek apakah ada saklar yang OFF
-        if any(s['value'].get('state') == 'OFF' for s in switches):
-            self.circuit_type = 'open'
-            return self._get_results()
-        
-        # Cek apakah ada baterai
-        if not batteries:
+        topology_key, values_key = circuit_signature(circuit_components, wire_connections)
+        cache_key = (topology_key, values_key)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            self.cache_stats['hits'] += 1
+            self._set_state(*cached)
             return self._get_results()
         
-        # Hitung total tegangan baterai (asumsi seri untuk sekarang)
-        total_voltage = sum(b['value'].get('voltage', 0) for b in batteries)
-        
-        # Hitung total resistansi
-        resistive_components = resistors + lamps
-        if not resistive_components:
-            return self._get_results()
-        
-        # Simplified calculation - asumsi rangkaian seri
-        total_resistance = sum(r['value'].get('resistance', 0) for r in resistive_components)
-        
-        if total_resistance > 0:
-            self.voltage = total_voltage
-            self.resistance = total_resistance
-            self.current = self.voltage / self.resistance  # V = I × R
-            self.power = self.voltage * self.current        # P = V × I
-            self.circuit_type = 'series'
-        
+        if self._structure is not None and self._structure[0] == topology_key:
+            # Hanya nilai yang berubah: pakai ulang netlist dan pola matriks, isi ulang nilainya
+            _, netlist, prepared = self._structure
+            update_netlist_values(netlist, circuit_components)
+            self.cache_stats['incremental'] += 1
+        else:
+            # Netlist dari terminal komponen + kabel, lalu Modified Nodal Analysis
+            netlist = build_netlist(circuit_components, wire_connections)
+            prepared = prepare_netlist(netlist)
+            self._structure = (topology_key, netlist, prepared)
+            self.cache_stats['full'] += 1
+        
+        solution = solve_netlist(netlist, prepared)
+        voltage = current = resistance = power = 0
+        if solution['status'] == 'ok':
+            # Tegangan = beda potensial terbesar dalam rangkaian aktif (seri: jumlah baterai,
+            # paralel: tegangan baterai), arus = daya total / tegangan
+            voltage = max(high - low for low, high in solution['spans'].values())
+            power = sum(solution['branches'][e['id']]['power'] for e in netlist['elements']
+                        if e['kind'] == 'V')
+            if voltage > 0 and power > 0:
+                current = power / voltage
+                resistance = voltage / current
+        
+        state = (voltage, current, resistance, power,
+                 classify_topology(netlist, solution), solution['branches'])
+        self._cache[cache_key] = state
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        self._set_state(*state)
         return self._get_results()
     
+    def _set_state(self, voltage, current, resistance, power, circuit_type, branches):
+        """Set hasil perhitungan terakhir"""
+        self.voltage = voltage
+        self.current = current
+        self.resistance = resistance
+        self.power = power
+        self.circuit_type = circuit_type
+        self.branches = branches
+    
+    def clear_cache(self):
+        """Hapus cache hasil dan struktur MNA"""
+        self._cache.clear()
+        self._structure = None
+    
     def calculate_series_circuit(self, components):
         """
         Hitung rangkaian seri
@@ -197,19 +208,13 @@ class CircuitCalculator:
         
         Args:
             components: List komponen
-            connections: List koneksi kabel
+            connections: List koneksi kabel (WireSystem.get_connected_components())
             
         Returns:
-            str: 'series', 'parallel', 'mixed', 'open'
+            str: 'series', 'parallel', 'mixed', 'open', 'short'
         """
-        # Simplified analysis
-        # TODO: Implement proper circuit topology analysis
-        if not connections:
-            return 'open'
-        elif len(connections) == len(components) - 1:
-            return 'series'
-        else:
-            return 'parallel'  # atau 'mixed'
+        netlist = build_netlist(components, connections)
+        return classify_topology(netlist, solve_netlist(netlist))
     
     def _get_results(self):
         """Dapatkan hasil perhitungan dalam format dict"""
@@ -246,8 +251,9 @@ class CircuitCalculator:
                 }
             elif comp_type == 'resistor':
                 resistance = comp_value.get('resistance', 0)
-                voltage_drop = self.current * resistance if hasattr(self, 'current') else 0
-                power_dissipated = (self.current ** 2) * resistance if hasattr(self, 'current') else 0
+                branch = self.branches.get(comp_id, {})
+                voltage_drop = branch.get('voltage', 0)
+                power_dissipated = branch.get('power', 0)
                 
                 analysis[comp_id] = {
                     'type': 'Resistor',
@@ -258,8 +264,9 @@ class CircuitCalculator:
                 }
             elif comp_type == 'lamp':
                 resistance = comp_value.get('resistance', 0)
-                voltage_drop = self.current * resistance if hasattr(self, 'current') else 0
-                power_dissipated = (self.current ** 2) * resistance if hasattr(self, 'current') else 0
+                branch = self.branches.get(comp_id, {})
+                voltage_drop = branch.get('voltage', 0)
+                power_dissipated = branch.get('power', 0)
                 brightness = min(100, (power_dissipated / 10) * 100)  # Simplified brightness calculation
                 
                 analysis[comp_id] = {
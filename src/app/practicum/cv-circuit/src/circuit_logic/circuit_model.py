@@ -0,0 +1,128 @@
+"""
+Circuit Model Module
+Daftar komponen rangkaian dengan version counter: setiap perubahan yang mempengaruhi
+perhitungan menaikkan version, sehingga kalkulator cukup dijalankan saat ada edit.
+Spatial index ikut diperbarui saat komponen ditambah, dipindah atau dihapus
+"""
+
+from .spatial_index import SpatialGrid, component_bbox
+
+
+class CircuitModel:
+    """Komponen rangkaian + version counter untuk change tracking"""
+    
+    def __init__(self, cell_size=64):
+        """
+        Initialize model kosong
+        
+        Args:
+            cell_size: Ukuran cell spatial index (pixel)
+        """
+        self.components = []
+        self.index = SpatialGrid(cell_size)
+        self.version = 0
+        self.layout_version = 0  # Naik juga saat komponen dipindah (untuk cache render)
+        self._next_id = 0
+        
+    def _touch(self):
+        """Tandai rangkaian berubah"""
+        self.version += 1
+        self.layout_version += 1
+        
+    def get(self, comp_id):
+        """Cari komponen berdasarkan ID (None jika tidak ada)"""
+        for component in self.components:
+            if component['id'] == comp_id:
+                return component
+        return None
+    
+    def query(self, pos, margin=0):
+        """
+        Komponen di sekitar posisi (kandidat hit-test dari spatial index)
+        
+        Args:
+            pos: Posisi (x, y)
+            margin: Perluasan bounding box komponen (pixel)
+            
+        Returns:
+            list: Komponen berurutan sesuai urutan list
+        """
+        return self.index.query(pos, margin)
+    
+    def add(self, comp_type, position, value):
+        """
+        Tambah komponen baru
+        
+        Args:
+            comp_type: Jenis komponen ('battery', 'resistor', ...)
+            position: Posisi (x, y)
+            value: Dict nilai komponen
+            
+        Returns:
+            dict: Komponen yang ditambahkan
+        """
+        component = {
+            'type': comp_type,
+            'position': position,
+            'id': self._next_id,
+            'connections': [],
+            'value': value
+        }
+        self._next_id += 1
+        self.components.append(component)
+        self.index.insert(component['id'], component, component_bbox(component))
+        self._touch()
+        return component
+    
+    def move(self, comp_id, position):
+        """
+        Pindahkan komponen
+        
+        Posisi tidak mempengaruhi perhitungan, jadi version tidak berubah.
+        
+        Returns:
+            bool: True jika komponen ditemukan
+        """
+        component = self.get(comp_id)
+        if component is None:
+            return False
+        component['position'] = position
+        self.index.update(comp_id, component_bbox(component))
+        self.layout_version += 1
+        return True
+    
+    def remove(self, comp_id):
+        """
+        Hapus komponen
+        
+        Returns:
+            bool: True jika komponen dihapus
+        """
+        remaining = [c for c in self.components if c['id'] != comp_id]
+        if len(remaining) == len(self.components):
+            return False
+        self.components[:] = remaining
+        self.index.remove(comp_id)
+        self._touch()
+        return True
+    
+    def set_value(self, comp_id, key, value):
+        """
+        Ubah satu nilai komponen (misalnya state saklar atau resistansi)
+        
+        Returns:
+            bool: True jika nilai benar-benar berubah
+        """
+        component = self.get(comp_id)
+        if component is None or component['value'].get(key) == value:
+            return False
+        component['value'][key] = value
+        self._touch()
+        return True
+    
+    def clear(self):
+        """Hapus semua komponen"""
+        if self.components:
+            self.components.clear()
+            self.index.clear()
+            self._touch()
@@ -0,0 +1,394 @@
+"""
+MNA Solver Module
+Modified Nodal Analysis: bangun netlist dari terminal komponen dan kabel, lalu hitung
+tegangan node dan arus cabang dengan aljabar linear sparse (scipy) atau dense (numpy)
+"""
+
+import warnings
+
+import numpy as np
+
+try:
+    from scipy.sparse import csc_matrix
+    from scipy.sparse.linalg import MatrixRankWarning, spsolve
+except ImportError:  # scipy opsional, fallback ke numpy dense
+    csc_matrix = spsolve = MatrixRankWarning = None
+
+# Di atas ukuran ini pakai solver sparse (jika scipy tersedia)
+SPARSE_THRESHOLD = 64
+
+# Resistansi <= nilai ini dianggap kabel ideal (digabung menjadi satu node)
+SHORT_RESISTANCE = 1e-9
+
+# Arus di bawah nilai ini dianggap nol
+CURRENT_EPSILON = 1e-9
+
+# Terminal komponen: 0 = kiri (kutub negatif baterai), 1 = kanan (kutub positif baterai)
+TERMINALS = (0, 1)
+
+
+class _UnionFind:
+    """Union-find sederhana untuk menggabungkan terminal yang tersambung kabel"""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        root = self.parent.setdefault(item, item)
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Path compression (iteratif, aman untuk rantai panjang)
+        while item != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+
+def build_netlist(components, connections=None):
+    """
+    Bangun netlist dari komponen dan koneksi kabel
+
+    Args:
+        components: List komponen ({'id', 'type', 'value'})
+        connections: List dari WireSystem.get_connected_components()
+                     ({'component1', 'component2', 'terminal1', 'terminal2'}).
+                     None = semua komponen dianggap seri dalam satu loop (urutan list)
+
+    Returns:
+        dict: {'nodes': {(id, terminal): node}, 'elements': [...], 'node_count': int}
+              Elemen: {'id', 'kind': 'R'|'V', 'a', 'b', 'value'}; untuk 'V', b = kutub positif
+    """
+    by_id = {c['id']: c for c in components}
+    links = []
+    if connections is None:
+        # Tanpa info kabel: sambung berurutan membentuk satu loop seri
+        ids = list(by_id)
+        if len(ids) > 1:
+            for first, second in zip(ids, ids[1:] + ids[:1]):
+                links.append(((first, 1), (second, 0)))
+    else:
+        for conn in connections:
+            first, second = conn['component1'], conn['component2']
+            if first not in by_id or second not in by_id:
+                continue
+            links.append(((first, conn.get('terminal1', 1)), (second, conn.get('terminal2', 0))))
+
+    # Kabel ideal dan saklar ON menggabungkan terminal menjadi satu node
+    union = _UnionFind()
+    for comp_id in by_id:
+        for terminal in TERMINALS:
+            union.find((comp_id, terminal))
+    for a, b in links:
+        union.union(a, b)
+
+    elements = []
+    for comp_id, component in by_id.items():
+        comp_type = component['type']
+        value = component.get('value') or {}
+        if comp_type == 'wire' or (comp_type == 'switch' and value.get('state') == 'ON'):
+            union.union((comp_id, 0), (comp_id, 1))
+        elif comp_type in ('resistor', 'lamp'):
+            resistance = float(value.get('resistance', 0))
+            if resistance <= SHORT_RESISTANCE:
+                union.union((comp_id, 0), (comp_id, 1))
+            else:
+                elements.append({'id': comp_id, 'kind': 'R', 'value': resistance})
+        elif comp_type == 'battery':
+            elements.append({'id': comp_id, 'kind': 'V', 'value': float(value.get('voltage', 0))})
+        # Saklar OFF: tidak ada elemen (rangkaian terbuka)
+
+    # Nomori node berdasarkan root union-find
+    nodes = {}
+    numbering = {}
+    for comp_id in by_id:
+        for terminal in TERMINALS:
+            root = union.find((comp_id, terminal))
+            nodes[(comp_id, terminal)] = numbering.setdefault(root, len(numbering))
+    for element in elements:
+        element['a'] = nodes[(element['id'], 0)]
+        element['b'] = nodes[(element['id'], 1)]
+
+    return {'nodes': nodes, 'elements': elements, 'node_count': len(numbering)}
+
+
+def _islands(node_count, elements):
+    """Kelompokkan node yang tersambung oleh elemen; return root island per node"""
+    union = _UnionFind()
+    for node in range(node_count):
+        union.find(node)
+    for element in elements:
+        union.union(element['a'], element['b'])
+    return [union.find(node) for node in range(node_count)]
+
+
+def _solve_linear(matrix_rows, matrix_cols, matrix_vals, rhs, size):
+    """Selesaikan A x = z; return None jika matriks singular"""
+    if csc_matrix is not None and size > SPARSE_THRESHOLD:
+        matrix = csc_matrix((matrix_vals, (matrix_rows, matrix_cols)), shape=(size, size))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', MatrixRankWarning)
+            try:
+                solution = spsolve(matrix, rhs)
+            except (MatrixRankWarning, RuntimeError):
+                return None
+    else:
+        matrix = np.zeros((size, size))
+        np.add.at(matrix, (matrix_rows, matrix_cols), matrix_vals)
+        try:
+            solution = np.linalg.solve(matrix, rhs)
+        except np.linalg.LinAlgError:
+            return None
+    solution = np.atleast_1d(solution)
+    return solution if np.all(np.isfinite(solution)) else None
+
+
+def circuit_signature(components, connections=None):
+    """
+    Kunci kanonik rangkaian untuk cache hasil solve
+
+    Args:
+        components: List komponen ({'id', 'type', 'value'})
+        connections: List koneksi kabel (sama dengan build_netlist)
+
+    Returns:
+        tuple: (topology_key, values_key). topology_key berubah jika struktur netlist berubah
+               (komponen, urutan loop implisit, kabel, status saklar, resistansi nol);
+               values_key hanya berisi tegangan/resistansi elemen
+    """
+    topology = []
+    values = []
+    for component in components:
+        comp_id, comp_type = component['id'], component['type']
+        value = component.get('value') or {}
+        if comp_type == 'switch':
+            topology.append((comp_id, comp_type, value.get('state') == 'ON'))
+        elif comp_type in ('resistor', 'lamp'):
+            resistance = float(value.get('resistance', 0))
+            topology.append((comp_id, comp_type, resistance <= SHORT_RESISTANCE))
+            values.append((comp_id, resistance))
+        elif comp_type == 'battery':
+            topology.append((comp_id, comp_type, None))
+            values.append((comp_id, float(value.get('voltage', 0))))
+        else:
+            topology.append((comp_id, comp_type, None))
+
+    if connections is None:
+        # Loop seri implisit: urutan list menentukan topologi
+        links = None
+    else:
+        # Urutan dan arah kabel tidak mempengaruhi netlist
+        links = frozenset(
+            frozenset(((conn['component1'], conn.get('terminal1', 1)),
+                       (conn['component2'], conn.get('terminal2', 0))))
+            for conn in connections
+        )
+    return (tuple(topology), links), tuple(values)
+
+
+def update_netlist_values(netlist, components):
+    """
+    Perbarui nilai elemen netlist tanpa membangun ulang topologi
+
+    Hanya valid jika circuit_signature topologinya sama dengan saat netlist dibangun.
+
+    Args:
+        netlist: Hasil build_netlist
+        components: List komponen dengan nilai baru
+    """
+    by_id = {c['id']: c for c in components}
+    for element in netlist['elements']:
+        value = by_id[element['id']].get('value') or {}
+        key = 'voltage' if element['kind'] == 'V' else 'resistance'
+        element['value'] = float(value.get(key, 0))
+
+
+def prepare_netlist(netlist):
+    """
+    Analisis bagian MNA yang hanya bergantung pada topologi: island, ground, index variabel
+    dan pola stamp matriks. Hasilnya bisa dipakai ulang oleh solve_netlist selama topologi
+    tidak berubah, sehingga perubahan nilai hanya perlu mengisi ulang dan menyelesaikan matriks.
+
+    Args:
+        netlist: Hasil build_netlist
+
+    Returns:
+        dict: Struktur untuk solve_netlist ('status' 'open'/'short' jika tidak perlu di-solve)
+    """
+    node_count = netlist['node_count']
+    elements = netlist['elements']
+    sources = [e for e in elements if e['kind'] == 'V']
+
+    # Baterai dengan kedua kutub di node yang sama = hubung singkat
+    if any(s['a'] == s['b'] for s in sources):
+        return {'status': 'short'}
+    if not sources:
+        return {'status': 'open'}
+
+    island_of = _islands(node_count, elements)
+    active_islands = {island_of[s['a']] for s in sources}
+    grounds = {}
+    for node in range(node_count):
+        island = island_of[node]
+        if island in active_islands:
+            grounds.setdefault(island, node)
+
+    # Index variabel: node aktif non-ground, lalu arus setiap baterai
+    index = {}
+    for node in range(node_count):
+        if island_of[node] in active_islands and grounds[island_of[node]] != node:
+            index[node] = len(index)
+    active = [e for e in elements if island_of[e['a']] in active_islands]
+    resistors = [e for e in active if e['kind'] == 'R']
+    active_sources = [e for e in active if e['kind'] == 'V']
+    size = len(index) + len(active_sources)
+
+    # Pola stamp: resistor -> (elemen, tanda) dikali konduktansi; sumber -> konstanta +-1
+    rows, cols, owners, signs = [], [], [], []
+
+    def stamp(row, col, owner, sign):
+        if row is not None and col is not None:
+            rows.append(row)
+            cols.append(col)
+            owners.append(owner)
+            signs.append(sign)
+
+    for k, element in enumerate(resistors):
+        a, b = index.get(element['a']), index.get(element['b'])
+        stamp(a, a, k, 1.0)
+        stamp(b, b, k, 1.0)
+        stamp(a, b, k, -1.0)
+        stamp(b, a, k, -1.0)
+    resistor_stamps = len(rows)
+    source_rows = {}
+    for k, source in enumerate(active_sources):
+        row = source_rows[source['id']] = len(index) + k
+        a, b = index.get(source['a']), index.get(source['b'])
+        # V(b) - V(a) = E ; arus sumber mengalir keluar dari kutub positif (b)
+        stamp(row, b, -1, 1.0)
+        stamp(row, a, -1, -1.0)
+        stamp(b, row, -1, -1.0)
+        stamp(a, row, -1, 1.0)
+
+    return {
+        'status': 'ok',
+        'island_of': island_of,
+        'active_islands': active_islands,
+        'index': index,
+        'active': active,
+        'resistors': resistors,
+        'active_sources': active_sources,
+        'size': size,
+        'rows': np.array(rows, dtype=np.int64),
+        'cols': np.array(cols, dtype=np.int64),
+        'owners': np.array(owners[:resistor_stamps], dtype=np.int64),
+        'signs': np.array(signs, dtype=np.float64),
+        'resistor_stamps': resistor_stamps,
+        'source_rows': source_rows
+    }
+
+
+def solve_netlist(netlist, prepared=None):
+    """
+    Hitung tegangan node dan arus cabang dengan Modified Nodal Analysis
+
+    Hanya island (bagian rangkaian yang tersambung) yang memiliki baterai yang dihitung;
+    satu node per island dijadikan ground.
+
+    Args:
+        netlist: Hasil build_netlist
+        prepared: Hasil prepare_netlist untuk topologi yang sama (None = analisis ulang)
+
+    Returns:
+        dict: {'status': 'ok'|'open'|'short',
+               'node_voltages': np.ndarray,
+               'branches': {id: {'voltage', 'current', 'power'}},
+               'spans': {island: (V min, V max)}}
+              Arus baterai positif = baterai mengalirkan daya ke rangkaian
+    """
+    if prepared is None:
+        prepared = prepare_netlist(netlist)
+    node_count = netlist['node_count']
+    branches = {e['id']: {'voltage': 0.0, 'current': 0.0, 'power': 0.0}
+                for e in netlist['elements']}
+    node_voltages = np.zeros(node_count)
+    if prepared['status'] != 'ok':
+        return {'status': prepared['status'], 'node_voltages': node_voltages,
+                'branches': branches, 'spans': {}}
+
+    # Isi nilai matriks dari pola stamp: hanya bagian ini yang bergantung pada nilai komponen
+    conductances = np.array([1.0 / e['value'] for e in prepared['resistors']])
+    vals = prepared['signs'].copy()
+    if prepared['resistor_stamps']:
+        vals[:prepared['resistor_stamps']] *= conductances[prepared['owners']]
+    rhs = np.zeros(prepared['size'])
+    source_rows = prepared['source_rows']
+    for source in prepared['active_sources']:
+        rhs[source_rows[source['id']]] = source['value']
+
+    solution = _solve_linear(prepared['rows'], prepared['cols'], vals, rhs, prepared['size'])
+    if solution is None:
+        # Singular: loop tanpa resistansi (baterai tersambung langsung) atau sumber bertentangan
+        return {'status': 'short', 'node_voltages': node_voltages, 'branches': branches, 'spans': {}}
+
+    for node, i in prepared['index'].items():
+        node_voltages[node] = solution[i]
+    for element in prepared['active']:
+        voltage = node_voltages[element['b']] - node_voltages[element['a']]
+        if element['kind'] == 'R':
+            current = -voltage / element['value']
+            current = abs(current) if abs(current) > CURRENT_EPSILON else 0.0
+            voltage = abs(voltage)
+            power = current * voltage
+        else:
+            current = solution[source_rows[element['id']]]
+            current = current if abs(current) > CURRENT_EPSILON else 0.0
+            power = element['value'] * current
+        branches[element['id']] = {'voltage': voltage, 'current': current, 'power': power}
+
+    island_of = prepared['island_of']
+    spans = {}
+    for node in range(node_count):
+        island = island_of[node]
+        if island in prepared['active_islands']:
+            low, high = spans.get(island, (np.inf, -np.inf))
+            spans[island] = (min(low, node_voltages[node]), max(high, node_voltages[node]))
+
+    return {
+        'status': 'ok',
+        'node_voltages': node_voltages,
+        'branches': branches,
+        'spans': spans
+    }
+
+
+def classify_topology(netlist, solution):
+    """
+    Klasifikasi rangkaian berdasarkan hasil solve
+
+    Returns:
+        str: 'series', 'parallel', 'mixed', 'open' atau 'short'
+    """
+    if solution['status'] != 'ok':
+        return solution['status']
+
+    loads = [e for e in netlist['elements'] if e['kind'] == 'R'
+             and solution['branches'][e['id']]['current'] > 0]
+    if not loads:
+        return 'open'
+    if len(loads) == 1:
+        return 'series'
+
+    currents = np.array([solution['branches'][e['id']]['current'] for e in loads])
+    voltages = np.array([solution['branches'][e['id']]['voltage'] for e in loads])
+    # Paralel: setiap beban mendapat tegangan penuh sumber
+    span = max(high - low for low, high in solution['spans'].values())
+    if np.allclose(voltages, span, rtol=1e-6):
+        return 'parallel'
+    # Seri: semua beban dilewati arus yang sama
+    if np.allclose(currents, currents[0], rtol=1e-6):
+        return 'series'
+    return 'mixed'
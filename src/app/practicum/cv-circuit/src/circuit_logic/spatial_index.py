@@ -0,0 +1,125 @@
+"""
+Spatial Index Module
+Grid seragam untuk hit-testing komponen (pilih, tunjuk, snap kabel) tanpa scan linear
+"""
+
+import math
+
+# Ukuran bounding box komponen (lebar, tinggi) dalam pixel
+COMPONENT_SIZES = {
+    'battery': (80, 50),
+    'lamp': (60, 60),
+    'resistor': (80, 30),
+    'switch': (80, 40),
+    'wire': (60, 20)
+}
+DEFAULT_COMPONENT_SIZE = (50, 50)
+
+
+def component_bbox(component):
+    """
+    Bounding box komponen berdasarkan posisi tengah dan tipenya
+
+    Returns:
+        tuple: (x0, y0, x1, y1)
+    """
+    x, y = component['position']
+    width, height = COMPONENT_SIZES.get(component['type'], DEFAULT_COMPONENT_SIZE)
+    return (x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+
+
+class SpatialGrid:
+    """Grid seragam: setiap item terdaftar di semua cell yang dilewati bounding box-nya"""
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize grid
+
+        Args:
+            cell_size: Ukuran cell (pixel); idealnya sekitar ukuran komponen
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = {}  # key -> (item, bbox, cells, urutan insert)
+        self._sequence = 0
+
+    def _cells_for(self, x0, y0, x1, y1):
+        """Daftar cell (cx, cy) yang dilewati sebuah rectangle"""
+        size = self.cell_size
+        return [(cx, cy)
+                for cx in range(math.floor(x0 / size), math.floor(x1 / size) + 1)
+                for cy in range(math.floor(y0 / size), math.floor(y1 / size) + 1)]
+
+    def insert(self, key, item, bbox):
+        """
+        Daftarkan item (key yang sudah ada akan diganti)
+
+        Args:
+            key: ID unik item
+            item: Objek yang dikembalikan query (misalnya dict komponen)
+            bbox: (x0, y0, x1, y1)
+        """
+        sequence = self._sequence
+        if key in self.items:
+            # Pertahankan urutan asli agar prioritas hit-test tidak berubah saat item dipindah
+            sequence = self.items[key][3]
+            self.remove(key)
+        else:
+            self._sequence += 1
+        cells = self._cells_for(*bbox)
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(key)
+        self.items[key] = (item, bbox, cells, sequence)
+
+    def update(self, key, bbox):
+        """Perbarui bounding box item yang sudah terdaftar"""
+        entry = self.items.get(key)
+        if entry is not None and entry[1] != bbox:
+            self.insert(key, entry[0], bbox)
+
+    def remove(self, key):
+        """Hapus item dari grid"""
+        entry = self.items.pop(key, None)
+        if entry is None:
+            return
+        for cell in entry[2]:
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[cell]
+
+    def clear(self):
+        """Hapus semua item"""
+        self.cells.clear()
+        self.items.clear()
+
+    def query(self, pos, margin=0):
+        """
+        Item yang bounding box-nya (diperluas margin) memuat pos
+
+        Hasil adalah kandidat konservatif: pemanggil tetap menerapkan tes hit-nya sendiri
+        (radius, area deteksi), cukup dengan margin >= jarak maksimum tes tersebut.
+
+        Args:
+            pos: Posisi (x, y)
+            margin: Perluasan bounding box (pixel)
+
+        Returns:
+            list: Item berurutan sesuai waktu insert (sama dengan urutan list komponen)
+        """
+        x, y = pos
+        keys = set()
+        for cell in self._cells_for(x - margin, y - margin, x + margin, y + margin):
+            keys.update(self.cells.get(cell, ()))
+
+        hits = []
+        for key in keys:
+            item, (x0, y0, x1, y1), _, sequence = self.items[key]
+            if x0 - margin <= x <= x1 + margin and y0 - margin <= y <= y1 + margin:
+                hits.append((sequence, item))
+        hits.sort(key=lambda hit: hit[0])
+        return [item for _, item in hits]
+
+    def __len__(self):
+        return len(self.items)
@@ -0,0 +1,3 @@
+"""
+Test Circuit Logic
+"""
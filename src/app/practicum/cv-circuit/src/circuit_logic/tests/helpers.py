@@ -0,0 +1,43 @@
+"""
+Helper Test Rangkaian
+Komponen dan kabel dalam format yang sama dengan CircuitModel dan WireSystem
+"""
+
+
+def battery(comp_id, voltage=12, position=(100, 100)):
+    """Baterai: terminal 0 = kutub negatif, terminal 1 = kutub positif"""
+    return {'id': comp_id, 'type': 'battery', 'position': position, 'value': {'voltage': voltage}}
+
+
+def resistor(comp_id, resistance=100, position=(200, 100)):
+    """Resistor"""
+    return {'id': comp_id, 'type': 'resistor', 'position': position,
+            'value': {'resistance': resistance}}
+
+
+def lamp(comp_id, resistance=50, position=(300, 100)):
+    """Lampu (beban resistif)"""
+    return {'id': comp_id, 'type': 'lamp', 'position': position,
+            'value': {'resistance': resistance}}
+
+
+def switch(comp_id, state='ON', position=(400, 100)):
+    """Saklar"""
+    return {'id': comp_id, 'type': 'switch', 'position': position, 'value': {'state': state}}
+
+
+def wire(first, first_terminal, second, second_terminal, wire_id=0):
+    """Satu koneksi seperti WireSystem.get_connected_components()"""
+    return {'component1': first, 'terminal1': first_terminal,
+            'component2': second, 'terminal2': second_terminal, 'wire_id': wire_id}
+
+
+def loop(*comp_ids):
+    """Kabel seri: terminal kanan setiap komponen ke terminal kiri komponen berikutnya"""
+    return [wire(first, 1, second, 0, i)
+            for i, (first, second) in enumerate(zip(comp_ids, comp_ids[1:] + comp_ids[:1]))]
+
+
+def across(source_id, load_id, wire_id=0):
+    """Beban dipasang langsung di antara kedua kutub baterai"""
+    return [wire(source_id, 1, load_id, 0, wire_id), wire(load_id, 1, source_id, 0, wire_id + 1)]
@@ -0,0 +1,100 @@
+"""
+Test MNA Solver
+Jawaban yang sudah diketahui untuk rangkaian seri, paralel, campuran, hubung singkat dan terbuka
+"""
+
+import pytest
+
+from ..calculator import CircuitCalculator
+from ..mna_solver import build_netlist, classify_topology, solve_netlist
+from .helpers import across, battery, lamp, loop, resistor, switch, wire
+
+
+def calculate(components, connections):
+    """Hitung rangkaian dengan kalculator baru (tanpa cache dari test lain)"""
+    calculator = CircuitCalculator()
+    return calculator, calculator.calculate_circuit(components, connections)
+
+
+def test_series_150_ohm():
+    components = [battery(0), resistor(1, 100), lamp(2, 50)]
+    calculator, result = calculate(components, loop(0, 1, 2))
+
+    assert result['circuit_type'] == 'series'
+    assert result['current'] == pytest.approx(0.08)
+    assert result['resistance'] == pytest.approx(150)
+    assert result['voltage'] == pytest.approx(12)
+    assert result['power'] == pytest.approx(0.96)
+    # Pembagi tegangan: 8 V di resistor 100 Ω, 4 V di lampu 50 Ω
+    assert calculator.branches[1]['voltage'] == pytest.approx(8)
+    assert calculator.branches[2]['voltage'] == pytest.approx(4)
+
+
+def test_implicit_loop_without_wires_is_series():
+    components = [battery(0), resistor(1, 100), lamp(2, 50)]
+    _, result = calculate(components, None)
+
+    assert result['circuit_type'] == 'series'
+    assert result['current'] == pytest.approx(0.08)
+
+
+def test_parallel_50_ohm():
+    components = [battery(0), resistor(1, 100), resistor(2, 100)]
+    calculator, result = calculate(components, across(0, 1) + across(0, 2, wire_id=2))
+
+    assert result['circuit_type'] == 'parallel'
+    assert result['current'] == pytest.approx(0.24)
+    assert result['resistance'] == pytest.approx(50)
+    for load in (1, 2):
+        assert calculator.branches[load]['voltage'] == pytest.approx(12)
+        assert calculator.branches[load]['current'] == pytest.approx(0.12)
+
+
+def test_mixed_series_parallel():
+    # R1 seri dengan (R2 || R3): 100 + 50 = 150 Ω
+    components = [battery(0), resistor(1, 100), resistor(2, 100), resistor(3, 100)]
+    connections = [
+        wire(0, 1, 1, 0, 0),
+        wire(1, 1, 2, 0, 1), wire(1, 1, 3, 0, 2),
+        wire(2, 1, 0, 0, 3), wire(3, 1, 0, 0, 4),
+    ]
+    calculator, result = calculate(components, connections)
+
+    assert result['circuit_type'] == 'mixed'
+    assert result['current'] == pytest.approx(0.08)
+    assert result['resistance'] == pytest.approx(150)
+    assert calculator.branches[2]['current'] == pytest.approx(0.04)
+
+
+def test_battery_shorted_by_wire():
+    components = [battery(0), resistor(1, 100)]
+    connections = across(0, 1) + [wire(0, 1, 0, 0, 2)]
+    _, result = calculate(components, connections)
+
+    assert result['circuit_type'] == 'short'
+    assert result['current'] == 0
+
+
+def test_dangling_wire_is_open():
+    components = [battery(0), resistor(1, 100)]
+    _, result = calculate(components, [wire(0, 1, 1, 0)])
+
+    assert result['circuit_type'] == 'open'
+    assert result['current'] == 0
+    assert result['power'] == 0
+
+
+@pytest.mark.parametrize('state, expected', [('ON', 'series'), ('OFF', 'open')])
+def test_switch_state(state, expected):
+    components = [battery(0), switch(1, state), lamp(2, 50)]
+    _, result = calculate(components, loop(0, 1, 2))
+
+    assert result['circuit_type'] == expected
+    assert result['current'] == pytest.approx(0.24 if state == 'ON' else 0)
+
+
+def test_zero_resistance_load_shorts_battery():
+    netlist = build_netlist([battery(0), resistor(1, 0)], loop(0, 1))
+    solution = solve_netlist(netlist)
+
+    assert classify_topology(netlist, solution) == 'short'
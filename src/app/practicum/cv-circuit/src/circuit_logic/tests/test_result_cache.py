@@ -0,0 +1,135 @@
+"""
+Test Cache Hasil Rangkaian
+Perubahan topologi atau nilai harus menghasilkan perhitungan baru; perpindahan posisi
+(layout saja) harus memakai hasil cache. Version CircuitModel/WireSystem menentukan kapan
+aplikasi menghitung ulang
+"""
+
+import pytest
+
+from ..calculator import CircuitCalculator
+from ..circuit_model import CircuitModel
+from ..mna_solver import circuit_signature
+from ..wire_system import WireSystem
+from .helpers import across, battery, lamp, loop, resistor, switch
+
+
+def series_circuit():
+    """Baterai 12 V + resistor 100 Ω + lampu 50 Ω (0.08 A)"""
+    return [battery(0), resistor(1, 100), lamp(2, 50)], loop(0, 1, 2)
+
+
+def test_same_circuit_hits_cache():
+    calculator = CircuitCalculator()
+    components, connections = series_circuit()
+    first = calculator.calculate_circuit(components, connections)
+    second = calculator.calculate_circuit(components, connections)
+
+    assert second == first
+    assert calculator.cache_stats == {'hits': 1, 'incremental': 0, 'full': 1}
+
+
+def test_layout_only_move_hits_cache():
+    calculator = CircuitCalculator()
+    components, connections = series_circuit()
+    calculator.calculate_circuit(components, connections)
+
+    moved = [dict(c, position=(c['position'][0] + 50, c['position'][1] + 80)) for c in components]
+    result = calculator.calculate_circuit(moved, connections)
+
+    assert calculator.cache_stats['hits'] == 1
+    assert result['current'] == pytest.approx(0.08)
+
+
+def test_wire_order_does_not_change_key():
+    components, connections = series_circuit()
+    assert circuit_signature(components, connections) == \
+        circuit_signature(components, list(reversed(connections)))
+
+
+def test_value_change_misses_cache():
+    calculator = CircuitCalculator()
+    components, connections = series_circuit()
+    calculator.calculate_circuit(components, connections)
+
+    components[1]['value']['resistance'] = 250  # total 300 Ω
+    result = calculator.calculate_circuit(components, connections)
+
+    assert calculator.cache_stats == {'hits': 0, 'incremental': 1, 'full': 1}
+    assert result['current'] == pytest.approx(0.04)
+
+
+def test_topology_change_misses_cache():
+    calculator = CircuitCalculator()
+    components = [battery(0), resistor(1, 100), resistor(2, 100)]
+    series = calculator.calculate_circuit(components, loop(0, 1, 2))
+    parallel = calculator.calculate_circuit(components, across(0, 1) + across(0, 2, wire_id=2))
+
+    assert calculator.cache_stats == {'hits': 0, 'incremental': 0, 'full': 2}
+    assert series['current'] == pytest.approx(0.06)
+    assert parallel['current'] == pytest.approx(0.24)
+
+
+def test_switch_toggle_misses_cache():
+    calculator = CircuitCalculator()
+    components = [battery(0), switch(1, 'ON'), lamp(2, 50)]
+    connections = loop(0, 1, 2)
+    closed = calculator.calculate_circuit(components, connections)
+
+    components[1]['value']['state'] = 'OFF'
+    opened = calculator.calculate_circuit(components, connections)
+
+    assert calculator.cache_stats['hits'] == 0
+    assert closed['current'] == pytest.approx(0.24)
+    assert opened['circuit_type'] == 'open'
+
+
+def test_cache_returns_earlier_result_after_revert():
+    calculator = CircuitCalculator()
+    components, connections = series_circuit()
+    calculator.calculate_circuit(components, connections)
+    components[1]['value']['resistance'] = 250
+    calculator.calculate_circuit(components, connections)
+
+    components[1]['value']['resistance'] = 100
+    result = calculator.calculate_circuit(components, connections)
+
+    assert calculator.cache_stats['hits'] == 1
+    assert result['current'] == pytest.approx(0.08)
+
+
+def test_model_version_tracks_calculation_inputs_only():
+    model = CircuitModel()
+    component = model.add('resistor', (200, 200), {'resistance': 100})
+    version, layout_version = model.version, model.layout_version
+
+    # Pindah posisi: render berubah, perhitungan tidak
+    assert model.move(component['id'], (260, 240))
+    assert model.version == version
+    assert model.layout_version == layout_version + 1
+
+    # Nilai sama tidak dianggap edit; nilai baru menaikkan version
+    assert not model.set_value(component['id'], 'resistance', 100)
+    assert model.version == version
+    assert model.set_value(component['id'], 'resistance', 220)
+    assert model.version == version + 1
+
+    assert model.remove(component['id'])
+    assert model.version == version + 2
+
+
+def test_wire_version_changes_when_wire_list_changes():
+    wires = WireSystem()
+    version = wires.version
+
+    # Kabel yang sedang ditarik belum mempengaruhi perhitungan
+    wires.start_wire_placement((100, 100))
+    wires.update_wire_end((200, 100))
+    assert wires.version == version
+
+    wire_id = wires.finish_wire_placement()
+    assert wires.version == version + 1
+    wires.remove_wire(wire_id)
+    assert wires.version == version + 2
+    wires.clear()
+    assert wires.version == version + 3
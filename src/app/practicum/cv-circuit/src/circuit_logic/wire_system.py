@@ -6,6 +6,17 @@ Sistem untuk membuat dan mengelola koneksi kabel
 import pygame
 import math
 
+from ..ui.text_cache import TEXT_CACHE
+
+# Jarak terminal dari pusat komponen (pixel); terminal 0 = kiri, 1 = kanan (kutub + baterai)
+TERMINAL_OFFSETS = {
+    'battery': 40,
+    'lamp': 30,
+    'resistor': 40,
+    'switch': 40,
+    'wire': 30
+}
+
 class WireSystem:
     """Sistem untuk mengelola kabel dan koneksi"""
     
@@ -13,6 +24,7 @@ class WireSystem:
         """Initialize wire system"""
         self.wires = []
         self.active_wire = None
+        self.version = 0  # Naik setiap daftar kabel jadi berubah (untuk cache render)
         self.connection_threshold = 30  # Jarak untuk deteksi koneksi (pixel)
         
     def start_wire_placement(self, start_pos):
@@ -28,6 +40,8 @@ class WireSystem:
             'end_pos': start_pos,
             'start_connection': None,
             'end_connection': None,
+            'start_terminal': None,
+            'end_terminal': None,
             'is_connected': False,
             'color': (255, 255, 0)  # Kuning untuk kabel yang sedang ditarik
         }
@@ -48,6 +62,7 @@ class WireSystem:
             # Tambahkan ke daftar kabel
             self.wires.append(self.active_wire.copy())
             self.active_wire = None
+            self.version += 1
             return len(self.wires) - 1  # Return wire ID
         return None
     
@@ -81,12 +96,14 @@ class WireSystem:
         
         return None
     
-    def check_connection(self, components):
+    def check_connection(self, components, component_index=None):
         """
         Cek koneksi kabel dengan komponen
         
         Args:
             components: List komponen dalam rangkaian
+            component_index: CircuitModel/SpatialGrid untuk mencari komponen di sekitar ujung
+                             kabel (None = cek semua komponen)
             
         Returns:
             list: List koneksi yang terdeteksi
@@ -95,28 +112,24 @@ class WireSystem:
             return []
             
         connections = []
-        start_pos = self.active_wire['start_pos']
-        end_pos = self.active_wire['end_pos']
-        
-        for component in components:
-            comp_pos = component['position']
-            comp_type = component['type']
+        for wire_end in ('start', 'end'):
+            wire_pos = self.active_wire[f'{wire_end}_pos']
+            if component_index is not None:
+                # Hanya komponen di sekitar ujung kabel (urutan list dipertahankan)
+                candidates = component_index.query(wire_pos, self.connection_threshold)
+            else:
+                candidates = components
             
-            # Cek koneksi ujung start
-            if self._is_touching(start_pos, comp_pos):
-                connections.append({
-                    'wire_end': 'start',
-                    'component': component,
-                    'connection_point': self._get_connection_point(comp_pos, comp_type, start_pos)
-                })
-            
-            # Cek koneksi ujung end
-            if self._is_touching(end_pos, comp_pos):
-                connections.append({
-                    'wire_end': 'end',
-                    'component': component,
-                    'connection_point': self._get_connection_point(comp_pos, comp_type, end_pos)
-                })
+            for component in candidates:
+                comp_pos = component['position']
+                if self._is_touching(wire_pos, comp_pos):
+                    connections.append({
+                        'wire_end': wire_end,
+                        'component': component,
+                        'terminal': self._get_terminal(comp_pos, wire_pos),
+                        'connection_point': self._get_connection_point(comp_pos, component['type'],
+                                                                       wire_pos)
+                    })
         
         return connections
     
@@ -137,9 +150,11 @@ class WireSystem:
             
             if wire_end == 'start':
                 self.active_wire['start_connection'] = component['id']
+                self.active_wire['start_terminal'] = connection['terminal']
                 self.active_wire['start_pos'] = connection_point
             elif wire_end == 'end':
                 self.active_wire['end_connection'] = component['id']
+                self.active_wire['end_terminal'] = connection['terminal']
                 self.active_wire['end_pos'] = connection_point
         
         # Cek apakah kabel sudah terhubung penuh
@@ -197,8 +212,7 @@ class WireSystem:
         
         # Label jika sedang aktif
         if is_active:
-            font = pygame.font.Font(None, 24)
-            label = font.render("TARIK UNTUK SAMBUNG KABEL", True, (255, 255, 0))
+            label = TEXT_CACHE.font(24).render("TARIK UNTUK SAMBUNG KABEL", True, (255, 255, 0))
             # Background semi-transparan untuk label
             label_rect = label.get_rect()
             label_pos = ((start_pos[0] + end_pos[0]) // 2 - label_rect.width//2, 
@@ -222,9 +236,13 @@ class WireSystem:
         Returns:
             tuple: Posisi titik koneksi
         """
-        # Simplified: gunakan posisi komponen sebagai titik koneksi
-        # TODO: Implement proper connection points based on component type
-        return comp_pos
+        offset = TERMINAL_OFFSETS.get(comp_type, 25)
+        side = -1 if self._get_terminal(comp_pos, wire_pos) == 0 else 1
+        return (comp_pos[0] + side * offset, comp_pos[1])
+    
+    def _get_terminal(self, comp_pos, wire_pos):
+        """Terminal komponen yang didekati ujung kabel: 0 = kiri, 1 = kanan"""
+        return 0 if wire_pos[0] < comp_pos[0] else 1
     
     def _is_touching(self, pos1, pos2):
         """Cek apakah dua posisi bersentuhan"""
@@ -245,6 +263,7 @@ class WireSystem:
         """Hapus semua kabel"""
         self.wires.clear()
         self.active_wire = None
+        self.version += 1
     
     def remove_wire(self, wire_id):
         """
@@ -254,13 +273,14 @@ class WireSystem:
             wire_id: ID kabel yang akan dihapus
         """
         self.wires = [w for w in self.wires if w.get('id') != wire_id]
+        self.version += 1
     
     def get_connected_components(self):
         """
         Dapatkan komponen yang terhubung melalui kabel
         
         Returns:
-            list: List pasangan komponen yang terhubung
+            list: List pasangan komponen (beserta terminalnya) yang terhubung
         """
         connections = []
         for wire in self.wires:
@@ -269,6 +289,8 @@ class WireSystem:
                 connections.append({
                     'component1': wire['start_connection'],
                     'component2': wire['end_connection'],
+                    'terminal1': wire.get('start_terminal', 1),
+                    'terminal2': wire.get('end_terminal', 0),
                     'wire_id': wire['id']
                 })
         return connections
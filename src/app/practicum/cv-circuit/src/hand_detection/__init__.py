@@ -2,6 +2,14 @@
 Hand Detection Module Initialization
 """
 
+from .backends import (MediaPipeBackend, OnnxHandBackend, ScriptedBackend, create_backend,
+                       select_backend)
+from .filters import FrameClock
+from .hand_tracker import HandTracker
+from .inference_pool import InferencePool
+from .inference_scheduler import InferenceScheduler
 from .pinch_detector import PinchDetector
 
-__all__ = ['PinchDetector']
+__all__ = ['PinchDetector', 'InferenceScheduler', 'InferencePool', 'FrameClock', 'HandTracker',
+           'MediaPipeBackend', 'OnnxHandBackend', 'ScriptedBackend', 'create_backend',
+           'select_backend']
@@ -0,0 +1,320 @@
+"""
+Hand Landmark Backends Module
+Backend inference landmark tangan dengan interface yang sama (detect(rgb_frame) -> batch
+(N, 21, 3) + handedness): MediaPipe Hands dengan model_complexity berbeda, model ONNX
+landmark tangan lewat OpenCV DNN, dan backend sintetis untuk test. Backend bisa dipilih
+otomatis berdasarkan latensi yang diukur di mesin ini
+"""
+
+import os
+import time
+
+import cv2
+import numpy as np
+
+from .landmarks import NUM_LANDMARKS, as_hand_batch
+
+# Kandidat pemilihan otomatis, urut dari yang paling akurat
+AUTO_CANDIDATES = ('mediapipe:1', 'mediapipe:0', 'onnx')
+# Latensi inference maksimum (ms) untuk backend pilihan otomatis
+DEFAULT_BUDGET_MS = 20.0
+
+
+class MediaPipeBackend:
+    """Backend MediaPipe Hands (palm detection + landmark)"""
+
+    supports_roi = True
+
+    def __init__(self, model_complexity=1, static_image_mode=False, max_num_hands=2,
+                 min_detection_confidence=0.8, min_tracking_confidence=0.8, min_score=0.5):
+        """
+        Initialize backend
+
+        Args:
+            model_complexity: 0 (model lite, lebih cepat) atau 1 (lebih akurat)
+            static_image_mode: True = palm detection setiap frame (tanpa tracking internal)
+            max_num_hands: Jumlah tangan maksimum
+            min_detection_confidence: Confidence minimum deteksi telapak tangan
+            min_tracking_confidence: Confidence minimum tracking landmark
+            min_score: Skor handedness minimum agar tangan dipakai
+        """
+        import mediapipe as mp
+
+        self.name = f'mediapipe:{model_complexity}'
+        self.options = {
+            'model_complexity': model_complexity,
+            'max_num_hands': max_num_hands,
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence
+        }
+        self.min_score = min_score
+        self.hands = mp.solutions.hands.Hands(static_image_mode=static_image_mode, **self.options)
+
+    def detect(self, rgb_frame):
+        """
+        Deteksi tangan di frame
+
+        Args:
+            rgb_frame: Frame RGB (H, W, 3)
+
+        Returns:
+            tuple: (landmarks (N, 21, 3) float32 ternormalisasi atau None, tuple handedness)
+        """
+        results = self.hands.process(rgb_frame)
+        if not results.multi_hand_landmarks:
+            return None, None
+
+        hands = []
+        handedness = []
+        for i, hand in enumerate(results.multi_hand_landmarks):
+            label = None
+            if results.multi_handedness and i < len(results.multi_handedness):
+                classification = results.multi_handedness[i].classification[0]
+                if classification.score < self.min_score:
+                    continue
+                label = classification.label
+            hands.append([(lm.x, lm.y, lm.z) for lm in hand.landmark])
+            handedness.append(label)
+
+        if not hands:
+            return None, None
+        return np.array(hands, dtype=np.float32), tuple(handedness)
+
+    def roi_backend(self):
+        """Instance untuk crop ROI (tracking mode, opsi sama)"""
+        return MediaPipeBackend(static_image_mode=False, min_score=self.min_score, **self.options)
+
+    def close(self):
+        """Tutup graph MediaPipe"""
+        self.hands.close()
+
+
+class OnnxHandBackend:
+    """Backend model landmark tangan ONNX (misalnya hand_landmark MediaPipe yang dikonversi)
+    lewat OpenCV DNN
+
+    Model hanya memuat landmark satu tangan tanpa palm detection, jadi paling cocok dengan
+    policy ROI: scheduler memberi crop di sekitar tangan terakhir, deteksi full-frame memakai
+    seluruh frame (di-letterbox ke persegi). Model menerima RGB NCHW [0, 1] dan mengeluarkan
+    63 nilai landmark (pixel input), skor keberadaan tangan dan skor tangan kanan.
+    """
+
+    supports_roi = True
+
+    def __init__(self, model_path=None, input_size=224, min_score=0.8):
+        """
+        Initialize backend
+
+        Args:
+            model_path: Path file .onnx (default: env CV_HAND_MODEL)
+            input_size: Sisi input persegi model (pixel)
+            min_score: Skor keberadaan tangan minimum
+        """
+        model_path = model_path or os.environ.get('CV_HAND_MODEL')
+        if not model_path or not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model landmark ONNX tidak ditemukan: {model_path!r} "
+                                    "(set CV_HAND_MODEL)")
+        self.name = f'onnx:{model_path}'
+        self.model_path = model_path
+        self.input_size = input_size
+        self.min_score = min_score
+        self.net = cv2.dnn.readNetFromONNX(model_path)
+        # Urut nama: output landmark (63) pertama dipakai, bukan world landmark
+        self.output_names = sorted(self.net.getUnconnectedOutLayersNames())
+        self._square = np.zeros((input_size, input_size, 3), dtype=np.uint8)
+
+    def detect(self, rgb_frame):
+        """
+        Deteksi landmark satu tangan di frame
+
+        Args:
+            rgb_frame: Frame RGB (H, W, 3)
+
+        Returns:
+            tuple: (landmarks (1, 21, 3) float32 ternormalisasi atau None, tuple handedness)
+        """
+        height, width = rgb_frame.shape[:2]
+        scale = self.input_size / max(height, width)
+        new_w, new_h = max(1, round(width * scale)), max(1, round(height * scale))
+
+        # Letterbox: frame diperkecil tanpa mengubah rasio, sisanya hitam
+        self._square.fill(0)
+        self._square[:new_h, :new_w] = cv2.resize(rgb_frame, (new_w, new_h),
+                                                  interpolation=cv2.INTER_AREA)
+        self.net.setInput(cv2.dnn.blobFromImage(self._square, 1.0 / 255))
+        landmarks, score, right = self._parse(self.net.forward(self.output_names))
+        if landmarks is None or score < self.min_score:
+            return None, None
+
+        # Pixel input model -> koordinat ternormalisasi frame
+        landmarks = landmarks.reshape(1, NUM_LANDMARKS, 3) / scale
+        landmarks[..., 0] /= width
+        landmarks[..., 1] /= height
+        landmarks[..., 2] /= width
+        return landmarks.astype(np.float32), ('Right' if right >= 0.5 else 'Left',)
+
+    def _parse(self, outputs):
+        """Pisahkan output model: (landmark 63, skor tangan, skor tangan kanan)"""
+        landmarks = None
+        scalars = []
+        for output in outputs:
+            output = np.asarray(output).ravel()
+            if output.size == NUM_LANDMARKS * 3:
+                if landmarks is None:
+                    landmarks = output.astype(np.float32)
+            elif output.size == 1:
+                scalars.append(float(output[0]))
+        score = scalars[0] if scalars else 1.0
+        right = scalars[1] if len(scalars) > 1 else 1.0
+        return landmarks, score, right
+
+    def roi_backend(self):
+        """Model tanpa state: instance yang sama dipakai untuk crop ROI"""
+        return self
+
+    def close(self):
+        """Tidak ada resource yang perlu ditutup"""
+
+
+class ScriptedBackend:
+    """Backend sintetis (naskah gerakan ScriptedHandFeed) untuk test tanpa model
+
+    Landmark dihasilkan dalam koordinat full-frame, jadi tidak mendukung crop ROI.
+    """
+
+    supports_roi = False
+
+    def __init__(self, hands=1, feed=None):
+        """
+        Initialize backend
+
+        Args:
+            hands: Jumlah tangan sintetis
+            feed: Objek dengan process(rgb_frame) seperti ScriptedHandFeed
+                  (default: ScriptedHandFeed dengan naskah default)
+        """
+        if feed is None:
+            from ..replay.replay_engine import ScriptedHandFeed
+            feed = ScriptedHandFeed(hands=hands)
+        self.name = 'scripted'
+        self.feed = feed
+
+    def detect(self, rgb_frame):
+        """Landmark frame berikutnya dari naskah"""
+        landmarks, handedness, _ = self.feed.process(rgb_frame)
+        if landmarks is None:
+            return None, None
+        if handedness is None or isinstance(handedness, str):
+            handedness = (handedness,)
+        return as_hand_batch(landmarks), tuple(handedness)
+
+    def roi_backend(self):
+        """Tidak mendukung crop ROI"""
+        return None
+
+    def close(self):
+        """Tidak ada resource"""
+
+
+def create_backend(spec='mediapipe', max_hands=2, static_image_mode=False,
+                   min_detection_confidence=0.8, min_tracking_confidence=0.8):
+    """
+    Buat backend landmark berdasarkan spesifikasi
+
+    Args:
+        spec: 'mediapipe[:COMPLEXITY]' (default 1), 'onnx[:PATH]' (default env CV_HAND_MODEL),
+              'scripted[:HANDS]', atau objek backend yang sudah dibuat (dikembalikan apa adanya)
+        max_hands: Jumlah tangan maksimum
+        static_image_mode: MediaPipe: palm detection setiap frame
+        min_detection_confidence: Confidence minimum deteksi
+        min_tracking_confidence: Confidence minimum tracking (MediaPipe)
+
+    Returns:
+        Objek dengan interface detect()/roi_backend()/close()
+    """
+    if hasattr(spec, 'detect'):
+        return spec
+
+    name, _, arg = str(spec).strip().partition(':')
+    if name == 'mediapipe':
+        return MediaPipeBackend(model_complexity=int(arg) if arg else 1,
+                                static_image_mode=static_image_mode,
+                                max_num_hands=max_hands,
+                                min_detection_confidence=min_detection_confidence,
+                                min_tracking_confidence=min_tracking_confidence)
+    if name == 'onnx':
+        return OnnxHandBackend(arg or None, min_score=min_detection_confidence)
+    if name == 'scripted':
+        return ScriptedBackend(hands=int(arg) if arg else 1)
+    raise ValueError(f"Backend tidak dikenal: {spec!r} (pilihan: mediapipe[:0|1], onnx[:PATH], "
+                     "scripted[:HANDS], auto)")
+
+
+def measure_latency(backend, frame, samples=10, warmup=2):
+    """
+    Ukur latensi detect() (median, ms)
+
+    Args:
+        backend: Backend landmark
+        frame: Frame RGB yang dipakai untuk mengukur
+        samples: Jumlah pengukuran
+        warmup: Jumlah panggilan awal yang tidak diukur (inisialisasi graph/delegate)
+
+    Returns:
+        float
+    """
+    for _ in range(warmup):
+        backend.detect(frame)
+    times = []
+    for _ in range(max(1, samples)):
+        start = time.perf_counter()
+        backend.detect(frame)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def select_backend(frame, candidates=AUTO_CANDIDATES, budget_ms=None, samples=10, **options):
+    """
+    Pilih backend paling akurat yang latensinya masuk budget di mesin ini
+
+    Kandidat dicoba berurutan; kandidat yang tidak tersedia (library/model tidak ada)
+    dilewati. Jika tidak ada yang masuk budget, backend tercepat yang dipakai.
+
+    Args:
+        frame: Frame RGB untuk mengukur (sebaiknya frame kamera sungguhan)
+        candidates: Spesifikasi backend, urut dari yang paling akurat
+        budget_ms: Latensi maksimum (default: env CV_BACKEND_BUDGET_MS atau DEFAULT_BUDGET_MS)
+        samples: Jumlah pengukuran per kandidat
+        **options: Argumen tambahan untuk create_backend
+
+    Returns:
+        tuple: (backend, report) dengan report = list {'backend', 'latency_ms' atau 'error'}
+    """
+    if budget_ms is None:
+        budget_ms = float(os.environ.get('CV_BACKEND_BUDGET_MS', DEFAULT_BUDGET_MS))
+
+    report = []
+    fastest = None  # (latency, backend)
+    for spec in candidates:
+        try:
+            backend = create_backend(spec, **options)
+        except (ImportError, OSError, ValueError, cv2.error) as e:
+            report.append({'backend': str(spec), 'error': str(e)})
+            continue
+        latency = measure_latency(backend, frame, samples)
+        report.append({'backend': backend.name, 'latency_ms': round(latency, 2)})
+
+        if latency <= budget_ms:
+            if fastest is not None:
+                fastest[1].close()
+            return backend, report
+        if fastest is None or latency < fastest[0]:
+            if fastest is not None:
+                fastest[1].close()
+            fastest = (latency, backend)
+        else:
+            backend.close()
+
+    if fastest is None:
+        raise RuntimeError(f"Tidak ada backend landmark yang tersedia: {report}")
+    return fastest[1], report
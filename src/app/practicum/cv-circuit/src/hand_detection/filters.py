@@ -0,0 +1,79 @@
+"""
+Landmark Filters Module
+Langkah filter temporal antara MediaPipe dan handler interaksi (state per tangan disimpan
+HandTracker): One Euro filter vectorized untuk seluruh 21 landmark, dan status pinch dengan
+hysteresis + debounce agar jitter di sekitar threshold tidak membuat pinch menyala/mati
+berulang kali
+"""
+
+import numpy as np
+
+
+def _smoothing_factor(cutoff, dt):
+    """Alpha low-pass untuk frekuensi cutoff (Hz) dan selang waktu dt (detik)"""
+    tau = 1.0 / (2.0 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+def one_euro_step(value, velocity, sample, dt, min_cutoff=1.0, beta=20.0, d_cutoff=1.0):
+    """
+    Satu langkah One Euro filter, vectorized untuk seluruh array
+
+    Args:
+        value: Nilai hasil filter sebelumnya, misalnya (N, 21, 3)
+        velocity: Kecepatan hasil filter sebelumnya (shape sama)
+        sample: Sampel baru (shape sama)
+        dt: Selang waktu (detik); skalar atau array yang di-broadcast, misalnya (N, 1, 1)
+        min_cutoff: Cutoff minimum (Hz) saat diam
+        beta: Kenaikan cutoff per satuan kecepatan
+        d_cutoff: Cutoff (Hz) untuk kecepatan
+
+    Returns:
+        tuple: (value baru float32, velocity baru)
+    """
+    # Kecepatan dihaluskan dulu, lalu menentukan cutoff setiap elemen
+    velocity = velocity + _smoothing_factor(d_cutoff, dt) * ((sample - value) / dt - velocity)
+    alpha = _smoothing_factor(min_cutoff + beta * np.abs(velocity), dt)
+    value = (value + alpha * (sample - value)).astype(np.float32, copy=False)
+    return value, velocity
+
+
+def pinch_hysteresis_step(is_pinching, pending, distance, threshold, release_ratio=1.25,
+                          debounce_frames=2):
+    """
+    Satu langkah hysteresis + debounce status pinch, vectorized untuk banyak tangan
+
+    Args:
+        is_pinching: Status sekarang (bool atau array bool)
+        pending: Jumlah frame berturut-turut yang meminta status berganti
+        distance: Jarak jempol-telunjuk frame ini (pixel)
+        threshold: Threshold pinch (pixel); pinch dilepas di threshold * release_ratio
+        release_ratio: Rasio threshold lepas terhadap threshold masuk
+        debounce_frames: Frame berturut-turut yang dibutuhkan sebelum status berganti
+
+    Returns:
+        tuple: (is_pinching, pending) sebagai array
+    """
+    wants_change = np.where(is_pinching, distance > threshold * release_ratio, distance < threshold)
+    pending = np.where(wants_change, pending + 1, 0)
+    flip = pending >= debounce_frames
+    return np.logical_xor(is_pinching, flip), np.where(flip, 0, pending)
+
+
+class FrameClock:
+    """Jam berbasis nomor frame untuk replay/benchmark (hasil filter tidak bergantung kecepatan putar)"""
+
+    def __init__(self, fps=30.0):
+        """
+        Initialize clock
+
+        Args:
+            fps: Laju frame yang diasumsikan
+        """
+        self.fps = fps
+        self.frames = 0
+
+    def __call__(self):
+        """Waktu (detik) untuk frame berikutnya"""
+        self.frames += 1
+        return self.frames / self.fps
@@ -0,0 +1,140 @@
+"""
+Hand Tracker Module
+Memberi ID stabil ke setiap tangan antar frame dan menyimpan state per tangan (One Euro
+filter landmark, hysteresis pinch) sebagai array bertumpuk, sehingga filter dan perhitungan
+pinch untuk semua tangan berjalan dalam satu operasi array
+"""
+
+import numpy as np
+
+from .filters import one_euro_step, pinch_hysteresis_step
+from .landmarks import (NUM_LANDMARKS, as_hand_batch, hand_centers, match_hands, pinch_geometry,
+                        to_pixels)
+
+
+def _gather(state, previous, matched, fallback):
+    """State sebelumnya untuk tangan yang cocok, fallback untuk tangan baru"""
+    if not matched.any():
+        return fallback
+    if matched.all():
+        return state[previous]
+    mask = matched.reshape((-1,) + (1,) * (fallback.ndim - 1))
+    return np.where(mask, state[previous], fallback)
+
+
+class HandTracker:
+    """State per tangan (ID stabil, filter landmark, status pinch) untuk banyak tangan"""
+
+    def __init__(self, max_hands=2, match_distance=0.2, max_missed=3, smoothing=True,
+                 min_cutoff=1.0, beta=20.0, d_cutoff=1.0, release_ratio=1.25, debounce_frames=2):
+        """
+        Initialize tracker
+
+        Args:
+            max_hands: Jumlah tangan maksimum yang dilacak
+            match_distance: Jarak titik tengah maksimum (koordinat ternormalisasi) agar
+                            tangan frame ini dianggap tangan yang sama dengan frame sebelumnya
+            max_missed: Frame tanpa deteksi sebelum ID tangan dilupakan
+            smoothing: Haluskan landmark dengan One Euro filter
+            min_cutoff, beta, d_cutoff: Parameter One Euro filter
+            release_ratio: Pinch dilepas saat jarak > threshold * release_ratio
+            debounce_frames: Frame berturut-turut sebelum status pinch berganti
+        """
+        self.max_hands = max_hands
+        self.match_distance = match_distance
+        self.max_missed = max_missed
+        self.smoothing = smoothing
+        self.one_euro = {'min_cutoff': min_cutoff, 'beta': beta, 'd_cutoff': d_cutoff}
+        self.release_ratio = release_ratio
+        self.debounce_frames = debounce_frames
+        self._next_id = 1
+        self.reset()
+
+    def reset(self):
+        """Lupakan semua tangan"""
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.velocities = np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.timestamps = np.zeros(0)
+        self.pinching = np.zeros(0, dtype=bool)
+        self.pending = np.zeros(0, dtype=np.int64)
+        self.missed = np.zeros(0, dtype=np.int64)
+
+    def update(self, landmarks, timestamp, frame_size, threshold):
+        """
+        Proses deteksi satu frame
+
+        Args:
+            landmarks: Landmark mentah (21, 3), batch (N, 21, 3) atau None
+            timestamp: Waktu frame (detik)
+            frame_size: (lebar, tinggi) frame untuk koordinat pixel
+            threshold: Threshold pinch (pixel)
+
+        Returns:
+            dict: Array untuk tangan yang terlihat, berurutan sesuai ID (tangan terlama dulu):
+                  'ids' (N,), 'order' (N,) index ke batch input, 'landmarks' (N, 21, 3),
+                  'pixels' (N, 21, 2), 'thumb', 'index', 'position' (N, 2),
+                  'distance' (N,), 'is_pinching' (N,)
+        """
+        batch = as_hand_batch(landmarks)[:self.max_hands]
+        count = len(batch)
+
+        # Pasangkan dengan tangan yang sudah dilacak; sisanya mendapat ID baru
+        matches = match_hands(hand_centers(self.values), hand_centers(batch), self.match_distance)
+        matched = matches >= 0
+        new_count = int(count - matched.sum())
+        ids = np.empty(count, dtype=np.int64)
+        ids[matched] = self.ids[matches[matched]]
+        ids[~matched] = np.arange(self._next_id, self._next_id + new_count)
+        self._next_id += new_count
+
+        # State sebelumnya per tangan (tangan baru mulai dari sampel mentahnya)
+        previous = np.where(matched, matches, 0)
+        values = _gather(self.values, previous, matched, batch)
+        velocities = _gather(self.velocities, previous, matched, np.zeros_like(batch))
+        pinching = _gather(self.pinching, previous, matched, np.zeros(count, dtype=bool))
+        pending = _gather(self.pending, previous, matched, np.zeros(count, dtype=np.int64))
+
+        if not self.smoothing:
+            values = batch
+        elif matched.any():
+            dt = timestamp - _gather(self.timestamps, previous, matched, np.full(count, timestamp))
+            step = (dt > 0)[:, None, None]
+            smoothed, smoothed_velocity = one_euro_step(values, velocities, batch,
+                                                        np.where(step, dt[:, None, None], 1.0),
+                                                        **self.one_euro)
+            values = np.where(step, smoothed, values).astype(np.float32)
+            velocities = np.where(step, smoothed_velocity, velocities).astype(np.float32)
+
+        # Pinch untuk semua tangan sekaligus
+        width, height = frame_size
+        pixels = to_pixels(values, width, height)
+        thumb, index, distance, position = pinch_geometry(pixels)
+        pinching, pending = pinch_hysteresis_step(pinching, pending, distance, threshold,
+                                                  self.release_ratio, self.debounce_frames)
+
+        # Tangan yang tidak terlihat disimpan beberapa frame agar ID-nya tetap
+        unseen = self.missed < self.max_missed
+        unseen[matches[matched]] = False
+        kept = np.flatnonzero(unseen)
+        self.ids = np.concatenate([ids, self.ids[kept]])
+        self.values = np.concatenate([values, self.values[kept]])
+        self.velocities = np.concatenate([velocities, self.velocities[kept]])
+        self.timestamps = np.concatenate([np.full(count, timestamp), self.timestamps[kept]])
+        # Tangan yang hilang kembali dalam keadaan tidak pinch
+        self.pinching = np.concatenate([pinching, np.zeros(len(kept), dtype=bool)])
+        self.pending = np.concatenate([pending, np.zeros(len(kept), dtype=np.int64)])
+        self.missed = np.concatenate([np.zeros(count, dtype=np.int64), self.missed[kept] + 1])
+
+        order = np.argsort(ids, kind='stable')
+        return {
+            'ids': ids[order],
+            'order': order,
+            'landmarks': values[order],
+            'pixels': pixels[order],
+            'thumb': thumb[order],
+            'index': index[order],
+            'position': position[order],
+            'distance': distance[order],
+            'is_pinching': pinching[order]
+        }
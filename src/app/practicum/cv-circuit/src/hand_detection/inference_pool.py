@@ -0,0 +1,384 @@
+"""
+Inference Pool Module
+Menjalankan inference landmark tangan (backend MediaPipe/ONNX) di proses terpisah. Frame dikirim lewat shared memory
+(tanpa pickling frame), hasil berupa array landmark dikembalikan berurutan sesuai nomor sequence
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque, namedtuple
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from .backends import create_backend
+from .inference_scheduler import (InferenceScheduler, POLICIES, POLICY_ROI, POLICY_ROI_SKIP,
+                                  POLICY_SKIP)
+
+# Hasil inference untuk satu frame yang di-submit (landmarks: batch (N, 21, 3) atau None)
+InferenceResult = namedtuple('InferenceResult',
+                             ['seq', 'landmarks', 'handedness', 'source', 'infer_ms', 'timestamp'])
+
+# Default per pool; PinchDetector menimpanya dengan konfigurasinya sendiri lewat configure()
+DEFAULT_HANDS_OPTIONS = {
+    'max_hands': 2,
+    'min_detection_confidence': 0.8,
+    'min_tracking_confidence': 0.8
+}
+
+
+def _worker_main(shm_name, slots_shape, task_queue, result_queue, policy, backend_spec,
+                 hands_options):
+    """
+    Loop proses worker: baca frame RGB dari slot shared memory, jalankan inference
+
+    Args:
+        shm_name: Nama blok shared memory berisi semua slot frame
+        slots_shape: Shape array slot (slots, H, W, 3)
+        task_queue: Queue berisi (seq, slot, hint) atau None untuk berhenti; hint =
+                    (seq, landmarks, handedness) hasil terbaru yang sudah dilepas pool
+                    (mode ROI) atau None
+        result_queue: Queue untuk (seq, slot, landmarks, handedness, source, infer_ms)
+        policy: Policy InferenceScheduler di worker (lihat POLICIES)
+        backend_spec: Spesifikasi backend untuk create_backend (misalnya 'mediapipe:1')
+        hands_options: Argumen tambahan untuk create_backend
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray(slots_shape, dtype=np.uint8, buffer=shm.buf)
+
+    # Mode ROI: detector full-frame dipakai sesekali, jadi pakai static mode
+    roi_policy = policy in (POLICY_ROI, POLICY_ROI_SKIP)
+    backend = create_backend(backend_spec, static_image_mode=roi_policy, **hands_options)
+    # Frame dilewati oleh pool (submit), jadi worker menjalankan inference di setiap tugas
+    scheduler = InferenceScheduler(
+        backend,
+        roi_backend_factory=backend.roi_backend if backend.supports_roi else None,
+        policy=policy,
+        skip_frames=0
+    )
+    last_seq = -1
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            seq, slot, hint = task
+            if hint is not None and hint[0] > last_seq:
+                # Worker lain memproses frame di antaranya: ROI dihitung dari hasil terbaru
+                # pool, bukan dari frame terakhir worker ini yang sudah lebih basi
+                scheduler.seed(hint[1], hint[2])
+            last_seq = seq
+            start = time.perf_counter()
+            try:
+                # View langsung ke shared memory, tidak ada salinan frame
+                landmarks, handedness, source = scheduler.process(frames[slot])
+            except Exception as e:
+                print(f"Inference worker {os.getpid()} error: {e}")
+                landmarks, handedness, source = None, None, 'error'
+            infer_ms = (time.perf_counter() - start) * 1000
+            result_queue.put((seq, slot, landmarks, handedness, source, infer_ms))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.close()
+        backend.close()
+        del frames
+        shm.close()
+
+
+class InferencePool:
+    """Pool proses inference tangan dengan frame di shared memory dan hasil berurutan"""
+
+    def __init__(self, num_workers=2, slots=None, policy=POLICY_ROI, skip_frames=0,
+                 backend='mediapipe', hands_options=None, start_method='spawn'):
+        """
+        Initialize pool (proses worker baru dijalankan saat frame pertama di-submit)
+
+        Args:
+            num_workers: Jumlah proses worker
+            slots: Jumlah slot frame di shared memory (default: 2 per worker)
+            policy: Policy InferenceScheduler di setiap worker (lihat POLICIES)
+            skip_frames: Frame yang tidak di-submit setelah setiap frame yang di-submit
+                         (hanya untuk policy 'skip'/'roi_skip')
+            backend: Spesifikasi backend landmark di worker (lihat create_backend)
+            hands_options: Argumen tambahan untuk create_backend
+            start_method: Start method multiprocessing ('spawn' aman dipakai bersama thread/pygame)
+        """
+        self.num_workers = max(1, num_workers)
+        self.slots = slots or self.num_workers * 2
+        self.policy = POLICY_ROI
+        self.skip_frames = 0
+        self.backend = backend
+        self.hands_options = dict(DEFAULT_HANDS_OPTIONS)
+        self.configure(policy=policy, skip_frames=skip_frames, hands_options=hands_options)
+        self._context = multiprocessing.get_context(start_method)
+
+        self.frame_shape = None
+        self._shm = None
+        self._frames = None
+        self._workers = []
+        self._task_queue = None
+        self._result_queue = None
+        self._reset_state()
+
+    def configure(self, backend=None, policy=None, skip_frames=None, hands_options=None):
+        """
+        Samakan konfigurasi worker dengan detector pemakai pool
+
+        Berlaku saat worker dijalankan (frame pertama setelah dibuat atau setelah close()).
+
+        Args:
+            backend: Spesifikasi backend landmark (None = tidak diubah)
+            policy: Policy InferenceScheduler (None = tidak diubah)
+            skip_frames: Frame yang dilewati setelah setiap submit (None = tidak diubah)
+            hands_options: Argumen create_backend yang ditimpa (misalnya max_hands)
+        """
+        if backend is not None:
+            self.backend = backend
+        if policy is not None:
+            if policy not in POLICIES:
+                raise ValueError(f"Policy tidak dikenal: {policy!r} (pilihan: {POLICIES})")
+            self.policy = policy
+        if skip_frames is not None:
+            self.skip_frames = max(0, skip_frames)
+        if hands_options:
+            self.hands_options.update(hands_options)
+
+    def _reset_state(self):
+        """Reset sequence, slot dan buffer urutan"""
+        self._next_submit = 0
+        self._next_release = 0
+        self._free_slots = deque(range(self.slots))
+        self._inflight = {}   # seq -> (slot, waktu submit)
+        self._pending = {}    # seq -> InferenceResult yang datang lebih awal dari urutannya
+        self._latest = None
+        self._unread = []     # Hasil yang sudah dilepas tetapi belum diambil poll()/latest()
+        self._skip_remaining = 0
+        self.frames_submitted = 0
+        self.frames_skipped = 0
+        self.frames_dropped = 0
+        self.results_lost = 0
+        self.infer_ms = 0.0
+        self.latency_ms = 0.0
+
+    def _start(self, frame_shape):
+        """Alokasikan shared memory untuk slot frame dan jalankan worker"""
+        self.frame_shape = frame_shape
+        slots_shape = (self.slots,) + frame_shape
+        nbytes = int(np.prod(slots_shape))
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._frames = np.ndarray(slots_shape, dtype=np.uint8, buffer=self._shm.buf)
+        self._task_queue = self._context.Queue()
+        self._result_queue = self._context.Queue()
+
+        self._workers = []
+        for i in range(self.num_workers):
+            worker = self._context.Process(
+                target=_worker_main,
+                args=(self._shm.name, slots_shape, self._task_queue, self._result_queue,
+                      self.policy, self.backend, self.hands_options),
+                name=f'InferenceWorker-{i}',
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    @property
+    def is_running(self):
+        """True jika worker sudah dijalankan"""
+        return self._shm is not None
+
+    def submit(self, frame, bgr=True):
+        """
+        Kirim frame ke worker (tidak blocking)
+
+        Satu-satunya salinan frame adalah penulisan ke slot shared memory: frame BGR
+        dikonversi ke RGB langsung ke slot (cvtColor dengan dst), frame RGB di-copy ke slot.
+        Worker membaca slot tanpa salinan tambahan.
+
+        Args:
+            frame: Frame (H, W, 3) uint8
+            bgr: True jika frame dalam format BGR (OpenCV)
+
+        Returns:
+            int: Nomor sequence, atau None jika frame dilewati (policy skip atau semua
+                 slot sedang dipakai)
+        """
+        if self._shm is None:
+            self._start(frame.shape)
+        elif frame.shape != self.frame_shape:
+            raise ValueError(f"Ukuran frame berubah: {frame.shape} != {self.frame_shape}")
+
+        self._collect()
+        if self._skip_remaining > 0:
+            self._skip_remaining -= 1
+            self.frames_skipped += 1
+            return None
+        if not self._free_slots:
+            # Worker belum selesai: lewati frame ini daripada menahan capture/render
+            self.frames_dropped += 1
+            return None
+
+        slot = self._free_slots.popleft()
+        if bgr:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._frames[slot])
+        else:
+            np.copyto(self._frames[slot], frame)
+
+        seq = self._next_submit
+        self._next_submit += 1
+        self._inflight[seq] = (slot, time.perf_counter())
+        hint = None
+        if self.policy in (POLICY_ROI, POLICY_ROI_SKIP) and self._latest is not None:
+            hint = (self._latest.seq, self._latest.landmarks, self._latest.handedness)
+        self._task_queue.put((seq, slot, hint))
+        self.frames_submitted += 1
+        if self.policy in (POLICY_SKIP, POLICY_ROI_SKIP):
+            self._skip_remaining = self.skip_frames
+        return seq
+
+    def _collect(self, timeout=None):
+        """
+        Ambil hasil dari worker dan lepaskan hasil yang sudah berurutan ke daftar hasil
+        yang belum dibaca (juga dipanggil oleh submit, jadi hasil tidak boleh hilang di sini)
+
+        Args:
+            timeout: None = tidak blocking, selain itu tunggu satu hasil maksimal timeout detik
+        """
+        if self._result_queue is None:
+            return
+
+        while True:
+            try:
+                if timeout is None:
+                    item = self._result_queue.get_nowait()
+                else:
+                    item = self._result_queue.get(timeout=timeout)
+                    timeout = None
+            except queue.Empty:
+                break
+
+            seq, slot, landmarks, handedness, source, infer_ms = item
+            inflight = self._inflight.pop(seq, None)
+            if inflight is None:
+                # Hasil untuk sequence yang sudah dianggap hilang
+                continue
+            self._free_slots.append(slot)
+            now = time.perf_counter()
+            latency = (now - inflight[1]) * 1000
+            self.infer_ms = 0.9 * self.infer_ms + 0.1 * infer_ms if self.infer_ms else infer_ms
+            self.latency_ms = 0.9 * self.latency_ms + 0.1 * latency if self.latency_ms else latency
+            self._pending[seq] = InferenceResult(seq, landmarks, handedness, source, infer_ms, now)
+
+        while self._pending:
+            if self._next_release in self._pending:
+                result = self._pending.pop(self._next_release)
+                self._unread.append(result)
+                self._latest = result
+            elif max(self._pending) >= self._next_release + self.slots:
+                # Sequence ini tidak akan pernah datang (worker mati): lepaskan slotnya
+                lost = self._inflight.pop(self._next_release, None)
+                if lost is not None:
+                    self._free_slots.append(lost[0])
+                self.results_lost += 1
+            else:
+                break
+            self._next_release += 1
+
+    def poll(self):
+        """
+        Ambil semua hasil baru yang sudah berurutan (tidak blocking)
+
+        Returns:
+            list: InferenceResult urut sesuai sequence
+        """
+        self._collect()
+        released, self._unread = self._unread, []
+        return released
+
+    def latest(self):
+        """
+        Hasil berurutan terbaru yang dilepas sejak panggilan sebelumnya (tidak blocking)
+
+        Hasil yang sudah pernah dikembalikan tidak dikembalikan lagi, sehingga pemanggil tidak
+        memperlakukan landmark lama sebagai deteksi baru.
+
+        Returns:
+            InferenceResult atau None jika tidak ada hasil baru
+        """
+        released = self.poll()
+        return released[-1] if released else None
+
+    def workers_alive(self):
+        """Jumlah proses worker yang masih hidup"""
+        return sum(1 for w in self._workers if w.is_alive())
+
+    def wait(self, seq, timeout=1.0):
+        """
+        Tunggu sampai hasil untuk `seq` (dan semua sebelumnya) dilepas
+
+        Args:
+            seq: Nomor sequence dari submit()
+            timeout: Batas waktu (detik)
+
+        Returns:
+            InferenceResult atau None jika timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self._next_release <= seq:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._collect(timeout=remaining)
+        return self._latest if self._latest is not None and self._latest.seq >= seq else None
+
+    def get_stats(self):
+        """Dapatkan statistik pool"""
+        return {
+            'workers': self.num_workers,
+            'backend': self.backend,
+            'policy': self.policy,
+            'workers_alive': self.workers_alive(),
+            'slots': self.slots,
+            'in_flight': len(self._inflight),
+            'frames_submitted': self.frames_submitted,
+            'frames_skipped': self.frames_skipped,
+            'frames_dropped': self.frames_dropped,
+            'results_lost': self.results_lost,
+            'infer_ms': round(self.infer_ms, 2),
+            'latency_ms': round(self.latency_ms, 2)
+        }
+
+    def close(self, timeout=2.0):
+        """Hentikan worker dan lepaskan shared memory (submit berikutnya menjalankan ulang pool)"""
+        if self._shm is None:
+            return
+        for _ in self._workers:
+            self._task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+
+        for q in (self._task_queue, self._result_queue):
+            q.close()
+            q.join_thread()
+        self._task_queue = self._result_queue = None
+
+        self._frames = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+        self.frame_shape = None
+        self._reset_state()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
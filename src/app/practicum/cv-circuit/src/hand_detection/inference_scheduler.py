@@ -0,0 +1,244 @@
+"""
+Inference Scheduler Module
+Menjadwalkan inference backend landmark tangan: crop region-of-interest di sekitar tangan terakhir,
+deteksi full-frame berkala/saat tracking hilang, dan prediksi landmark di frame yang dilewati
+"""
+
+import numpy as np
+
+from .landmarks import hand_centers, match_hands
+
+# Kebijakan yang tersedia
+POLICY_FULL = 'full'          # Full-frame setiap frame (perilaku lama)
+POLICY_ROI = 'roi'            # Crop ROI setiap frame, full-frame berkala
+POLICY_SKIP = 'skip'          # Full-frame setiap N frame, frame lain diprediksi
+POLICY_ROI_SKIP = 'roi_skip'  # Crop ROI + lewati frame
+POLICIES = (POLICY_FULL, POLICY_ROI, POLICY_SKIP, POLICY_ROI_SKIP)
+
+# Cara mengisi landmark di frame yang dilewati
+FILL_HOLD = 'hold'                # Pakai landmark terakhir
+FILL_EXTRAPOLATE = 'extrapolate'  # Kecepatan konstan
+FILL_DAMPED = 'damped'            # Kecepatan meluruh tiap frame
+FILL_MODES = (FILL_HOLD, FILL_EXTRAPOLATE, FILL_DAMPED)
+
+# Jarak titik tengah maksimum (koordinat ternormalisasi) untuk memasangkan tangan antar inference
+MATCH_DISTANCE = 0.2
+
+
+class InferenceScheduler:
+    """Scheduler inference tangan dengan ROI cropping dan frame skipping
+
+    Semua tangan yang ditemukan dikembalikan sebagai batch (N, 21, 3). Mode ROI memakai satu
+    crop yang memuat semua tangan yang sedang dilacak; tangan baru di luar crop ditemukan
+    pada deteksi full-frame berkala.
+    """
+
+    def __init__(self, backend, roi_backend_factory=None, policy=POLICY_ROI_SKIP,
+                 skip_frames=1, full_detect_interval=15, roi_margin=0.35,
+                 min_roi_size=96, fill=FILL_EXTRAPOLATE, damping=0.6):
+        """
+        Initialize scheduler
+
+        Args:
+            backend: Backend landmark (lihat backends.py) untuk deteksi full-frame
+            roi_backend_factory: Callable yang membuat backend untuk crop ROI; None =
+                                 backend tidak mendukung crop, policy ROI menjadi full/skip
+            policy: Salah satu POLICIES
+            skip_frames: Jumlah frame yang dilewati setelah setiap inference
+            full_detect_interval: Deteksi full-frame setiap N inference (mode ROI)
+            roi_margin: Margin ROI relatif terhadap ukuran bounding box tangan
+            min_roi_size: Sisi ROI minimum (pixel)
+            fill: Salah satu FILL_MODES untuk frame yang dilewati
+            damping: Faktor peluruhan kecepatan untuk FILL_DAMPED
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Policy tidak dikenal: {policy!r} (pilihan: {POLICIES})")
+        if fill not in FILL_MODES:
+            raise ValueError(f"Fill mode tidak dikenal: {fill!r} (pilihan: {FILL_MODES})")
+
+        if roi_backend_factory is None:
+            policy = {POLICY_ROI: POLICY_FULL, POLICY_ROI_SKIP: POLICY_SKIP}.get(policy, policy)
+
+        self.backend = backend
+        self.roi_backend_factory = roi_backend_factory
+        self.roi_backend = None
+        self.policy = policy
+        self.skip_frames = max(0, skip_frames) if policy in (POLICY_SKIP, POLICY_ROI_SKIP) else 0
+        self.full_detect_interval = max(1, full_detect_interval)
+        self.roi_margin = roi_margin
+        self.min_roi_size = min_roi_size
+        self.fill = fill
+        self.damping = damping
+
+        self.reset()
+
+    def reset(self):
+        """Lupakan state tracking"""
+        self.last_landmarks = None     # (N, 21, 3) float32, koordinat ternormalisasi full-frame
+        self.velocity = None           # Perubahan landmark per frame
+        self.last_handedness = None
+        self.frames_since_inference = 0
+        self.inferences_since_full = 0
+        self.stats = {'full': 0, 'roi': 0, 'predicted': 0, 'lost': 0}
+
+    def seed(self, landmarks, handedness):
+        """
+        Pakai hasil inference dari luar scheduler ini (misalnya worker lain di pool) sebagai
+        posisi tangan terakhir, sehingga ROI berikutnya dihitung dari posisi tersebut
+
+        Args:
+            landmarks: Batch (N, 21, 3) ternormalisasi atau None (tangan hilang: full-frame)
+            handedness: Handedness untuk landmarks
+        """
+        if landmarks is None:
+            self.last_landmarks = None
+            self.last_handedness = None
+        else:
+            self.last_landmarks = np.asarray(landmarks, dtype=np.float32)
+            self.last_handedness = handedness
+        self.velocity = None
+
+    def process(self, rgb_frame):
+        """
+        Dapatkan landmark tangan untuk frame ini (inference atau prediksi)
+
+        Args:
+            rgb_frame: Frame RGB (H, W, 3)
+
+        Returns:
+            tuple: (landmarks (N, 21, 3) float32 atau None, tuple handedness, source)
+                   source: 'full', 'roi', 'predicted' atau 'none'
+        """
+        tracking = self.last_landmarks is not None
+
+        if self.frames_since_inference < self.skip_frames:
+            self.frames_since_inference += 1
+            if not tracking:
+                # Tidak ada tangan: cari tangan hanya setiap (skip_frames + 1) frame
+                return None, None, 'none'
+            # Frame yang dilewati: prediksi dari gerakan terakhir
+            self.stats['predicted'] += 1
+            return self._predict(), self.last_handedness, 'predicted'
+
+        use_roi = (self.policy in (POLICY_ROI, POLICY_ROI_SKIP) and tracking and
+                   self.inferences_since_full < self.full_detect_interval)
+
+        landmarks = handedness = None
+        source = 'none'
+        if use_roi:
+            landmarks, handedness = self._detect_roi(rgb_frame)
+            if landmarks is not None:
+                source = 'roi'
+                self.inferences_since_full += 1
+            else:
+                self.stats['lost'] += 1
+
+        # Full-frame: policy full/skip, tracking hilang, atau jadwal deteksi ulang
+        if landmarks is None:
+            landmarks, handedness = self._detect_full(rgb_frame)
+            self.inferences_since_full = 0
+            if landmarks is not None:
+                source = 'full'
+
+        self._update_tracking(landmarks, handedness)
+        if source != 'none':
+            self.stats[source] += 1
+        return landmarks, handedness, source
+
+    def _detect_full(self, rgb_frame):
+        """Deteksi tangan di seluruh frame"""
+        return self.backend.detect(rgb_frame)
+
+    def _detect_roi(self, rgb_frame):
+        """Deteksi tangan hanya di crop sekitar posisi tangan terakhir"""
+        if self.roi_backend is None:
+            self.roi_backend = self.roi_backend_factory()
+
+        height, width = rgb_frame.shape[:2]
+        x0, y0, x1, y1 = self.compute_roi(self.last_landmarks, width, height)
+        crop = np.ascontiguousarray(rgb_frame[y0:y1, x0:x1])
+
+        landmarks, handedness = self.roi_backend.detect(crop)
+        if landmarks is None:
+            return None, None
+
+        # Kembalikan koordinat crop ke koordinat full-frame (semua tangan sekaligus)
+        crop_w, crop_h = x1 - x0, y1 - y0
+        landmarks[..., 0] = (x0 + landmarks[..., 0] * crop_w) / width
+        landmarks[..., 1] = (y0 + landmarks[..., 1] * crop_h) / height
+        landmarks[..., 2] *= crop_w / width
+        return landmarks, handedness
+
+    def compute_roi(self, landmarks, width, height):
+        """
+        Hitung ROI persegi (pixel) di sekitar landmark
+
+        Args:
+            landmarks: Array (21, 3) atau batch (N, 21, 3) ternormalisasi; ROI memuat
+                       semua tangan
+            width: Lebar frame
+            height: Tinggi frame
+
+        Returns:
+            tuple: (x0, y0, x1, y1)
+        """
+        xs = landmarks[..., 0] * width
+        ys = landmarks[..., 1] * height
+        cx, cy = (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+        side = max(xs.max() - xs.min(), ys.max() - ys.min())
+        side = max(self.min_roi_size, side * (1 + 2 * self.roi_margin))
+        side = min(side, width, height)
+
+        x0 = int(np.clip(cx - side / 2, 0, width - side))
+        y0 = int(np.clip(cy - side / 2, 0, height - side))
+        return x0, y0, x0 + int(side), y0 + int(side)
+
+    def _update_tracking(self, landmarks, handedness):
+        """Simpan landmark terbaru dan kecepatan per frame"""
+        if landmarks is None:
+            self.last_landmarks = None
+            self.velocity = None
+            self.last_handedness = None
+        else:
+            self.velocity = None
+            if self.last_landmarks is not None:
+                # Urutan tangan dari MediaPipe bisa berganti: kecepatan dihitung per pasangan
+                # tangan yang cocok, tangan baru dianggap diam
+                frames = self.frames_since_inference + 1
+                matches = match_hands(hand_centers(self.last_landmarks), hand_centers(landmarks),
+                                      MATCH_DISTANCE)
+                previous = self.last_landmarks[np.maximum(matches, 0)]
+                self.velocity = np.where((matches >= 0)[:, None, None],
+                                         (landmarks - previous) / frames, 0.0).astype(np.float32)
+            self.last_landmarks = landmarks
+            self.last_handedness = handedness
+        self.frames_since_inference = 0
+
+    def _predict(self):
+        """Prediksi landmark untuk frame yang dilewati"""
+        if self.fill == FILL_HOLD or self.velocity is None:
+            return self.last_landmarks.copy()
+
+        steps = self.frames_since_inference
+        if self.fill == FILL_DAMPED:
+            # Jumlah deret geometri: v * (d + d^2 + ... + d^steps)
+            d = self.damping
+            factor = d * (1 - d ** steps) / (1 - d) if d != 1 else steps
+        else:
+            factor = steps
+        return self.last_landmarks + self.velocity * factor
+
+    def get_stats(self):
+        """Dapatkan jumlah frame per sumber landmark"""
+        total = sum(self.stats.values()) - self.stats['lost']
+        stats = dict(self.stats)
+        stats['policy'] = self.policy
+        stats['inference_ratio'] = round((self.stats['full'] + self.stats['roi']) / total, 3) if total else 0.0
+        return stats
+
+    def close(self):
+        """Tutup backend untuk ROI (jika instance terpisah dari backend full-frame)"""
+        if self.roi_backend is not None:
+            if self.roi_backend is not self.backend:
+                self.roi_backend.close()
+            self.roi_backend = None
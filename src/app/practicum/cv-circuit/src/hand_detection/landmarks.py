@@ -0,0 +1,253 @@
+"""
+Hand Landmarks Module
+Representasi landmark tangan sebagai array NumPy (21, 3) float32 dan perhitungan
+gesture secara vectorized (dipakai bersama oleh detector, calculator dan UI)
+"""
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Index landmark MediaPipe
+WRIST = 0
+THUMB_TIP = 4
+INDEX_MCP = 5
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+MIDDLE_TIP = 12
+RING_MCP = 13
+RING_TIP = 16
+PINKY_MCP = 17
+PINKY_TIP = 20
+
+# Titik yang dipakai overlay workspace (ujung jari + pergelangan)
+FINGER_POSITION_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky', 'wrist')
+FINGER_POSITION_IDS = np.array([THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP, WRIST])
+
+# Ujung dan pangkal (MCP) jari telunjuk, tengah, manis, kelingking
+FINGER_TIP_IDS = np.array([INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+FINGER_MCP_IDS = np.array([INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP])
+
+# Koneksi skeleton tangan (sama dengan mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)
+])
+
+# Pola jari tegak [telunjuk, tengah, manis, kelingking] -> gesture
+GESTURE_PATTERNS = {
+    (True, True, False, False): 'PEACE_SIGN',
+    (True, False, False, False): 'INDEX_UP'
+}
+
+
+def as_landmark_array(hand_landmarks):
+    """
+    Pastikan landmark berbentuk array (21, 3) float32
+
+    Args:
+        hand_landmarks: Array (21, 3) atau NormalizedLandmarkList MediaPipe
+
+    Returns:
+        np.ndarray atau None
+    """
+    if hand_landmarks is None:
+        return None
+    if isinstance(hand_landmarks, np.ndarray):
+        return hand_landmarks
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+
+def as_hand_batch(landmarks):
+    """
+    Pastikan landmark berbentuk batch (N, 21, 3); array (21, 3) menjadi satu tangan
+
+    Returns:
+        np.ndarray: Array (N, 21, 3) float32 (N = 0 jika tidak ada tangan)
+    """
+    if landmarks is None:
+        return np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    return landmarks[None] if landmarks.ndim == 2 else landmarks
+
+
+def to_pixels(landmarks, frame_width, frame_height):
+    """
+    Konversi landmark ternormalisasi ke koordinat pixel
+
+    Args:
+        landmarks: Array (21, 3) atau batch (N, 21, 3)
+
+    Returns:
+        np.ndarray: Array (21, 2) atau (N, 21, 2) int32
+    """
+    return (landmarks[..., :2] * (frame_width, frame_height)).astype(np.int32)
+
+
+def hand_centers(landmarks):
+    """
+    Titik tengah setiap tangan (rata-rata landmark)
+
+    Args:
+        landmarks: Batch (N, 21, 3)
+
+    Returns:
+        np.ndarray: Array (N, 2)
+    """
+    return landmarks[..., :2].sum(axis=-2) / NUM_LANDMARKS
+
+
+def match_hands(previous, current, max_distance):
+    """
+    Pasangkan tangan frame ini dengan tangan sebelumnya berdasarkan jarak titik tengah
+
+    Args:
+        previous: Titik tengah tangan sebelumnya (M, 2)
+        current: Titik tengah tangan sekarang (N, 2)
+        max_distance: Jarak maksimum agar dianggap tangan yang sama
+
+    Returns:
+        np.ndarray: Array (N,) index tangan sebelumnya untuk setiap tangan sekarang (-1 = baru)
+    """
+    matches = np.full(len(current), -1, dtype=np.int64)
+    if len(previous) == 0 or len(current) == 0:
+        return matches
+    distances = np.linalg.norm(current[:, None, :] - previous[None, :, :], axis=2)
+    # Greedy dari pasangan terdekat (jumlah tangan kecil)
+    used = set()
+    for flat in np.argsort(distances, axis=None).tolist():
+        i, j = divmod(flat, len(previous))
+        if distances[i, j] > max_distance:
+            break
+        if matches[i] < 0 and j not in used:
+            matches[i] = j
+            used.add(j)
+    return matches
+
+
+def pinch_geometry(pixels):
+    """
+    Posisi jempol, telunjuk, jarak dan titik tengah pinch untuk semua tangan sekaligus
+
+    Args:
+        pixels: Batch (N, 21, 2) dari to_pixels
+
+    Returns:
+        tuple: (thumb (N, 2), index (N, 2), distance (N,), midpoint (N, 2) int)
+    """
+    thumb = pixels[:, THUMB_TIP]
+    index = pixels[:, INDEX_TIP]
+    delta = (index - thumb).astype(np.float64)
+    distance = np.hypot(delta[:, 0], delta[:, 1])
+    midpoint = (thumb + index) // 2
+    return thumb, index, distance, midpoint
+
+
+def finger_positions(pixels):
+    """
+    Posisi ujung jari dan pergelangan untuk overlay workspace
+
+    Args:
+        pixels: Array (21, 2) dari to_pixels
+
+    Returns:
+        dict: {'thumb', 'index', 'middle', 'ring', 'pinky', 'wrist'} -> (x, y)
+    """
+    points = pixels[FINGER_POSITION_IDS].tolist()
+    return {name: tuple(point) for name, point in zip(FINGER_POSITION_NAMES, points)}
+
+
+def fingers_up(landmarks):
+    """
+    Jari mana yang tegak (ujung di atas pangkal)
+
+    Returns:
+        np.ndarray: Array bool [telunjuk, tengah, manis, kelingking]
+    """
+    return landmarks[..., FINGER_TIP_IDS, 1] < landmarks[..., FINGER_MCP_IDS, 1]
+
+
+def classify_finger_gesture(landmarks):
+    """
+    Klasifikasi gesture jari untuk kontrol saklar
+
+    Args:
+        landmarks: Array (21, 3) atau None
+
+    Returns:
+        str: 'INDEX_UP', 'PEACE_SIGN' atau 'NONE'
+    """
+    if landmarks is None:
+        return 'NONE'
+    return GESTURE_PATTERNS.get(tuple(fingers_up(landmarks).tolist()), 'NONE')
+
+
+def draw_hand(frame, pixels, line_color=(224, 224, 224), point_color=(0, 0, 255), radius=3,
+              thickness=2):
+    """
+    Gambar skeleton tangan langsung dari array pixel (pengganti mp_drawing.draw_landmarks)
+
+    Args:
+        frame: Frame BGR
+        pixels: Array (21, 2) atau batch (N, 21, 2) int32 dari to_pixels
+        radius: Jari-jari titik landmark (pixel)
+        thickness: Tebal garis skeleton (pixel)
+    """
+    # Semua segmen semua tangan digambar dalam satu panggilan polylines
+    segments = pixels[..., HAND_CONNECTIONS, :].reshape(-1, 2, 2)
+    cv2.polylines(frame, list(segments), False, line_color, thickness)
+    for x, y in pixels.reshape(-1, 2).tolist():
+        cv2.circle(frame, (x, y), radius, point_color, -1)
+
+
+def draw_pinch_indicator(image, position, is_pinching, distance, scale=1.0):
+    """
+    Gambar indikator pinch (lingkaran, crosshair, status) di satu posisi
+
+    Args:
+        image: Gambar BGR
+        position: (x, y) di gambar
+        is_pinching: Status pinch
+        distance: Jarak jempol-telunjuk di frame kamera (pixel, untuk teks status)
+        scale: Rasio lebar gambar terhadap frame kamera (ukuran indikator ikut mengecil)
+    """
+    x, y = position
+    color = (0, 255, 0) if is_pinching else (0, 0, 255)  # Hijau jika pinch, merah jika tidak
+    radius = max(3, int((30 - distance / 2) * scale))
+    arm = max(3, int(10 * scale))
+    thickness = 2 if scale >= 0.5 else 1
+
+    cv2.circle(image, (x, y), radius, color, thickness)
+    cv2.line(image, (x - arm, y), (x + arm, y), color, thickness)
+    cv2.line(image, (x, y - arm), (x, y + arm), color, thickness)
+
+    status_text = "PINCH" if is_pinching else f"OPEN ({int(distance)}px)"
+    cv2.putText(image, status_text, (x + arm + 5, y - arm - 5), cv2.FONT_HERSHEY_SIMPLEX,
+                max(0.3, 0.5 * scale), color, 1)
+
+
+def annotate_hands(image, hands, scale=1.0):
+    """
+    Gambar skeleton dan indikator pinch semua tangan ke gambar output
+
+    Dipisah dari deteksi: pemanggil menggambar langsung di gambar yang ditampilkan, pada
+    resolusi tampilnya (landmark ternormalisasi diskalakan ke ukuran gambar), dan melewati
+    tahap ini jika tidak ada yang melihat. Frame input detector tidak diubah.
+
+    Args:
+        image: Gambar BGR yang akan ditampilkan (misalnya frame output atau inset kamera)
+        hands: List dict dari PinchDetector.detect_hands
+        scale: Rasio lebar gambar terhadap frame kamera
+    """
+    if not hands:
+        return
+    height, width = image.shape[:2]
+    pixels = to_pixels(np.stack([hand['hand_landmarks'] for hand in hands]), width, height)
+    draw_hand(image, pixels, radius=3 if scale >= 0.5 else 2, thickness=2 if scale >= 0.5 else 1)
+    _, _, _, positions = pinch_geometry(pixels)
+    for hand, position in zip(hands, positions.tolist()):
+        draw_pinch_indicator(image, tuple(position), hand['is_pinching'], hand['distance'], scale)
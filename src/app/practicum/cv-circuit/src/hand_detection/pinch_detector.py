@@ -3,109 +3,288 @@ Pinch Detection Module
 Mendeteksi gesture pinch (jempol + telunjuk) untuk interaksi drag & drop
 """
 
-import cv2
-import mediapipe as mp
+import os
+import time
+
 import numpy as np
 
+from ..utils.frame_buffers import FrameBuffers
+from ..utils.metrics import METRICS
+from .backends import create_backend, select_backend
+from .hand_tracker import HandTracker
+from .inference_scheduler import InferenceScheduler, POLICY_ROI, POLICY_ROI_SKIP
+from .landmarks import annotate_hands, classify_finger_gesture, finger_positions
+
 class PinchDetector:
-    """Detector untuk gesture pinch menggunakan MediaPipe"""
+    """Detector untuk gesture pinch di atas backend landmark tangan (MediaPipe, ONNX, sintetis)"""
     
-    def __init__(self):
-        """Initialize MediaPipe hands detection"""
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.8,
-            min_tracking_confidence=0.8
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
+    def __init__(self, inference_policy=None, skip_frames=None, inference_pool=None,
+                 smoothing=None, max_hands=None, backend=None):
+        """
+        Initialize hand detection
+        
+        Args:
+            inference_policy: 'full', 'roi', 'skip' atau 'roi_skip'
+                              (default: env CV_INFERENCE_POLICY atau 'roi_skip')
+            skip_frames: Frame yang dilewati setelah setiap inference
+                         (default: env CV_INFERENCE_SKIP atau 1)
+            inference_pool: InferencePool opsional; jika diberikan, inference berjalan di
+                            proses worker dan detect_pinch memakai hasil terbaru tanpa menunggu
+            smoothing: Haluskan landmark dengan One Euro filter
+                       (default: env CV_LANDMARK_SMOOTHING != '0')
+            max_hands: Jumlah tangan maksimum yang dilacak (default: env CV_MAX_HANDS atau 2)
+            backend: Spesifikasi backend landmark ('mediapipe[:0|1]', 'onnx[:PATH]',
+                     'scripted[:HANDS]', objek backend) atau 'auto' = pilih backend paling
+                     akurat yang latensinya masuk CV_BACKEND_BUDGET_MS, diukur pada frame
+                     pertama (default: env CV_HAND_BACKEND atau 'auto')
+        """
+        if inference_policy is None:
+            inference_policy = os.environ.get('CV_INFERENCE_POLICY', POLICY_ROI_SKIP)
+        if skip_frames is None:
+            skip_frames = int(os.environ.get('CV_INFERENCE_SKIP', 1))
+        if smoothing is None:
+            smoothing = os.environ.get('CV_LANDMARK_SMOOTHING', '1') != '0'
+        if max_hands is None:
+            max_hands = int(os.environ.get('CV_MAX_HANDS', 2))
+        if backend is None:
+            backend = os.environ.get('CV_HAND_BACKEND', 'auto')
+        
+        self.inference_policy = inference_policy
+        self.skip_frames = skip_frames
+        # Mode ROI: deteksi full-frame hanya sesekali, jadi pakai static mode
+        # (palm detection selalu jalan) agar tidak bergantung pada tracking yang sudah basi
+        self.backend_options = {
+            'max_hands': max_hands,
+            'static_image_mode': inference_policy in (POLICY_ROI, POLICY_ROI_SKIP)
+        }
+        self.inference_pool = inference_pool
+        if inference_pool is not None:
+            # Worker memakai policy dan jumlah tangan yang sama dengan inference lokal
+            inference_pool.configure(policy=inference_policy, skip_frames=skip_frames,
+                                     hands_options={'max_hands': max_hands})
+        self._pool_wait_frames = 0  # Frame berturut-turut tanpa hasil baru dari pool
+        self.backend = None
+        self.backend_name = None
+        self.backend_report = []  # Hasil pengukuran latensi mode 'auto'
+        self.scheduler = None
+        if backend != 'auto':
+            if inference_pool is not None:
+                inference_pool.configure(backend=backend)
+                self.backend_name = backend
+            else:
+                self._create_scheduler(create_backend(backend, **self.backend_options))
+        # Landmark tangan utama frame terakhir: array (21, 3) float32 yang dibagikan ke
+        # semua consumer; hands_data = data semua tangan (raw_landmarks = hasil MediaPipe
+        # sebelum filter, untuk rekaman)
         self.hand_landmarks = None
+        self.hands_data = []
+        self.raw_landmarks = None
+        self.landmark_source = 'none'
+        self.frame_size = None  # (lebar, tinggi) frame kamera terakhir
         
         # Threshold untuk deteksi pinch (dalam pixel)
         self.pinch_threshold = 40
         
-    def detect_pinch(self, frame):
+        # ID stabil per tangan, landmark dihaluskan dan status pinch memakai hysteresis +
+        # debounce per tangan. clock bisa diganti FrameClock agar replay tidak bergantung
+        # kecepatan putar
+        self.tracker = HandTracker(max_hands=max_hands, smoothing=smoothing)
+        self.clock = time.perf_counter
+        
+        # Buffer RGB dipakai ulang jika pemanggil tidak memberi FrameViews
+        self.frame_buffers = FrameBuffers()
+        
+    def detect_pinch(self, frame, views=None):
+        """
+        Deteksi gesture pinch tangan utama (tangan yang paling lama terlacak)
+        
+        Args:
+            frame: Frame dari kamera (BGR format)
+            views: FrameViews opsional untuk frame yang sama
+            
+        Returns:
+            dict: Data tangan utama dari detect_hands() atau None jika tidak ada tangan
+        """
+        hands = self.detect_hands(frame, views)
+        return hands[0] if hands else None
+    
+    def detect_hands(self, frame, views=None):
         """
-        Deteksi gesture pinch dari frame kamera
+        Deteksi semua tangan dan gesture pinch-nya dari frame kamera. Frame tidak diubah
+        (tidak ada gambar debug); visualisasi digambar terpisah dengan annotate()
         
         Args:
             frame: Frame dari kamera (BGR format)
+            views: FrameViews opsional untuk frame yang sama; konversi RGB diambil dari
+                   (dan disimpan ke) objek ini agar tidak dihitung ulang oleh tahap lain
             
         Returns:
-            dict: {
+            list: Satu dict per tangan, berurutan dari tangan yang paling lama terlacak: {
+                'hand_id': int (stabil selama tangan terlacak),
                 'is_pinching': bool,
                 'position': (x, y),
                 'distance': float,
                 'confidence': float,
-                'hand_landmarks': landmarks,
-                'finger_positions': dict
-            } atau None jika tidak ada tangan terdeteksi
+                'hand_landmarks': array (21, 3) float32,
+                'finger_positions': dict,
+                'handedness': str atau None
+            }
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
-        
-        self.hand_landmarks = None
+        if self.inference_pool is not None:
+            # Inference di proses worker: kirim frame, pakai hasil berurutan terbaru
+            # sehingga render/capture tidak menunggu MediaPipe
+            if self.backend_name is None:
+                if views is None:
+                    views = self.frame_buffers.views(frame)
+                self._select_backend(views.rgb())
+            with METRICS.stage('detect.submit'):
+                # Konversi BGR->RGB langsung ke slot shared memory (tanpa buffer RGB perantara)
+                self.inference_pool.submit(frame)
+                result = self.inference_pool.latest()
+            if result is None and not self.inference_pool.workers_alive():
+                self._fail_over_to_local()
         
-        if results.multi_hand_landmarks:
-            hand_landmarks = results.multi_hand_landmarks[0]
-            self.hand_landmarks = hand_landmarks
-            
-            # Gambar landmark di frame (untuk debugging)
-            self.mp_drawing.draw_landmarks(
-                frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
-            )
-            
-            # Ambil koordinat jempol dan telunjuk
-            thumb_tip = hand_landmarks.landmark[4]  # Ujung jempol
-            index_tip = hand_landmarks.landmark[8]  # Ujung telunjuk
-            
-            # Convert ke koordinat pixel
-            h, w, _ = frame.shape
-            thumb_x = int(thumb_tip.x * w)
-            thumb_y = int(thumb_tip.y * h)
-            index_x = int(index_tip.x * w)
-            index_y = int(index_tip.y * h)
-            
-            # Hitung jarak euclidean
-            distance = self._calculate_distance(
-                (thumb_x, thumb_y), (index_x, index_y)
-            )
-            
-            # Tentukan apakah sedang pinch
-            is_pinching = distance < self.pinch_threshold
-            
-            # Posisi pinch (titik tengah antara jempol dan telunjuk)
-            pinch_x = (thumb_x + index_x) // 2
-            pinch_y = (thumb_y + index_y) // 2
+        if self.inference_pool is not None:
+            if result is None:
+                self._pool_wait_frames += 1
+                if self._pool_wait_frames <= self.tracker.max_missed and self.hands_data:
+                    # Hasil worker belum datang: tangan frame sebelumnya tetap dipakai, tetapi
+                    # landmark lama tidak dimasukkan lagi ke tracker sebagai deteksi baru
+                    self.landmark_source = 'pending'
+                    self.raw_landmarks = None
+                    METRICS.inc('cv_landmark_frames_total', source=self.landmark_source)
+                    return self.hands_data
+            else:
+                self._pool_wait_frames = 0
+            # Tanpa hasil baru lebih dari max_missed frame: tangan dilupakan oleh tracker
+            landmarks = result.landmarks if result else None
+            handedness = result.handedness if result else None
+            self.landmark_source = result.source if result else 'none'
+        else:
+            # Convert BGR to RGB (sekali per frame, ke buffer yang dipakai ulang)
+            with METRICS.stage('detect.cvtcolor'):
+                if views is None:
+                    views = self.frame_buffers.views(frame)
+                rgb_frame = views.rgb()
+            if self.scheduler is None:
+                self._select_backend(rgb_frame)
             
+            # Scheduler memilih: inference full-frame, crop ROI, atau prediksi (frame dilewati)
+            with METRICS.stage('detect.hands_process'):
+                landmarks, handedness, self.landmark_source = self.scheduler.process(rgb_frame)
+        METRICS.inc('cv_landmark_frames_total', source=self.landmark_source)
+        self.raw_landmarks = landmarks
+        
+        # Filter, ID tangan dan pinch untuk semua tangan dalam satu operasi array
+        h, w, _ = frame.shape
+        self.frame_size = (w, h)
+        with METRICS.stage('detect.filter'):
+            tracked = self.tracker.update(landmarks, self.clock(), (w, h), self.pinch_threshold)
+        
+        hands = []
+        if len(tracked['ids']):
             # Confidence berdasarkan jarak (semakin dekat = confidence tinggi)
-            confidence = max(0, (self.pinch_threshold - distance) / self.pinch_threshold)
-            
-            # Gambar indikator pinch
-            self._draw_pinch_indicator(frame, (pinch_x, pinch_y), is_pinching, distance)
+            confidence = np.maximum(0, (self.pinch_threshold - tracked['distance']) /
+                                    self.pinch_threshold)
+            if handedness is None or isinstance(handedness, str):
+                handedness = (handedness,)
             
-            # Get all finger positions for workspace overlay
-            finger_positions = self._get_all_finger_positions(hand_landmarks, w, h)
-            
-            return {
-                'is_pinching': is_pinching,
-                'position': (pinch_x, pinch_y),
-                'distance': distance,
-                'confidence': confidence,
-                'thumb_pos': (thumb_x, thumb_y),
-                'index_pos': (index_x, index_y),
-                'hand_landmarks': hand_landmarks,
-                'finger_positions': finger_positions
-            }
+            for i, hand_id in enumerate(tracked['ids'].tolist()):
+                position = tuple(tracked['position'][i].tolist())
+                is_pinching = bool(tracked['is_pinching'][i])
+                distance = float(tracked['distance'][i])
+                source_index = int(tracked['order'][i])
+                
+                hands.append({
+                    'hand_id': hand_id,
+                    'is_pinching': is_pinching,
+                    'position': position,
+                    'distance': distance,
+                    'confidence': float(confidence[i]),
+                    'thumb_pos': tuple(tracked['thumb'][i].tolist()),
+                    'index_pos': tuple(tracked['index'][i].tolist()),
+                    'hand_landmarks': tracked['landmarks'][i],
+                    'finger_positions': finger_positions(tracked['pixels'][i]),
+                    'handedness': (handedness[source_index]
+                                   if source_index < len(handedness) else None),
+                    'landmark_source': self.landmark_source
+                })
         
-        return None
+        self.hands_data = hands
+        self.hand_landmarks = hands[0]['hand_landmarks'] if hands else None
+        return hands
+    
+    def warm_up(self, frame):
+        """
+        Siapkan backend sebelum frame pertama diproses: pilih backend (mode 'auto') dan
+        jalankan satu inference agar model selesai diinisialisasi. State tracking tidak
+        berubah. Dengan inference pool hanya backend yang dipilih; worker tetap dijalankan
+        saat frame pertama di-submit
+        
+        Args:
+            frame: Frame BGR contoh (sebaiknya frame kamera sungguhan)
+        """
+        rgb_frame = self.frame_buffers.views(frame).rgb()
+        if self.backend_name is None:
+            self._select_backend(rgb_frame)
+        if self.backend is not None:
+            self.backend.detect(rgb_frame)
+    
+    def _fail_over_to_local(self):
+        """Semua proses worker mati: lanjutkan inference di proses ini dengan backend yang sama"""
+        print(f"Inference worker berhenti, inference dipindah ke proses utama ({self.backend_name})")
+        METRICS.inc('cv_inference_failover_total')
+        pool = self.inference_pool
+        self.inference_pool = None
+        pool.close()
+        self._create_scheduler(create_backend(self.backend_name, **self.backend_options))
+    
+    def _create_scheduler(self, backend):
+        """Pasang backend dan scheduler inference untuk backend tersebut"""
+        self.backend = backend
+        self.backend_name = backend.name
+        self.scheduler = InferenceScheduler(
+            backend,
+            roi_backend_factory=backend.roi_backend if backend.supports_roi else None,
+            policy=self.inference_policy,
+            skip_frames=self.skip_frames
+        )
+    
+    def _select_backend(self, rgb_frame):
+        """Mode 'auto': pilih backend berdasarkan latensi yang diukur pada frame ini"""
+        backend, self.backend_report = select_backend(rgb_frame, **self.backend_options)
+        measured = ', '.join(f"{r['backend']}={r.get('latency_ms', 'n/a')}ms"
+                             for r in self.backend_report)
+        print(f"Backend landmark: {backend.name} ({measured})")
+        if self.inference_pool is not None:
+            # Worker membuat backend-nya sendiri
+            self.inference_pool.configure(backend=backend.name)
+            self.backend_name = backend.name
+            backend.close()
+        else:
+            self._create_scheduler(backend)
+    
+    def get_inference_stats(self):
+        """Dapatkan statistik scheduler inference (full/roi/predicted) atau pool worker"""
+        if self.inference_pool is not None:
+            stats = self.inference_pool.get_stats()
+        elif self.scheduler is not None:
+            stats = self.scheduler.get_stats()
+        else:
+            stats = {'policy': self.inference_policy}
+        stats['backend'] = self.backend_name
+        if self.backend_report:
+            stats['backend_selection'] = self.backend_report
+        return stats
     
     def get_hand_landmarks(self):
-        """Dapatkan landmark tangan terakhir yang terdeteksi"""
+        """Dapatkan landmark tangan utama terakhir yang terdeteksi (array (21, 3) atau None)"""
         return self.hand_landmarks
     
+    def get_hands(self):
+        """Dapatkan data semua tangan dari frame terakhir (list dict detect_hands)"""
+        return self.hands_data
+    
     def detect_finger_gestures(self):
         """
         Deteksi gesture jari untuk kontrol saklar
@@ -113,85 +292,24 @@ class PinchDetector:
         Returns:
             str: 'INDEX_UP', 'PEACE_SIGN', 'NONE'
         """
-        if not self.hand_landmarks:
-            return 'NONE'
-            
-        landmarks = self.hand_landmarks.landmark
-        
-        # Cek jari telunjuk tegak
-        index_tip = landmarks[8]
-        index_mcp = landmarks[5]
-        index_up = index_tip.y < index_mcp.y
-        
-        # Cek jari tengah tegak
-        middle_tip = landmarks[12]
-        middle_mcp = landmarks[9]
-        middle_up = middle_tip.y < middle_mcp.y
-        
-        # Cek jari lain tertutup
-        ring_tip = landmarks[16]
-        ring_mcp = landmarks[13]
-        ring_down = ring_tip.y > ring_mcp.y
-        
-        pinky_tip = landmarks[20]
-        pinky_mcp = landmarks[17]
-        pinky_down = pinky_tip.y > pinky_mcp.y
-        
-        if index_up and middle_up and ring_down and pinky_down:
-            return 'PEACE_SIGN'
-        elif index_up and not middle_up and ring_down and pinky_down:
-            return 'INDEX_UP'
-        else:
-            return 'NONE'
+        return classify_finger_gesture(self.hand_landmarks)
     
     def _calculate_distance(self, point1, point2):
         """Hitung jarak euclidean antara dua titik"""
         return np.sqrt((point2[0] - point1[0])**2 + (point2[1] - point1[1])**2)
     
-    def _draw_pinch_indicator(self, frame, position, is_pinching, distance):
-        """Gambar indikator visual untuk pinch detection"""
-        x, y = position
-        
-        # Warna berdasarkan status pinch
-        color = (0, 255, 0) if is_pinching else (0, 0, 255)  # Hijau jika pinch, merah jika tidak
-        
-        # Gambar lingkaran di posisi pinch
-        radius = max(5, int(30 - distance/2))
-        cv2.circle(frame, (x, y), radius, color, 2)
-        
-        # Gambar crosshair
-        cv2.line(frame, (x-10, y), (x+10, y), color, 2)
-        cv2.line(frame, (x, y-10), (x, y+10), color, 2)
-        
-        # Text status
-        status_text = "PINCH" if is_pinching else f"OPEN ({int(distance)}px)"
-        cv2.putText(frame, status_text, (x+15, y-15), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-    
-    def _get_all_finger_positions(self, hand_landmarks, frame_width, frame_height):
-        """Dapatkan posisi semua ujung jari untuk overlay di workspace"""
-        finger_positions = {}
-        
-        # MediaPipe landmark indices untuk ujung jari
-        finger_tips = {
-            'thumb': 4,      # Jempol
-            'index': 8,      # Telunjuk
-            'middle': 12,    # Tengah
-            'ring': 16,      # Manis
-            'pinky': 20      # Kelingking
-        }
-        
-        for finger_name, landmark_id in finger_tips.items():
-            landmark = hand_landmarks.landmark[landmark_id]
-            x = int(landmark.x * frame_width)
-            y = int(landmark.y * frame_height)
-            finger_positions[finger_name] = (x, y)
-        
-        # Tambahkan wrist position
-        wrist = hand_landmarks.landmark[0]
-        finger_positions['wrist'] = (int(wrist.x * frame_width), int(wrist.y * frame_height))
+    def annotate(self, image, hands=None):
+        """
+        Gambar landmark dan indikator pinch ke gambar output, pada resolusi gambar tersebut
         
-        return finger_positions
+        Args:
+            image: Gambar BGR yang ditampilkan (frame output atau hasil resize-nya)
+            hands: Data tangan dari detect_hands (default: hasil frame terakhir)
+        """
+        hands = self.hands_data if hands is None else hands
+        if not hands or self.frame_size is None:
+            return
+        annotate_hands(image, hands, image.shape[1] / self.frame_size[0])
     
     def convert_camera_to_workspace(self, camera_pos, camera_size, workspace_rect):
         """
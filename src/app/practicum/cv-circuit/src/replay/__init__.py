@@ -0,0 +1,10 @@
+"""
+Replay Module Initialization
+"""
+
+from .recorder import SessionRecorder
+from .replay_engine import (RecordedLandmarkFeed, RecordingFrameSource, ReplayEngine,
+                            ScriptedHandFeed, load_recording)
+
+__all__ = ['SessionRecorder', 'ReplayEngine', 'RecordingFrameSource', 'RecordedLandmarkFeed',
+           'ScriptedHandFeed', 'load_recording']
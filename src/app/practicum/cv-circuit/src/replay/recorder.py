@@ -0,0 +1,103 @@
+"""
+Session Recorder Module
+Merekam frame kamera beserta output detector agar sesi bisa diputar ulang tanpa kamera
+"""
+
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+FRAMES_FILE = 'frames.avi'
+DETECTIONS_FILE = 'detections.jsonl'
+META_FILE = 'meta.json'
+
+
+class SessionRecorder:
+    """Tulis frame (MJPG .avi) dan landmark per frame (JSON lines) ke satu direktori rekaman"""
+
+    def __init__(self, path, fps=30, mirrored=True, codec='MJPG'):
+        """
+        Initialize recorder (file dibuat saat frame pertama ditulis)
+
+        Args:
+            path: Direktori rekaman
+            fps: FPS yang dicatat di file video
+            mirrored: True jika frame yang ditulis sudah di-flip (mirror) oleh aplikasi
+            codec: FourCC codec video
+        """
+        self.path = path
+        self.fps = fps
+        self.mirrored = mirrored
+        self.codec = codec
+        self.frames_written = 0
+        self.frame_size = None
+        self._writer = None
+        self._detections = None
+        self._start_time = None
+
+    def _open(self, frame):
+        """Buat direktori dan file rekaman berdasarkan ukuran frame pertama"""
+        os.makedirs(self.path, exist_ok=True)
+        height, width = frame.shape[:2]
+        self.frame_size = (width, height)
+        self._writer = cv2.VideoWriter(os.path.join(self.path, FRAMES_FILE),
+                                       cv2.VideoWriter_fourcc(*self.codec),
+                                       self.fps, self.frame_size)
+        if not self._writer.isOpened():
+            raise RuntimeError(f"Tidak dapat membuat file video di {self.path}")
+        self._detections = open(os.path.join(self.path, DETECTIONS_FILE), 'w')
+        self._start_time = time.perf_counter()
+
+    def write(self, frame, landmarks=None, handedness=None, source=None, pinch_data=None):
+        """
+        Rekam satu frame dan output detector-nya
+
+        Args:
+            frame: Frame BGR mentah (sebelum anotasi detector)
+            landmarks: Array landmark (21, 3) atau None
+            handedness: Label tangan (opsional)
+            source: Sumber landmark dari scheduler ('full', 'roi', 'predicted', ...)
+            pinch_data: Hasil detect_pinch (opsional, disimpan ringkas)
+        """
+        if self._writer is None:
+            self._open(frame)
+
+        self._writer.write(frame)
+        record = {
+            'index': self.frames_written,
+            't': round(time.perf_counter() - self._start_time, 4),
+            'landmarks': None if landmarks is None else np.round(landmarks, 5).tolist(),
+            'handedness': handedness,
+            'source': source
+        }
+        if pinch_data:
+            record['pinch'] = {
+                'is_pinching': bool(pinch_data['is_pinching']),
+                'position': list(pinch_data['position']),
+                'distance': round(float(pinch_data['distance']), 2)
+            }
+        self._detections.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.frames_written += 1
+
+    def close(self):
+        """Tutup file rekaman dan tulis metadata"""
+        if self._writer is None:
+            return
+        self._writer.release()
+        self._detections.close()
+        self._writer = self._detections = None
+
+        meta = {
+            'frames': self.frames_written,
+            'fps': self.fps,
+            'width': self.frame_size[0],
+            'height': self.frame_size[1],
+            'mirrored': self.mirrored,
+            'duration': round(time.perf_counter() - self._start_time, 3)
+        }
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+        print(f"Rekaman disimpan: {self.path} ({self.frames_written} frame)")
@@ -0,0 +1,254 @@
+"""
+Replay Engine Module
+Memutar ulang rekaman (atau frame sintetis) melalui pipeline aplikasi secara headless:
+PinchDetector -> interaction handler -> CircuitCalculator -> render, dengan latensi per tahap
+"""
+
+import json
+import os
+import time
+from contextlib import ExitStack, redirect_stdout
+
+import cv2
+import numpy as np
+
+from ..hand_detection.filters import FrameClock
+from ..streaming.frame_capture import VideoFileFrameSource
+from ..utils.profiling import StageTimer
+from .recorder import DETECTIONS_FILE, FRAMES_FILE, META_FILE
+
+
+def load_recording(path):
+    """
+    Baca metadata dan output detector sebuah rekaman
+
+    Args:
+        path: Direktori rekaman dari SessionRecorder
+
+    Returns:
+        tuple: (meta dict, list record per frame)
+    """
+    meta_path = os.path.join(path, META_FILE)
+    if not os.path.exists(meta_path):
+        raise ValueError(f"Bukan direktori rekaman (meta.json tidak ada): {path}")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    with open(os.path.join(path, DETECTIONS_FILE)) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return meta, records
+
+
+class RecordingFrameSource(VideoFileFrameSource):
+    """Sumber frame dari rekaman, secepat mungkin dan tanpa looping"""
+
+    def __init__(self, path, fps=0):
+        """
+        Initialize recording source
+
+        Args:
+            path: Direktori rekaman
+            fps: Kecepatan baca (0 = secepat mungkin, None = FPS rekaman)
+        """
+        meta, _ = load_recording(path)
+        super().__init__(os.path.join(path, FRAMES_FILE), loop=False, fps=fps)
+        self.meta = meta
+
+    def read(self):
+        """Baca frame; frame yang direkam setelah mirror dikembalikan ke orientasi kamera"""
+        ret, frame = super().read()
+        if ret and self.meta.get('mirrored'):
+            frame = cv2.flip(frame, 1)
+        return ret, frame
+
+
+class RecordedLandmarkFeed:
+    """Pengganti InferenceScheduler yang mengembalikan landmark hasil rekaman (tanpa MediaPipe)"""
+
+    def __init__(self, records):
+        """
+        Initialize feed
+
+        Args:
+            records: List record dari load_recording
+        """
+        self.records = records
+        self.index = 0
+
+    def process(self, rgb_frame):
+        """Kembalikan landmark frame berikutnya, interface sama dengan InferenceScheduler.process"""
+        if self.index >= len(self.records):
+            return None, None, 'none'
+        record = self.records[self.index]
+        self.index += 1
+        if record['landmarks'] is None:
+            return None, None, 'none'
+        return (np.array(record['landmarks'], dtype=np.float32),
+                record.get('handedness'), 'recorded')
+
+    def get_stats(self):
+        """Posisi pemutaran"""
+        return {'policy': 'recorded', 'position': self.index, 'frames': len(self.records)}
+
+    def close(self):
+        """Tidak ada resource"""
+
+
+# Naskah gerakan default: ambil baterai, lampu dan resistor dari panel lalu taruh di workspace
+DEFAULT_SCRIPT = (
+    ((250, 200), False, 10), ((250, 60), False, 10), ((250, 60), True, 5),
+    ((250, 300), True, 20), ((250, 300), False, 5),
+    ((400, 60), False, 10), ((400, 60), True, 5), ((400, 320), True, 20), ((400, 320), False, 5),
+    ((550, 60), False, 10), ((550, 60), True, 5), ((550, 300), True, 20), ((550, 300), False, 5),
+)
+
+# Bentuk tangan terbuka relatif terhadap titik pinch (pixel); index 4 dan 8 diatur per frame
+_HAND_TEMPLATE = np.array([
+    (0, 120),                                  # wrist
+    (-30, 95), (-40, 65), (-35, 35), (0, 0),   # thumb
+    (5, 60), (5, 40), (5, 20), (0, 0),         # index
+    (22, 60), (22, 35), (22, 12), (22, -10),   # middle
+    (38, 62), (38, 40), (38, 20), (38, 0),     # ring
+    (52, 66), (52, 48), (52, 30), (52, 12),    # pinky
+], dtype=np.float32)
+
+
+class ScriptedHandFeed:
+    """Pengganti InferenceScheduler yang menghasilkan landmark sintetis dari naskah gerakan pinch/drag"""
+
+    def __init__(self, script=DEFAULT_SCRIPT, pinch_gap=10, open_gap=90, loop=True, hands=1):
+        """
+        Initialize feed
+
+        Args:
+            script: Tuple keyframe ((x, y) pixel, is_pinching, jumlah frame menuju keyframe)
+            pinch_gap: Jarak jempol-telunjuk saat pinch (pixel)
+            open_gap: Jarak jempol-telunjuk saat terbuka (pixel)
+            loop: Ulangi naskah dari awal
+            hands: Jumlah tangan; setiap tangan memakai naskah yang digeser rata sepanjang
+                   naskah, tangan ganjil dicerminkan horizontal
+        """
+        self.pinch_gap = pinch_gap
+        self.open_gap = open_gap
+        self.loop = loop
+        self.hands = max(1, hands)
+        self.index = 0
+        self.path = self._expand(script)
+
+    def _expand(self, script):
+        """Interpolasi linear keyframe menjadi posisi per frame"""
+        path = []
+        previous = np.array(script[0][0], dtype=np.float32)
+        for position, pinching, frames in script:
+            target = np.array(position, dtype=np.float32)
+            for step in range(1, frames + 1):
+                path.append((previous + (target - previous) * step / frames, pinching))
+            previous = target
+        return path
+
+    def process(self, rgb_frame):
+        """Kembalikan landmark frame berikutnya, interface sama dengan InferenceScheduler.process"""
+        if self.index >= len(self.path):
+            if not self.loop:
+                return None, None, 'none'
+            self.index = 0
+        frame_index = self.index
+        self.index += 1
+
+        height, width = rgb_frame.shape[:2]
+        hands = []
+        for hand in range(self.hands):
+            step = (frame_index + hand * len(self.path) // self.hands) % len(self.path)
+            position, pinching = self.path[step]
+            if hand % 2:
+                position = np.array((width - position[0], position[1]), dtype=np.float32)
+            gap = self.pinch_gap if pinching else self.open_gap
+            points = _HAND_TEMPLATE + position
+            points[4] = position + (-gap / 2, 0)
+            points[8] = position + (gap / 2, 0)
+
+            landmarks = np.zeros((21, 3), dtype=np.float32)
+            landmarks[:, 0] = points[:, 0] / width
+            landmarks[:, 1] = points[:, 1] / height
+            hands.append(landmarks)
+
+        if self.hands == 1:
+            return hands[0], 'Right', 'scripted'
+        return (np.stack(hands), tuple('Left' if hand % 2 else 'Right' for hand in range(self.hands)),
+                'scripted')
+
+    def get_stats(self):
+        """Posisi naskah"""
+        return {'policy': 'scripted', 'position': self.index, 'frames': len(self.path)}
+
+    def close(self):
+        """Tidak ada resource"""
+
+
+class ReplayEngine:
+    """Jalankan pipeline CircuitBuilderApp frame demi frame dan ukur latensi setiap tahap"""
+
+    def __init__(self, app, landmark_feed=None, warmup=10, quiet=True):
+        """
+        Initialize replay engine
+
+        Args:
+            app: CircuitBuilderApp (sumber frame = app.cap)
+            landmark_feed: Pengganti scheduler detector (RecordedLandmarkFeed/ScriptedHandFeed);
+                           None = jalankan MediaPipe sungguhan
+            warmup: Jumlah frame awal yang tidak dihitung
+            quiet: Buang output print() aplikasi selama replay
+        """
+        if landmark_feed is not None:
+            if app.pinch_detector.inference_pool is not None:
+                raise ValueError("Landmark feed tidak bisa dipakai bersama inference pool")
+            app.pinch_detector.scheduler = landmark_feed
+        # Filter landmark memakai jam per frame: hasil replay sama berapa pun kecepatan putar
+        app.pinch_detector.clock = FrameClock()
+        self.app = app
+        self.warmup = warmup
+        self.quiet = quiet
+        self.timer = StageTimer()
+
+    def run(self, max_frames=None):
+        """
+        Putar frame sampai sumber habis atau max_frames tercapai (di luar warm-up)
+
+        Args:
+            max_frames: Jumlah frame yang diukur (None = sampai sumber habis)
+
+        Returns:
+            dict: {'frames', 'duration_s', 'fps', 'stages'}
+        """
+        self.timer.reset()
+        frames = measured = 0
+        frame = None
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            if self.quiet:
+                stack.enter_context(redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            while max_frames is None or measured < max_frames:
+                with self.timer.stage('total'):
+                    with self.timer.stage('capture'):
+                        frame = self.app.read_frame()
+                    if frame is None:
+                        break
+                    self.app.process_frame(frame, self.timer)
+                frames += 1
+                if frames == self.warmup:
+                    self.timer.reset()
+                    start = time.perf_counter()
+                elif frames > self.warmup:
+                    measured += 1
+        duration = time.perf_counter() - start
+
+        if frame is None:
+            # Buang sampel dari pembacaan terakhir yang gagal (sumber habis)
+            for name in ('total', 'capture'):
+                if self.timer.samples.get(name):
+                    self.timer.samples[name].pop()
+        return {
+            'frames': measured,
+            'duration_s': round(duration, 3),
+            'fps': round(measured / duration, 2) if duration > 0 and measured else 0.0,
+            'stages': self.timer.summary()
+        }
@@ -0,0 +1,43 @@
+"""
+Streaming Module Initialization
+
+Export dimuat saat pertama diakses (PEP 562): server web bisa mengimpor modul ringan
+(session_manager, circuit_events) tanpa ikut memuat OpenCV/NumPy/pygame.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'CaptureThread': 'frame_capture',
+    'FrameRingBuffer': 'frame_capture',
+    'SyntheticFrameSource': 'frame_capture',
+    'VideoFileFrameSource': 'frame_capture',
+    'open_frame_source': 'frame_capture',
+    'FrameBroadcaster': 'broadcaster',
+    'FrameSubscriber': 'broadcaster',
+    'format_mjpeg_part': 'broadcaster',
+    'SessionManager': 'session_manager',
+    'StreamSession': 'session_manager',
+    'CircuitStateChannel': 'circuit_events',
+    'format_sse_event': 'circuit_events',
+    'iter_sse_events': 'circuit_events',
+    'AsyncCircuitEventHub': 'async_hub',
+    'AsyncFrameHub': 'async_hub',
+    'OverlayCompositor': 'overlay_compositor',
+    'WebCVStreamer': 'web_streamer',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,104 @@
+"""
+Adaptive Encoder Module
+Kontrol kualitas JPEG dan skala resolusi per client MJPEG agar target FPS tetap terjaga
+"""
+
+import time
+
+import cv2
+
+from ..utils.frame_buffers import FrameBuffers
+# AdaptiveQualityController tetap bisa diimpor dari modul ini (dipindah ke quality_control)
+from .quality_control import DEFAULT_QUALITY_LADDER, AdaptiveQualityController
+
+
+class AdaptiveEncoder:
+    """Encode frame sekali per tier yang sedang dipakai client, dengan batas waktu encode"""
+
+    def __init__(self, ladder=None, target_fps=25, encode_budget=0.35, cooldown=2.0):
+        """
+        Initialize encoder
+
+        Args:
+            ladder: Tangga kualitas (list dict quality/scale)
+            target_fps: FPS target stream
+            encode_budget: Porsi maksimum interval frame yang boleh dipakai encode
+            cooldown: Jeda minimum antar perubahan batas tier (detik)
+        """
+        self.ladder = ladder or DEFAULT_QUALITY_LADDER
+        self.target_fps = target_fps
+        self.encode_budget = encode_budget
+        self.cooldown = cooldown
+
+        # Tier minimum yang boleh dipakai (naik jika encode terlalu lama)
+        self.tier_floor = 0
+        self._last_floor_change = time.monotonic()
+        self.encode_ms = 0.0
+        self.frames_encoded = 0
+        self.bytes_encoded = {}
+        # Buffer resize per skala dipakai ulang (encode selesai sebelum frame berikutnya)
+        self.frame_buffers = FrameBuffers()
+
+    def encode(self, frame, tiers):
+        """
+        Encode frame untuk setiap tier yang diminta (masing-masing tepat sekali)
+
+        Args:
+            frame: Frame BGR
+            tiers: Iterable index tier yang sedang dipakai client
+
+        Returns:
+            dict: {tier: bytes JPEG}
+        """
+        start = time.perf_counter()
+        wanted = sorted({min(max(t, self.tier_floor), len(self.ladder) - 1) for t in tiers}
+                        or {self.tier_floor})
+        views = self.frame_buffers.views(frame)
+        results = {}
+        for tier in wanted:
+            settings = self.ladder[tier]
+            scale = settings['scale']
+            if scale == 1.0:
+                image = frame
+            else:
+                # Versi kecil dihitung sekali per skala, ke buffer yang dipakai ulang
+                height, width = frame.shape[:2]
+                image = views.resized((max(1, int(width * scale)), max(1, int(height * scale))))
+
+            ret, buffer = cv2.imencode('.jpg', image,
+                                       [int(cv2.IMWRITE_JPEG_QUALITY), settings['quality']])
+            if ret:
+                results[tier] = buffer.tobytes()
+                self.bytes_encoded[tier] = len(results[tier])
+
+        elapsed = time.perf_counter() - start
+        self.frames_encoded += 1
+        self.encode_ms = 0.9 * self.encode_ms + 0.1 * elapsed * 1000 if self.frames_encoded > 1 \
+            else elapsed * 1000
+        self._adjust_floor()
+        return results
+
+    def _adjust_floor(self):
+        """Naikkan/turunkan tier minimum sesuai waktu encode rata-rata"""
+        now = time.monotonic()
+        if now - self._last_floor_change < self.cooldown:
+            return
+
+        budget_ms = self.encode_budget * 1000 / self.target_fps
+        if self.encode_ms > budget_ms and self.tier_floor < len(self.ladder) - 1:
+            self.tier_floor += 1
+            self._last_floor_change = now
+        elif self.encode_ms < budget_ms * 0.5 and self.tier_floor > 0:
+            self.tier_floor -= 1
+            self._last_floor_change = now
+
+    def get_stats(self):
+        """Dapatkan statistik encoder"""
+        return {
+            'target_fps': self.target_fps,
+            'tier_floor': self.tier_floor,
+            'encode_ms': round(self.encode_ms, 2),
+            'frames_encoded': self.frames_encoded,
+            'ladder': [dict(settings, tier=i, last_bytes=self.bytes_encoded.get(i))
+                       for i, settings in enumerate(self.ladder)]
+        }
@@ -0,0 +1,174 @@
+"""
+Async Frame Hub Module
+Jembatan FrameBroadcaster (thread) ke banyak coroutine asyncio tanpa satu thread per penonton
+"""
+
+import asyncio
+
+from .quality_control import AdaptiveQualityController
+from .broadcaster import select_tier
+
+
+class AsyncFrameHub:
+    """Satu subscriber thread per sesi, dibagikan ke semua penonton asyncio"""
+
+    def __init__(self, broadcaster, executor, poll_timeout=0.5):
+        """
+        Initialize async hub
+
+        Args:
+            broadcaster: FrameBroadcaster milik sesi
+            executor: Executor untuk menunggu frame secara blocking
+            poll_timeout: Timeout satu kali tunggu frame di executor (detik)
+        """
+        self.broadcaster = broadcaster
+        self.executor = executor
+        self.poll_timeout = poll_timeout
+        self.sequence = 0
+        self.data = None
+        self.timestamp = None
+        self.viewers = 0
+        self.controllers = set()
+        self._condition = asyncio.Condition()
+        self._pump_task = None
+
+    def wanted_tiers(self):
+        """Tier kualitas yang dipakai semua penonton async"""
+        return {controller.tier for controller in list(self.controllers)} or {0}
+
+    async def _pump(self):
+        """Ambil frame dari broadcaster dan bangunkan semua penonton"""
+        loop = asyncio.get_running_loop()
+        subscriber = self.broadcaster.subscribe(raw=True)
+        subscriber.wanted_tiers = self.wanted_tiers
+        try:
+            while self.viewers > 0:
+                data = await loop.run_in_executor(self.executor, subscriber.next_frame,
+                                                  self.poll_timeout)
+                if data is None:
+                    continue
+                async with self._condition:
+                    self.sequence += 1
+                    self.data = data
+                    self.timestamp = subscriber.last_timestamp
+                    self._condition.notify_all()
+        finally:
+            subscriber.close()
+            self._pump_task = None
+
+    def _ensure_pump(self):
+        """Jalankan pump jika belum berjalan"""
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.get_running_loop().create_task(self._pump())
+
+    async def frames(self, is_running, timeout=1.0):
+        """
+        Async generator frame untuk satu penonton
+
+        Penonton lambat hanya menerima frame terbaru saat siap (frame terlewat dibuang)
+        dan kualitas JPEG-nya diturunkan oleh AdaptiveQualityController.
+
+        Args:
+            is_running: Callable yang mengembalikan False saat stream dihentikan
+            timeout: Waktu tunggu frame sebelum memeriksa is_running lagi (detik)
+
+        Yields:
+            tuple: (data, timestamp)
+        """
+        self.viewers += 1
+        controller = AdaptiveQualityController()
+        self.controllers.add(controller)
+        self._ensure_pump()
+        last_sequence = self.sequence - 1 if self.data is not None else 0
+        try:
+            while is_running():
+                async with self._condition:
+                    try:
+                        await asyncio.wait_for(
+                            self._condition.wait_for(lambda: self.sequence > last_sequence),
+                            timeout)
+                    except asyncio.TimeoutError:
+                        continue
+                    skipped = self.sequence - last_sequence - 1 if last_sequence else 0
+                    last_sequence = self.sequence
+                    data, timestamp = self.data, self.timestamp
+
+                if isinstance(data, dict):
+                    _, data = select_tier(data, max(controller.tier, self.broadcaster.tier_floor))
+                controller.record(skipped, len(data))
+                yield data, timestamp
+        finally:
+            self.viewers -= 1
+            self.controllers.discard(controller)
+
+
+class AsyncCircuitEventHub:
+    """Satu waiter thread per sesi untuk CircuitStateChannel, dibagikan ke semua client SSE asyncio"""
+
+    def __init__(self, channel, executor, poll_timeout=0.5):
+        """
+        Initialize circuit event hub
+
+        Args:
+            channel: CircuitStateChannel milik sesi
+            executor: Executor untuk menunggu perubahan secara blocking
+            poll_timeout: Timeout satu kali tunggu di executor (detik)
+        """
+        self.channel = channel
+        self.executor = executor
+        self.poll_timeout = poll_timeout
+        self.version = channel.version
+        self.listeners = 0
+        self._condition = asyncio.Condition()
+        self._pump_task = None
+
+    async def _pump(self):
+        """Tunggu perubahan versi di executor lalu bangunkan semua client"""
+        loop = asyncio.get_running_loop()
+        try:
+            while self.listeners > 0:
+                await loop.run_in_executor(self.executor, self.channel.wait_for_change,
+                                           self.version, self.poll_timeout)
+                if self.channel.version != self.version:
+                    async with self._condition:
+                        self.version = self.channel.version
+                        self._condition.notify_all()
+        finally:
+            self._pump_task = None
+
+    async def events(self, last_version=None, keepalive=15.0):
+        """
+        Async generator event untuk satu client SSE
+
+        Args:
+            last_version: Versi terakhir milik client (dari Last-Event-ID)
+            keepalive: Interval keep-alive (detik)
+
+        Yields:
+            tuple: (event_type, payload) atau (None, None) untuk keep-alive
+        """
+        self.listeners += 1
+        self.channel.add_listener()
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.get_running_loop().create_task(self._pump())
+        version = last_version
+        try:
+            while True:
+                events = self.channel.events_since(version)
+                for event_type, payload in events:
+                    version = payload['version']
+                    yield event_type, payload
+
+                timed_out = False
+                async with self._condition:
+                    try:
+                        await asyncio.wait_for(
+                            self._condition.wait_for(lambda: self.channel.version != version),
+                            keepalive)
+                    except asyncio.TimeoutError:
+                        timed_out = True
+                if timed_out:
+                    yield None, None
+        finally:
+            self.listeners -= 1
+            self.channel.remove_listener()
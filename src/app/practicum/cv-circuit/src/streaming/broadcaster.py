@@ -0,0 +1,256 @@
+"""
+Frame Broadcaster Module
+Encode sekali, kirim ke banyak client MJPEG dengan backpressure per client
+"""
+
+import threading
+import time
+
+from .quality_control import AdaptiveQualityController
+
+MJPEG_BOUNDARY = 'frame'
+MJPEG_MIMETYPE = 'multipart/x-mixed-replace; boundary=' + MJPEG_BOUNDARY
+
+
+def format_mjpeg_part(data, timestamp=None):
+    """
+    Bungkus satu JPEG sebagai bagian stream multipart MJPEG
+
+    Args:
+        data: bytes JPEG
+        timestamp: Waktu publish frame (time.time()), dikirim sebagai X-Timestamp
+
+    Returns:
+        bytes: Bagian multipart lengkap dengan boundary
+    """
+    headers = (f"--{MJPEG_BOUNDARY}\r\n"
+               f"Content-Type: image/jpeg\r\n"
+               f"Content-Length: {len(data)}\r\n")
+    if timestamp is not None:
+        headers += f"X-Timestamp: {timestamp:.6f}\r\n"
+    return headers.encode('ascii') + b'\r\n' + data + b'\r\n'
+
+
+def select_tier(frames, tier):
+    """
+    Pilih data untuk tier tertentu dari frame multi-tier
+
+    Args:
+        frames: dict {tier: bytes}
+        tier: Tier yang diinginkan
+
+    Returns:
+        tuple: (tier yang dipakai, bytes) - tier terdekat jika yang diminta belum di-encode
+    """
+    if tier not in frames:
+        tier = min(frames, key=lambda t: abs(t - tier))
+    return tier, frames[tier]
+
+
+class FrameSubscriber:
+    """Satu client yang membaca frame dari FrameBroadcaster"""
+
+    def __init__(self, broadcaster, subscriber_id, raw=False):
+        """
+        Initialize subscriber
+
+        Args:
+            broadcaster: FrameBroadcaster sumber frame
+            subscriber_id: ID unik subscriber
+            raw: Kembalikan frame multi-tier apa adanya (untuk hub yang memilih tier sendiri)
+        """
+        self.broadcaster = broadcaster
+        self.subscriber_id = subscriber_id
+        self.raw = raw
+        self.last_sequence = 0
+        self.frames_received = 0
+        self.frames_skipped = 0
+        self.last_timestamp = None
+        self.connected_at = time.time()
+
+        # Kualitas adaptif per client (tier pada tangga kualitas encoder)
+        self.controller = AdaptiveQualityController()
+        self.last_tier = None
+
+    def next_frame(self, timeout=1.0):
+        """
+        Tunggu frame yang lebih baru dari frame terakhir yang diterima
+
+        Client lambat otomatis melewati frame yang terlewat (tidak menumpuk).
+
+        Args:
+            timeout: Waktu tunggu maksimum (detik)
+
+        Returns:
+            bytes: Data frame ter-encode atau None jika timeout/ditutup
+        """
+        sequence, data, timestamp = self.broadcaster.wait_for_frame(self.last_sequence, timeout)
+        if data is None:
+            return None
+
+        skipped = max(0, sequence - self.last_sequence - 1) if self.last_sequence else 0
+        self.frames_skipped += skipped
+        self.last_sequence = sequence
+        self.last_timestamp = timestamp
+        self.frames_received += 1
+
+        if self.raw:
+            return data
+
+        # Frame multi-tier: pilih tier milik client ini (atau yang terdekat jika belum ada)
+        if isinstance(data, dict):
+            self.last_tier, data = select_tier(data, max(self.controller.tier,
+                                                         self.broadcaster.tier_floor))
+
+        self.controller.record(skipped, len(data))
+        return data
+
+    def wanted_tiers(self):
+        """Tier kualitas yang perlu di-encode producer untuk client ini"""
+        return {self.controller.tier}
+
+    def close(self):
+        """Lepas subscriber dari broadcaster"""
+        self.broadcaster.unsubscribe(self)
+
+    def get_stats(self):
+        """Dapatkan statistik subscriber"""
+        return {
+            'id': self.subscriber_id,
+            'frames_received': self.frames_received,
+            'frames_skipped': self.frames_skipped,
+            'connected_seconds': round(time.time() - self.connected_at, 1),
+            'quality': dict(self.controller.get_stats(), served_tier=self.last_tier)
+        }
+
+
+class FrameBroadcaster:
+    """Menyimpan frame ter-encode terbaru dan membagikannya ke semua subscriber"""
+
+    def __init__(self):
+        """Initialize broadcaster"""
+        self._condition = threading.Condition()
+        self._sequence = 0
+        self._data = None
+        self._timestamp = None
+        self._subscribers = {}
+        self._next_id = 0
+        self._closed = False
+        self.frames_published = 0
+
+        # Tier minimum dari encoder (dinaikkan jika encode terlalu lama)
+        self.tier_floor = 0
+
+    def publish(self, data):
+        """
+        Publikasikan frame ter-encode ke semua subscriber
+
+        Args:
+            data: bytes hasil encode (JPEG) atau dict {tier: bytes} dari AdaptiveEncoder
+
+        Returns:
+            int: Nomor urut frame
+        """
+        with self._condition:
+            self._sequence += 1
+            self._data = data
+            self._timestamp = time.time()
+            self.frames_published += 1
+            self._condition.notify_all()
+            return self._sequence
+
+    def wait_for_frame(self, after_sequence, timeout=1.0):
+        """
+        Tunggu frame dengan nomor urut > after_sequence
+
+        Args:
+            after_sequence: Nomor urut frame terakhir yang sudah diterima
+            timeout: Waktu tunggu maksimum (detik)
+
+        Returns:
+            tuple: (sequence, data, publish_timestamp) atau (None, None, None)
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._closed and self._sequence <= after_sequence:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None, None, None
+                self._condition.wait(remaining)
+
+            if self._closed or self._data is None:
+                return None, None, None
+            return self._sequence, self._data, self._timestamp
+
+    def subscribe(self, raw=False):
+        """
+        Daftarkan client baru
+
+        Args:
+            raw: Terima frame multi-tier apa adanya (lihat FrameSubscriber)
+
+        Returns:
+            FrameSubscriber: Handle untuk membaca frame
+        """
+        with self._condition:
+            self._next_id += 1
+            subscriber = FrameSubscriber(self, self._next_id, raw)
+            self._subscribers[subscriber.subscriber_id] = subscriber
+            # Client baru mulai dari frame terbaru, bukan dari awal
+            subscriber.last_sequence = max(0, self._sequence - 1) if self._data else 0
+            self._condition.notify_all()
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Lepas client dari broadcaster"""
+        with self._condition:
+            self._subscribers.pop(subscriber.subscriber_id, None)
+
+    def active_tiers(self):
+        """Gabungan tier kualitas yang sedang dipakai semua subscriber"""
+        with self._condition:
+            subscribers = list(self._subscribers.values())
+        tiers = set()
+        for subscriber in subscribers:
+            tiers |= subscriber.wanted_tiers()
+        return tiers
+
+    def subscriber_count(self):
+        """Jumlah client yang sedang terhubung"""
+        with self._condition:
+            return len(self._subscribers)
+
+    def wait_for_subscribers(self, timeout=1.0):
+        """
+        Tunggu sampai ada minimal satu subscriber (producer idle tanpa penonton)
+
+        Args:
+            timeout: Waktu tunggu maksimum (detik)
+
+        Returns:
+            bool: True jika ada subscriber
+        """
+        with self._condition:
+            if not self._subscribers and not self._closed:
+                self._condition.wait(timeout)
+            return bool(self._subscribers)
+
+    def reopen(self):
+        """Aktifkan kembali broadcaster setelah close()"""
+        with self._condition:
+            self._closed = False
+
+    def close(self):
+        """Tutup broadcaster dan bangunkan semua subscriber"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def get_stats(self):
+        """Dapatkan statistik broadcaster"""
+        with self._condition:
+            subscribers = [s.get_stats() for s in self._subscribers.values()]
+        return {
+            'frames_published': self.frames_published,
+            'subscribers': subscribers
+        }
@@ -0,0 +1,188 @@
+"""
+Circuit Events Module
+Channel push (Server-Sent Events) untuk perubahan circuit_data dalam bentuk delta berversi
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+
+def _normalize(value):
+    """Samakan representasi nilai (tuple -> list) agar perbandingan konsisten dengan JSON"""
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class CircuitStateChannel:
+    """Menyimpan state rangkaian terakhir dan riwayat delta dengan nomor versi naik monoton"""
+
+    def __init__(self, history_size=256):
+        """
+        Initialize channel
+
+        Args:
+            history_size: Jumlah delta terakhir yang disimpan untuk resync client
+        """
+        self.version = 0
+        self._components = {}
+        self._calculations = {}
+        self._history = deque(maxlen=history_size)
+        self._condition = threading.Condition()
+        self.listeners = 0  # Client SSE yang sedang terhubung (aktivitas sesi)
+
+    def add_listener(self):
+        """Catat satu client SSE terhubung"""
+        with self._condition:
+            self.listeners += 1
+
+    def remove_listener(self):
+        """Catat satu client SSE terputus"""
+        with self._condition:
+            self.listeners -= 1
+
+    def update(self, components, calculations):
+        """
+        Bandingkan state baru dengan state terakhir, simpan delta jika berubah
+
+        Args:
+            components: List komponen (masing-masing punya 'id')
+            calculations: Dict hasil perhitungan
+
+        Returns:
+            dict: Delta yang dipublikasikan, atau None jika tidak ada perubahan
+        """
+        new_components = {str(c['id']): _normalize(c) for c in components}
+        new_calculations = _normalize(calculations)
+
+        with self._condition:
+            changed = {cid: comp for cid, comp in new_components.items()
+                       if self._components.get(cid) != comp}
+            removed = [cid for cid in self._components if cid not in new_components]
+            calc_changes = {key: value for key, value in new_calculations.items()
+                            if self._calculations.get(key) != value}
+
+            if not changed and not removed and not calc_changes:
+                return None
+
+            self.version += 1
+            delta = {'version': self.version}
+            if changed:
+                delta['components'] = list(changed.values())
+            if removed:
+                delta['removed'] = removed
+            if calc_changes:
+                delta['calculations'] = calc_changes
+
+            self._components = new_components
+            self._calculations = new_calculations
+            self._history.append(delta)
+            self._condition.notify_all()
+            return delta
+
+    def snapshot(self):
+        """
+        Dapatkan state lengkap saat ini
+
+        Returns:
+            dict: {'version', 'components', 'calculations'}
+        """
+        with self._condition:
+            return {
+                'version': self.version,
+                'components': list(self._components.values()),
+                'calculations': dict(self._calculations)
+            }
+
+    def events_since(self, version):
+        """
+        Dapatkan event yang dibutuhkan client yang terakhir melihat `version`
+
+        Args:
+            version: Versi terakhir yang dimiliki client (None = client baru)
+
+        Returns:
+            list: [(event_type, payload)] berisi 'delta' atau satu 'snapshot'
+                  jika riwayat sudah tidak mencakup versi tersebut
+        """
+        with self._condition:
+            if version is not None and version == self.version:
+                return []
+            oldest = self._history[0]['version'] if self._history else self.version + 1
+            if version is None or version > self.version or version + 1 < oldest:
+                return [('snapshot', self.snapshot())]
+            return [('delta', delta) for delta in self._history if delta['version'] > version]
+
+    def wait_for_change(self, version, timeout=15.0):
+        """
+        Tunggu sampai versi lebih baru dari `version` tersedia
+
+        Returns:
+            list: Event seperti events_since (kosong jika timeout)
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self.version == version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._condition.wait(remaining)
+        return self.events_since(version)
+
+
+def format_sse_event(event_type, payload):
+    """
+    Format satu event Server-Sent Events
+
+    Args:
+        event_type: 'snapshot' atau 'delta'
+        payload: Dict dengan field 'version'
+
+    Returns:
+        str: Event SSE (id = versi agar browser mengirim Last-Event-ID saat reconnect)
+    """
+    data = json.dumps(payload, separators=(',', ':'))
+    return f"id: {payload['version']}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+def parse_last_event_id(value):
+    """Parse header Last-Event-ID / query ?since= menjadi versi (None jika tidak valid)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_sse_events(channel, last_version=None, keepalive=15.0, is_running=lambda: True):
+    """
+    Generator SSE untuk satu client (dipakai Flask)
+
+    Args:
+        channel: CircuitStateChannel
+        last_version: Versi terakhir milik client (dari Last-Event-ID)
+        keepalive: Interval komentar keep-alive (detik)
+        is_running: Callable, generator berhenti jika mengembalikan False
+
+    Yields:
+        str: Event SSE
+    """
+    version = last_version
+    events = channel.events_since(version)
+    channel.add_listener()
+    try:
+        yield 'retry: 2000\n\n'
+        while True:
+            for event_type, payload in events:
+                version = payload['version']
+                yield format_sse_event(event_type, payload)
+            if not is_running():
+                return
+            events = channel.wait_for_change(version, keepalive)
+            if not events:
+                yield ': keepalive\n\n'
+    finally:
+        channel.remove_listener()
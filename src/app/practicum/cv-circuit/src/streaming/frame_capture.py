@@ -0,0 +1,437 @@
+"""
+Frame Capture Module
+Thread capture kamera terpisah dengan ring buffer frame terbaru
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+# Ukuran frame sintetis: default dan batas atas (buffer background dialokasikan sekali)
+SYNTHETIC_DEFAULT_SIZE = (640, 480)
+SYNTHETIC_MAX_SIZE = (1920, 1080)
+SYNTHETIC_MIN_SIDE = 16
+
+
+def parse_synthetic_size(spec):
+    """
+    Parse spesifikasi sumber sintetis menjadi ukuran frame
+
+    Ukuran di luar batas di-clamp ke SYNTHETIC_MIN_SIDE..SYNTHETIC_MAX_SIZE.
+
+    Args:
+        spec: 'synthetic' atau 'synthetic:WIDTHxHEIGHT'
+
+    Returns:
+        tuple: (width, height)
+
+    Raises:
+        ValueError: Format spesifikasi tidak valid
+    """
+    spec = str(spec).strip()
+    if spec == 'synthetic':
+        return SYNTHETIC_DEFAULT_SIZE
+    prefix, _, size = spec.partition(':')
+    parts = size.lower().split('x')
+    if prefix != 'synthetic' or len(parts) != 2 or not all(p.isdigit() for p in parts):
+        raise ValueError(f"Sumber sintetis tidak valid: {spec!r} (pakai synthetic:WIDTHxHEIGHT)")
+    width = min(max(int(parts[0]), SYNTHETIC_MIN_SIDE), SYNTHETIC_MAX_SIZE[0])
+    height = min(max(int(parts[1]), SYNTHETIC_MIN_SIDE), SYNTHETIC_MAX_SIZE[1])
+    return width, height
+
+
+def camera_index(spec):
+    """
+    Index kamera dari spesifikasi sumber frame
+
+    Args:
+        spec: Spesifikasi sumber frame (lihat open_frame_source)
+
+    Returns:
+        int atau None jika sumber bukan kamera lokal
+    """
+    if isinstance(spec, int):
+        return spec
+    if isinstance(spec, str) and spec.strip().isdigit():
+        return int(spec.strip())
+    return None
+
+
+class SyntheticFrameSource:
+    """Sumber frame sintetis untuk menjalankan pipeline tanpa kamera (headless/CI)"""
+
+    def __init__(self, width=640, height=480, fps=30):
+        """
+        Initialize synthetic frame source
+
+        Args:
+            width: Lebar frame
+            height: Tinggi frame
+            fps: Kecepatan frame yang disimulasikan (0 = secepat mungkin)
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_index = 0
+        self._opened = True
+        self._next_time = time.perf_counter()
+
+        # Background gradient dibuat sekali, lalu di-copy setiap frame
+        gradient = np.linspace(40, 120, width, dtype=np.uint8)
+        self._background = np.empty((height, width, 3), dtype=np.uint8)
+        self._background[:] = gradient[np.newaxis, :, np.newaxis]
+
+    def isOpened(self):
+        """Kompatibel dengan cv2.VideoCapture"""
+        return self._opened
+
+    def read(self):
+        """
+        Baca satu frame sintetis
+
+        Returns:
+            tuple: (ret, frame) seperti cv2.VideoCapture.read()
+        """
+        if not self._opened:
+            return False, None
+
+        # Pacing agar meniru kamera sungguhan
+        if self.fps:
+            now = time.perf_counter()
+            if self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time = max(self._next_time, now) + 1.0 / self.fps
+
+        frame = self._background.copy()
+
+        # Lingkaran bergerak sebagai objek "tangan" sederhana
+        t = self.frame_index / 30.0
+        cx = int(self.width / 2 + np.cos(t) * self.width / 4)
+        cy = int(self.height / 2 + np.sin(t) * self.height / 4)
+        cv2.circle(frame, (cx, cy), 30, (0, 200, 255), -1)
+        cv2.putText(frame, f"SYNTHETIC {self.frame_index}", (10, self.height - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+        self.frame_index += 1
+        return True, frame
+
+    def release(self):
+        """Tutup sumber frame"""
+        self._opened = False
+
+
+class VideoFileFrameSource:
+    """Sumber frame dari file video, dengan opsi looping dan pacing"""
+
+    def __init__(self, path, loop=True, fps=None):
+        """
+        Initialize video file source
+
+        Args:
+            path: Path file video
+            loop: Ulangi dari awal saat file habis
+            fps: Paksa kecepatan baca (None = ikuti FPS file, 0 = secepat mungkin)
+        """
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+
+        if fps is None:
+            fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.fps = fps
+        self._next_time = time.perf_counter()
+
+    def isOpened(self):
+        """Kompatibel dengan cv2.VideoCapture"""
+        return self.cap.isOpened()
+
+    def read(self):
+        """
+        Baca frame berikutnya dari file
+
+        Returns:
+            tuple: (ret, frame)
+        """
+        if self.fps:
+            now = time.perf_counter()
+            if self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time = max(self._next_time, now) + 1.0 / self.fps
+
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        """Tutup file video"""
+        self.cap.release()
+
+
+def open_frame_source(spec=0):
+    """
+    Buka sumber frame berdasarkan spesifikasi
+
+    Args:
+        spec: Index kamera (int atau string angka), 'synthetic',
+              'synthetic:WIDTHxHEIGHT', path file video, atau objek sumber frame
+              yang sudah dibuat (dikembalikan apa adanya)
+
+    Returns:
+        Objek dengan interface read()/isOpened()/release()
+
+    Raises:
+        ValueError: Spesifikasi sumber sintetis tidak valid
+    """
+    if hasattr(spec, 'read'):
+        return spec
+
+    if isinstance(spec, int):
+        return cv2.VideoCapture(spec)
+
+    spec = str(spec).strip()
+    if spec.isdigit():
+        return cv2.VideoCapture(int(spec))
+
+    if spec.startswith('synthetic'):
+        return SyntheticFrameSource(*parse_synthetic_size(spec))
+
+    if os.path.exists(spec):
+        return VideoFileFrameSource(spec)
+
+    # Fallback: biarkan OpenCV mencoba (misalnya URL stream RTSP/HTTP)
+    return cv2.VideoCapture(spec)
+
+
+class FrameRingBuffer:
+    """Ring buffer kecil thread-safe yang selalu menyerahkan frame terbaru"""
+
+    def __init__(self, capacity=2):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Jumlah maksimum frame yang ditahan
+        """
+        self.capacity = max(1, capacity)
+        self._frames = deque()
+        self._condition = threading.Condition()
+        self.sequence = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        """
+        Simpan frame baru, buang frame tertua jika buffer penuh
+
+        Args:
+            frame: Frame kamera
+
+        Returns:
+            int: Nomor urut frame
+        """
+        with self._condition:
+            self.sequence += 1
+            if len(self._frames) >= self.capacity:
+                self._frames.popleft()
+                self.dropped += 1
+            self._frames.append((self.sequence, frame))
+            self._condition.notify_all()
+            return self.sequence
+
+    def get_latest(self, timeout=None):
+        """
+        Ambil frame terbaru dan buang frame lama yang belum diproses
+
+        Args:
+            timeout: Waktu tunggu maksimum (detik) jika buffer kosong
+
+        Returns:
+            tuple: (sequence, frame) atau (None, None) jika timeout
+        """
+        with self._condition:
+            if not self._frames:
+                self._condition.wait(timeout)
+            if not self._frames:
+                return None, None
+
+            sequence, frame = self._frames.pop()
+            # Frame lama dianggap basi
+            self.dropped += len(self._frames)
+            self._frames.clear()
+            return sequence, frame
+
+    def depth(self):
+        """Jumlah frame yang sedang menunggu di buffer"""
+        with self._condition:
+            return len(self._frames)
+
+    def clear(self):
+        """Kosongkan buffer"""
+        with self._condition:
+            self._frames.clear()
+
+
+class CaptureThread:
+    """Thread khusus yang membaca kamera terus-menerus ke FrameRingBuffer"""
+
+    def __init__(self, source, buffer_size=2, flip=False, max_failures=20):
+        """
+        Initialize capture thread
+
+        Args:
+            source: Objek sumber frame (cv2.VideoCapture atau hasil open_frame_source)
+            buffer_size: Kapasitas ring buffer
+            flip: Flip horizontal (efek cermin) langsung di thread capture
+            max_failures: Gagal baca berturut-turut sebelum sumber dianggap hilang (file
+                          selesai, kamera dicabut) dan thread berhenti; jeda antar percobaan
+                          naik eksponensial dari 10 ms sampai 0.5 detik
+        """
+        self.source = source
+        self.buffer = FrameRingBuffer(buffer_size)
+        self.flip = flip
+        self.max_failures = max_failures
+        self.frames_captured = 0
+        self.read_failures = 0
+        self.consecutive_failures = 0
+        self.source_lost = False
+        self._stop_event = threading.Event()
+        self._thread = None
+        # Sumber dilepas oleh thread sendiri jika stop() tidak sempat menunggunya keluar
+        self._exit_lock = threading.Lock()
+        self._exited = True
+        self._release_on_exit = False
+        self._source_released = False
+
+    def start(self, timeout=2.0):
+        """
+        Mulai thread capture
+
+        Thread sebelumnya yang sudah diminta berhenti tetapi masih di dalam read() ditunggu
+        sampai keluar, sehingga tidak pernah ada dua pembaca pada sumber yang sama.
+
+        Args:
+            timeout: Waktu tunggu thread sebelumnya keluar (detik)
+
+        Returns:
+            CaptureThread: self
+
+        Raises:
+            RuntimeError: Thread sebelumnya belum keluar atau sumber frame sudah dilepas
+        """
+        if self.is_running():
+            if not self._stop_event.is_set():
+                return self
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                raise RuntimeError("Thread capture sebelumnya masih membaca sumber frame")
+        if self._source_released:
+            raise RuntimeError("Sumber frame sudah dilepas, buat CaptureThread dengan sumber baru")
+        self._stop_event.clear()
+        self.consecutive_failures = 0
+        self.source_lost = False
+        self._exited = False
+        self._release_on_exit = False
+        self._thread = threading.Thread(target=self._capture_loop,
+                                        name='CaptureThread', daemon=True)
+        self._thread.start()
+        return self
+
+    def _capture_loop(self):
+        """Loop utama: baca frame secepat sumber mengizinkan"""
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self.source.read()
+                if not ret or frame is None:
+                    self.read_failures += 1
+                    self.consecutive_failures += 1
+                    if self.consecutive_failures >= self.max_failures:
+                        self.source_lost = True
+                        print(f"Capture: sumber frame hilang setelah {self.consecutive_failures} "
+                              "kali gagal baca, thread capture berhenti")
+                        break
+                    self._stop_event.wait(min(0.5, 0.01 * 2 ** (self.consecutive_failures - 1)))
+                    continue
+
+                self.consecutive_failures = 0
+                if self.flip:
+                    frame = cv2.flip(frame, 1)
+
+                self.frames_captured += 1
+                self.buffer.put(frame)
+        finally:
+            with self._exit_lock:
+                self._exited = True
+                release = self._release_on_exit
+            if release:
+                self._source_released = True
+                self.source.release()
+
+    def read_latest(self, timeout=1.0):
+        """
+        Ambil frame terbaru untuk tahap pemrosesan
+
+        Args:
+            timeout: Waktu tunggu maksimum (detik)
+
+        Returns:
+            tuple: (sequence, frame) atau (None, None)
+        """
+        return self.buffer.get_latest(timeout)
+
+    def is_running(self):
+        """Cek apakah thread capture masih berjalan"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, release=True, timeout=2.0):
+        """
+        Hentikan thread capture
+
+        Sumber frame hanya dilepas setelah thread keluar. Jika thread masih tertahan di
+        read() setelah timeout, referensi thread tetap disimpan (is_running() True, start()
+        menunggunya) dan thread itu sendiri yang melepas sumber saat keluar.
+
+        Args:
+            release: Tutup juga sumber frame
+            timeout: Waktu tunggu thread keluar (detik)
+
+        Returns:
+            bool: True jika thread sudah berhenti (sumber sudah dilepas bila release=True)
+        """
+        self._stop_event.set()
+        stopped = True
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            with self._exit_lock:
+                if not self._exited:
+                    self._release_on_exit = release
+                    stopped = False
+            if stopped:
+                self._thread = None
+        self.buffer.clear()
+        if not stopped:
+            print("Capture: thread masih membaca sumber frame, sumber dilepas saat thread keluar")
+        elif release and self.source is not None and not self._source_released:
+            self._source_released = True
+            self.source.release()
+        return stopped
+
+    @property
+    def frames_dropped(self):
+        """Jumlah frame basi yang dibuang sebelum sempat diproses"""
+        return self.buffer.dropped
+
+    def get_stats(self):
+        """Dapatkan statistik capture"""
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.buffer.dropped,
+            'read_failures': self.read_failures,
+            'consecutive_failures': self.consecutive_failures,
+            'source_lost': self.source_lost,
+            'buffer_depth': self.buffer.depth()
+        }
@@ -0,0 +1,145 @@
+"""
+Overlay Compositor Module
+Overlay rangkaian (panel, ikon, komponen) dirender sekali ke cache beserta mask alpha,
+lalu dicampur ke frame kamera hanya di area overlay yang tidak kosong, sehingga biaya
+per frame sebanding dengan luas overlay, bukan ukuran frame
+"""
+
+import cv2
+import numpy as np
+
+# Ukuran tile (pixel) untuk mencari area overlay yang tidak kosong
+TILE_SIZE = 16
+
+
+class OverlayCompositor:
+    """Cache overlay + mask; render ulang hanya saat ukuran frame atau key berubah"""
+
+    def __init__(self, alpha=0.3, tile_size=TILE_SIZE):
+        """
+        Initialize compositor
+
+        Args:
+            alpha: Bobot overlay saat dicampur (frame mendapat 1 - alpha)
+            tile_size: Ukuran tile untuk membagi overlay menjadi region
+        """
+        self.alpha = alpha
+        self.tile_size = tile_size
+        self.overlay = None
+        self.mask = None
+        self.regions = []  # (rows, cols, mask region atau None jika penuh, buffer blend)
+        self.renders = 0
+        self._key = None
+
+    def update(self, shape, key, draw):
+        """
+        Render ulang overlay jika ukuran frame atau key berubah
+
+        Args:
+            shape: Bentuk frame (H, W, 3)
+            key: Nilai yang berubah saat isi overlay berubah (misalnya versi rangkaian)
+            draw: Fungsi draw(overlay) yang menggambar ke overlay hitam
+
+        Returns:
+            bool: True jika overlay dirender ulang
+        """
+        key = (tuple(shape), key)
+        if key == self._key:
+            return False
+        self._key = key
+
+        if self.overlay is None or self.overlay.shape != tuple(shape):
+            self.overlay = np.empty(shape, dtype=np.uint8)
+        self.overlay.fill(0)
+        draw(self.overlay)
+
+        # Pixel hitam di overlay tidak mengubah frame (alpha 0)
+        covered = self.overlay.any(axis=2)
+        self.mask = covered.view(np.uint8) * np.uint8(255)
+        self.regions = self._find_regions(covered, self.mask)
+        self.renders += 1
+        return True
+
+    def _find_regions(self, covered, mask):
+        """Bagi area tertutup overlay menjadi rectangle (run tile berturut-turut)"""
+        height, width = covered.shape
+        size = self.tile_size
+        tiles_y = -(-height // size)
+        tiles_x = -(-width // size)
+        padded = np.zeros((tiles_y * size, tiles_x * size), dtype=bool)
+        padded[:height, :width] = covered
+        tiles = padded.reshape(tiles_y, size, tiles_x, size).any(axis=(1, 3))
+
+        # Run tile horizontal; run dengan kolom sama di baris tile berikutnya digabung
+        boxes = []
+        open_runs = {}
+        for ty in range(tiles_y):
+            row = tiles[ty]
+            runs = {}
+            tx = 0
+            while tx < tiles_x:
+                if not row[tx]:
+                    tx += 1
+                    continue
+                start = tx
+                while tx < tiles_x and row[tx]:
+                    tx += 1
+                index = open_runs.get((start, tx))
+                if index is None:
+                    index = len(boxes)
+                    boxes.append([start * size, ty * size, min(width, tx * size), 0])
+                boxes[index][3] = min(height, (ty + 1) * size)
+                runs[(start, tx)] = index
+            open_runs = runs
+
+        regions = []
+        for x0, y0, x1, y1 in boxes:
+            rows, cols = slice(y0, y1), slice(x0, x1)
+            if covered[rows, cols].all():
+                regions.append((rows, cols, None, None))
+            else:
+                region_mask = np.ascontiguousarray(mask[rows, cols])
+                buffer = np.empty((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+                regions.append((rows, cols, region_mask, buffer))
+        return regions
+
+    def composite(self, frame):
+        """
+        Campur overlay ke frame (in-place) hanya di region overlay
+
+        Args:
+            frame: Frame BGR dengan ukuran sama dengan overlay
+
+        Returns:
+            np.ndarray: frame yang sama
+        """
+        if self.overlay is None:
+            return frame
+        alpha = self.alpha
+        for rows, cols, mask, buffer in self.regions:
+            roi = frame[rows, cols]
+            if mask is None:
+                cv2.addWeighted(roi, 1 - alpha, self.overlay[rows, cols], alpha, 0, dst=roi)
+            else:
+                # Blend ke buffer, salin kembali hanya pixel yang tertutup overlay
+                cv2.addWeighted(roi, 1 - alpha, self.overlay[rows, cols], alpha, 0, dst=buffer)
+                cv2.copyTo(buffer, mask, roi)
+        return frame
+
+    def get_stats(self):
+        """
+        Statistik compositor
+
+        Returns:
+            dict: {'regions', 'coverage' (porsi frame yang dicampur), 'renders'}
+        """
+        if self.overlay is None:
+            return {'regions': 0, 'coverage': 0.0, 'renders': self.renders}
+        area = sum((rows.stop - rows.start) * (cols.stop - cols.start)
+                   for rows, cols, _, _ in self.regions)
+        height, width = self.overlay.shape[:2]
+        return {
+            'regions': len(self.regions),
+            'coverage': area / float(height * width),
+            'renders': self.renders
+        }
@@ -0,0 +1,103 @@
+"""
+Quality Control Module
+Tangga kualitas stream dan controller tier per client (tanpa OpenCV, sehingga broadcaster
+dan hub async bisa diimpor tanpa memuat library encode)
+"""
+
+import time
+
+# Tangga kualitas: index 0 = kualitas terbaik, semakin besar semakin ringan
+DEFAULT_QUALITY_LADDER = [
+    {'quality': 85, 'scale': 1.0},
+    {'quality': 70, 'scale': 1.0},
+    {'quality': 60, 'scale': 0.75},
+    {'quality': 50, 'scale': 0.5},
+    {'quality': 40, 'scale': 0.5},
+]
+
+
+class AdaptiveQualityController:
+    """Memilih tier kualitas untuk satu client berdasarkan frame yang dilewati dan throughput"""
+
+    def __init__(self, ladder_size=len(DEFAULT_QUALITY_LADDER), window=1.0,
+                 step_up_delay=3.0, skip_ratio_down=0.2):
+        """
+        Initialize controller
+
+        Args:
+            ladder_size: Jumlah tier di tangga kualitas
+            window: Panjang jendela evaluasi (detik)
+            step_up_delay: Waktu stabil minimum sebelum kualitas dinaikkan (detik)
+            skip_ratio_down: Rasio frame terlewat yang memicu penurunan kualitas
+        """
+        self.ladder_size = ladder_size
+        self.window = window
+        self.step_up_delay = step_up_delay
+        self.skip_ratio_down = skip_ratio_down
+
+        self.tier = 0
+        self.last_change = time.monotonic()
+        self.tier_changes = 0
+
+        # Akumulator jendela
+        self._window_start = time.monotonic()
+        self._received = 0
+        self._skipped = 0
+        self._bytes = 0
+
+        # Hasil evaluasi terakhir (untuk metrics)
+        self.fps = 0.0
+        self.kbps = 0.0
+        self.skip_ratio = 0.0
+
+    def record(self, skipped, nbytes):
+        """
+        Catat satu frame yang berhasil dikirim ke client
+
+        Args:
+            skipped: Jumlah frame yang dilewati sebelum frame ini
+            nbytes: Ukuran frame yang dikirim
+        """
+        self._received += 1
+        self._skipped += skipped
+        self._bytes += nbytes
+
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self._evaluate(now, elapsed)
+
+    def _evaluate(self, now, elapsed):
+        """Evaluasi jendela dan ubah tier jika perlu"""
+        total = self._received + self._skipped
+        self.skip_ratio = self._skipped / total if total else 0.0
+        self.fps = self._received / elapsed
+        self.kbps = self._bytes * 8 / 1000 / elapsed
+
+        if self.skip_ratio > self.skip_ratio_down and self.tier < self.ladder_size - 1:
+            # Client tidak sanggup mengikuti: turunkan kualitas
+            self._set_tier(self.tier + 1, now)
+        elif self._skipped == 0 and self.tier > 0 and now - self.last_change >= self.step_up_delay:
+            # Stabil cukup lama: coba naikkan kualitas satu tingkat
+            self._set_tier(self.tier - 1, now)
+
+        self._window_start = now
+        self._received = 0
+        self._skipped = 0
+        self._bytes = 0
+
+    def _set_tier(self, tier, now):
+        """Ganti tier dan catat waktunya"""
+        self.tier = tier
+        self.last_change = now
+        self.tier_changes += 1
+
+    def get_stats(self):
+        """Dapatkan keputusan dan pengukuran terakhir"""
+        return {
+            'tier': self.tier,
+            'fps': round(self.fps, 1),
+            'kbps': round(self.kbps, 1),
+            'skip_ratio': round(self.skip_ratio, 3),
+            'tier_changes': self.tier_changes
+        }
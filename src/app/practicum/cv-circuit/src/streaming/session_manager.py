@@ -0,0 +1,300 @@
+"""
+Session Manager Module
+Pool sesi streaming terisolasi (satu pipeline per siswa) dengan batas worker dan eviksi sesi idle
+"""
+
+import re
+import threading
+import time
+
+from .frame_capture import camera_index, parse_synthetic_size
+
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def sanitize_frame_source(value):
+    """
+    Validasi sumber frame yang diminta lewat HTTP
+
+    Hanya index kamera atau sumber sintetis yang boleh dipilih client
+    (path file tidak boleh datang dari request). Ukuran sintetis di-clamp agar client
+    tidak bisa meminta buffer frame raksasa.
+
+    Args:
+        value: Nilai dari query string / body request
+
+    Returns:
+        str atau None
+
+    Raises:
+        ValueError: Sumber frame tidak diizinkan
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return value
+    if value.startswith('synthetic'):
+        width, height = parse_synthetic_size(value)
+        return f'synthetic:{width}x{height}'
+    raise ValueError(f"Sumber frame tidak diizinkan: {value!r}")
+
+
+class StreamSession:
+    """Satu sesi streaming: pipeline, state rangkaian dan detector milik sendiri"""
+
+    def __init__(self, session_id, streamer, frame_source):
+        """
+        Initialize session
+
+        Args:
+            session_id: ID sesi
+            streamer: Pipeline (WebCVStreamer) milik sesi ini
+            frame_source: Sumber frame yang dipakai sesi
+        """
+        self.session_id = session_id
+        self.streamer = streamer
+        self.frame_source = frame_source
+        self.created_at = time.time()
+        self.last_active = time.monotonic()
+
+    def touch(self):
+        """Tandai sesi masih aktif"""
+        self.last_active = time.monotonic()
+
+    def idle_seconds(self):
+        """Lama sesi tidak aktif (detik)"""
+        # Sesi dengan penonton video atau client /circuit_events tidak pernah dianggap idle
+        if (self.streamer.broadcaster.subscriber_count() > 0 or
+                self.streamer.circuit_channel.listeners > 0):
+            self.touch()
+            return 0.0
+        return time.monotonic() - self.last_active
+
+    def close(self):
+        """Hentikan pipeline dan lepas kamera"""
+        self.streamer.stop_streaming()
+
+    def get_info(self):
+        """Dapatkan ringkasan sesi"""
+        return {
+            'session_id': self.session_id,
+            'frame_source': str(self.frame_source),
+            'running': self.streamer.is_running,
+            'viewers': self.streamer.broadcaster.subscriber_count(),
+            'idle_seconds': round(self.idle_seconds(), 1),
+            'components': len(self.streamer.circuit_components)
+        }
+
+
+class _PendingSession:
+    """Slot sesi yang sedang dibuat (pipeline dibangun di luar lock SessionManager)"""
+
+    def __init__(self, frame_source):
+        self.frame_source = frame_source
+        self.done = threading.Event()
+        self.error = None
+
+
+class SessionManager:
+    """Mengelola banyak sesi streaming dalam satu proses server"""
+
+    def __init__(self, streamer_factory, default_source=0, max_sessions=8,
+                 max_workers=4, idle_timeout=120.0, evict_after=30.0):
+        """
+        Initialize session manager
+
+        Args:
+            streamer_factory: Callable(frame_source, inference_slots) -> pipeline baru
+            default_source: Sumber frame default untuk sesi baru
+            max_sessions: Jumlah sesi maksimum yang boleh aktif
+            max_workers: Jumlah frame yang boleh diproses bersamaan (semua sesi)
+            idle_timeout: Sesi tanpa penonton lebih lama dari ini akan dihapus (detik)
+            evict_after: Saat pool penuh, sesi idle paling lama boleh dikeluarkan untuk sesi
+                         baru jika idle minimal selama ini (detik)
+        """
+        self.streamer_factory = streamer_factory
+        self.default_source = default_source
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.evict_after = min(evict_after, idle_timeout)
+
+        # Worker pool terbatas: inference + encode dibatasi lintas sesi
+        self.inference_slots = threading.BoundedSemaphore(max(1, max_workers))
+
+        self._sessions = {}
+        self._pending = {}  # session_id -> _PendingSession yang pipeline-nya sedang dibuat
+        self._lock = threading.Lock()
+        self._reaper_stop = threading.Event()
+        self._reaper = None
+        self.sessions_evicted = 0
+
+    def get_session(self, session_id='default', frame_source=None, create=True):
+        """
+        Dapatkan sesi berdasarkan ID, buat baru jika belum ada
+
+        Slot sesi dipesan di bawah lock, tetapi pipeline (pygame, kamera, detector) dibangun
+        di luar lock, sehingga sesi lain, /sessions, /metrics dan reaper tidak ikut menunggu.
+        Request lain untuk ID yang sama menunggu pembuatan yang sedang berjalan.
+
+        Args:
+            session_id: ID sesi
+            frame_source: Sumber frame untuk sesi baru (None = default)
+            create: Buat sesi jika belum ada
+
+        Returns:
+            StreamSession atau None
+
+        Raises:
+            ValueError: ID sesi tidak valid
+            RuntimeError: Jumlah sesi sudah mencapai batas atau kamera sudah dipakai sesi lain
+        """
+        if not SESSION_ID_PATTERN.match(session_id or ''):
+            raise ValueError(f"ID sesi tidak valid: {session_id!r}")
+
+        source = self.default_source if frame_source is None else frame_source
+        while True:
+            evicted = []
+            with self._lock:
+                session = self._sessions.get(session_id)
+                if session is not None:
+                    session.touch()
+                    return session
+                pending = self._pending.get(session_id)
+                if pending is None:
+                    if not create:
+                        return None
+                    if len(self._sessions) + len(self._pending) >= self.max_sessions:
+                        evicted = self._evict_idle_locked(force_one=True)
+                    if len(self._sessions) + len(self._pending) >= self.max_sessions:
+                        raise RuntimeError("Jumlah sesi maksimum tercapai")
+                    owner = self._camera_owner_locked(source)
+                    if owner is not None:
+                        raise RuntimeError(f"Kamera {source} sudah dipakai sesi {owner!r}")
+                    pending = self._pending[session_id] = _PendingSession(source)
+                    break
+
+            # Sesi yang sama sedang dibuat oleh request lain
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+
+        # Tutup sesi yang dieviksi di luar lock (stop pipeline bisa memakan waktu)
+        for old_session in evicted:
+            old_session.close()
+
+        try:
+            streamer = self.streamer_factory(source, self.inference_slots)
+        except Exception as error:
+            # Lepas slot agar request berikutnya bisa mencoba lagi
+            with self._lock:
+                self._pending.pop(session_id, None)
+            pending.error = error
+            pending.done.set()
+            raise
+
+        session = StreamSession(session_id, streamer, source)
+        with self._lock:
+            self._pending.pop(session_id, None)
+            self._sessions[session_id] = session
+        pending.done.set()
+
+        self._ensure_reaper()
+        return session
+
+    def _camera_owner_locked(self, source):
+        """
+        ID sesi yang sudah membuka kamera yang sama (lock harus dipegang)
+
+        Satu device kamera tidak bisa dibaca dua pipeline sekaligus; sumber sintetis
+        dan file dibuka terpisah per sesi sehingga tidak pernah bentrok.
+
+        Returns:
+            str atau None
+        """
+        index = camera_index(source)
+        if index is None:
+            return None
+        for session_id, session in self._sessions.items():
+            if camera_index(session.frame_source) == index:
+                return session_id
+        for session_id, pending in self._pending.items():
+            if camera_index(pending.frame_source) == index:
+                return session_id
+        return None
+
+    def close_session(self, session_id):
+        """
+        Tutup dan hapus satu sesi
+
+        Returns:
+            bool: True jika sesi ditemukan
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def get_sessions(self):
+        """Dapatkan semua sesi aktif (salinan list)"""
+        with self._lock:
+            return list(self._sessions.values())
+    
+    def list_sessions(self):
+        """Dapatkan info semua sesi"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [s.get_info() for s in sessions]
+
+    def evict_idle(self):
+        """
+        Hapus semua sesi yang idle lebih lama dari idle_timeout
+
+        Returns:
+            int: Jumlah sesi yang dihapus
+        """
+        with self._lock:
+            evicted = self._evict_idle_locked()
+        for session in evicted:
+            session.close()
+        return len(evicted)
+
+    def _evict_idle_locked(self, force_one=False):
+        """Keluarkan sesi idle dari pool (lock harus dipegang, caller yang menutup sesi)"""
+        idle = sorted(((s.idle_seconds(), sid) for sid, s in self._sessions.items()),
+                      reverse=True)
+        evicted = []
+        for idle_seconds, session_id in idle:
+            if idle_seconds >= self.idle_timeout or (force_one and not evicted and
+                                                     idle_seconds >= self.evict_after):
+                evicted.append(self._sessions.pop(session_id))
+        self.sessions_evicted += len(evicted)
+        return evicted
+
+    def _ensure_reaper(self):
+        """Jalankan thread pembersih sesi idle jika belum berjalan"""
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(target=self._reaper_loop,
+                                        name='SessionReaper', daemon=True)
+        self._reaper.start()
+
+    def _reaper_loop(self):
+        """Periksa sesi idle secara berkala"""
+        interval = max(1.0, min(30.0, self.idle_timeout / 4))
+        while not self._reaper_stop.wait(interval):
+            evicted = self.evict_idle()
+            if evicted:
+                print(f"{evicted} sesi idle dihapus")
+
+    def shutdown(self):
+        """Tutup semua sesi"""
+        self._reaper_stop.set()
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
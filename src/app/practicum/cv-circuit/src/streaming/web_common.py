@@ -0,0 +1,268 @@
+"""
+Web Common Module
+Bagian bersama web_cv_server.py (Flask) dan web_cv_server_async.py (aiohttp): template
+halaman utama, pembuatan pipeline per sesi, warm-up dan collector /metrics. Mengimpor
+modul ini tidak membuat SessionManager maupun mendaftarkan collector
+"""
+
+import os
+import threading
+from contextlib import nullcontext
+
+from ..utils.startup import STATE_FAILED, STATE_STARTING
+
+# Halaman utama
+INDEX_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Embedded CV Circuit Builder</title>
+        <style>
+            body { 
+                margin: 0; 
+                padding: 20px; 
+                background-color: #f0f0f0;
+                font-family: Arial, sans-serif;
+            }
+            .container {
+                max-width: 1200px;
+                margin: 0 auto;
+                background: white;
+                border-radius: 10px;
+                padding: 20px;
+                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            }
+            .header {
+                text-align: center;
+                margin-bottom: 20px;
+            }
+            .video-container {
+                display: flex;
+                justify-content: center;
+                margin-bottom: 20px;
+            }
+            .video-stream {
+                border: 2px solid #333;
+                border-radius: 10px;
+                max-width: 100%;
+                height: auto;
+            }
+            .controls {
+                display: flex;
+                justify-content: center;
+                gap: 10px;
+                margin-bottom: 20px;
+            }
+            .btn {
+                padding: 10px 20px;
+                border: none;
+                border-radius: 5px;
+                cursor: pointer;
+                font-size: 16px;
+            }
+            .btn-primary { background-color: #007bff; color: white; }
+            .btn-danger { background-color: #dc3545; color: white; }
+            .btn:hover { opacity: 0.8; }
+            .info-panel {
+                background-color: #f8f9fa;
+                padding: 15px;
+                border-radius: 5px;
+                margin-top: 20px;
+            }
+            .instructions {
+                display: grid;
+                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+                gap: 15px;
+                margin-top: 15px;
+            }
+            .instruction-card {
+                background: white;
+                padding: 15px;
+                border-radius: 5px;
+                border-left: 4px solid #007bff;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎮 Embedded CV Circuit Builder</h1>
+                <p>Build electrical circuits using hand gestures - directly in your browser!</p>
+            </div>
+            
+            <div class="video-container">
+                <img src="{{ video_feed_url }}" class="video-stream" alt="CV Stream">
+            </div>
+            
+            <div class="controls">
+                <button class="btn btn-primary" onclick="startStream()">🚀 Start CV Stream</button>
+                <button class="btn btn-danger" onclick="stopStream()">⏹️ Stop Stream</button>
+            </div>
+            
+            <div class="info-panel">
+                <h3>⚡ Live Circuit</h3>
+                <div id="live-calculations">V: 0V | I: 0A | R: 0Ω | P: 0W</div>
+                <small id="live-components">0 components (v0)</small>
+            </div>
+            
+            <div class="info-panel">
+                <h3>📋 Instructions</h3>
+                <div class="instructions">
+                    <div class="instruction-card">
+                        <h4>🤏 Pinch Gesture</h4>
+                        <p>Use thumb and index finger to select and drag components from the top panel</p>
+                    </div>
+                    <div class="instruction-card">
+                        <h4>👆 Point Gesture</h4>
+                        <p>Point to navigate and interact with the interface</p>
+                    </div>
+                    <div class="instruction-card">
+                        <h4>✋ Open Hand</h4>
+                        <p>Open your hand to release components and place them in the workspace</p>
+                    </div>
+                    <div class="instruction-card">
+                        <h4>📊 Real-time Calculations</h4>
+                        <p>See live calculations of voltage, current, resistance, and power in the side panel</p>
+                    </div>
+                </div>
+            </div>
+        </div>
+        
+        <script>
+            function startStream() {
+                fetch('/start_stream?session={{ session_id|urlencode }}', {method: 'POST'})
+                    .then(response => response.json())
+                    .then(data => console.log('Stream started:', data));
+            }
+            
+            function stopStream() {
+                fetch('/stop_stream?session={{ session_id|urlencode }}', {method: 'POST'})
+                    .then(response => response.json())
+                    .then(data => console.log('Stream stopped:', data));
+            }
+            
+            // Push updates dari /circuit_events (delta berversi, tanpa polling)
+            const circuitState = {version: 0, components: {}, calculations: {}};
+            
+            function renderCircuitState() {
+                const c = circuitState.calculations;
+                const fmt = (v, d) => Number(v || 0).toFixed(d);
+                document.getElementById('live-calculations').textContent =
+                    `V: ${fmt(c.voltage, 2)}V | I: ${fmt(c.current, 3)}A | R: ${fmt(c.resistance, 2)}Ω | P: ${fmt(c.power, 3)}W`;
+                document.getElementById('live-components').textContent =
+                    `${Object.keys(circuitState.components).length} components (v${circuitState.version})`;
+            }
+            
+            function applyCircuitEvent(payload, isSnapshot) {
+                if (isSnapshot) {
+                    circuitState.components = {};
+                    circuitState.calculations = {};
+                }
+                (payload.components || []).forEach(c => { circuitState.components[c.id] = c; });
+                (payload.removed || []).forEach(id => { delete circuitState.components[id]; });
+                Object.assign(circuitState.calculations, payload.calculations || {});
+                circuitState.version = payload.version;
+                renderCircuitState();
+            }
+            
+            let circuitEvents = null;
+            function connectCircuitEvents(since) {
+                if (circuitEvents) circuitEvents.close();
+                const query = since ? `&since=${since}` : '';
+                circuitEvents = new EventSource('/circuit_events?session={{ session_id|urlencode }}' + query);
+                circuitEvents.addEventListener('snapshot', e => applyCircuitEvent(JSON.parse(e.data), true));
+                circuitEvents.addEventListener('delta', e => {
+                    const delta = JSON.parse(e.data);
+                    if (delta.version !== circuitState.version + 1) {
+                        // Versi terlewat: resync dari versi terakhir yang dimiliki
+                        connectCircuitEvents(circuitState.version);
+                        return;
+                    }
+                    applyCircuitEvent(delta, false);
+                });
+            }
+            connectCircuitEvents(null);
+            
+            // Auto-start stream when page loads
+            window.onload = function() {
+                setTimeout(startStream, 1000);
+            };
+        </script>
+    </body>
+    </html>
+    '''
+
+
+def create_streamer(frame_source, inference_slots, startup=None):
+    """
+    Buat pipeline satu sesi; OpenCV, pygame dan backend landmark baru dimuat di sini
+    
+    Args:
+        frame_source: Sumber frame sesi
+        inference_slots: Semaphore bersama dari SessionManager
+        startup: StartupReport; fase hanya dicatat untuk pipeline pertama (cold start).
+                 Jika warm-up sebelumnya gagal, pipeline yang berhasil dibuat menandai
+                 server siap kembali
+    
+    Returns:
+        WebCVStreamer
+    """
+    report = startup if startup is not None and startup.state == STATE_STARTING else None
+    with report.phase('pipeline_imports') if report is not None else nullcontext():
+        from .web_streamer import WebCVStreamer
+    streamer = WebCVStreamer(frame_source, inference_slots, report)
+    if startup is not None and startup.state == STATE_FAILED:
+        startup.set_ready()
+        print("Pipeline berhasil dibuat setelah warm-up gagal, server siap")
+    return streamer
+
+
+def warm_up(manager, startup, session_id='default'):
+    """
+    Buat sesi default lalu baca frame pertama dan siapkan detector, sehingga client
+    pertama tidak menunggu kamera dan model dimuat
+    
+    Args:
+        manager: SessionManager
+        startup: StartupReport yang ditandai ready/failed setelah selesai
+        session_id: Sesi yang disiapkan
+    """
+    try:
+        session = manager.get_session(session_id)
+        session.streamer.warm_up(startup)
+    except Exception as e:
+        # Server tetap melayani request; sesi yang setengah jadi ditutup agar pipeline
+        # dibuat ulang saat sesi diminta (dan /ready kembali 200 jika berhasil)
+        manager.close_session(session_id)
+        startup.set_failed(e)
+        print(f"Warm-up gagal: {e}")
+        return
+    startup.set_ready()
+    print(startup.format())
+
+
+def start_warm_up(manager, startup):
+    """
+    Jalankan warm_up di thread background (CV_WARMUP=0: tanpa warm-up, pipeline dibuat
+    saat request pertama)
+    
+    Returns:
+        threading.Thread atau None
+    """
+    if os.environ.get('CV_WARMUP', '1') == '0':
+        startup.set_ready()
+        return None
+    thread = threading.Thread(target=warm_up, args=(manager, startup), name='WarmUp', daemon=True)
+    thread.start()
+    return thread
+
+
+def session_metrics_collector(manager):
+    """Buat collector /metrics untuk semua sesi di SessionManager"""
+    def collect():
+        sessions = manager.get_sessions()
+        yield ('gauge', 'cv_sessions_active', {}, len(sessions))
+        yield ('counter', 'cv_sessions_evicted_total', {}, manager.sessions_evicted)
+        for session in sessions:
+            yield from session.streamer.collect_metrics(session.session_id)
+    return collect
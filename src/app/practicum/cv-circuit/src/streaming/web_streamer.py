@@ -0,0 +1,493 @@
+"""
+Web Streamer Module
+Pipeline CV satu sesi web: capture, deteksi tangan, overlay rangkaian dan encode MJPEG.
+Dimuat server web saat sesi pertama dibuat (bukan saat server diimpor) karena memuat
+OpenCV, pygame dan backend landmark
+"""
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import cv2
+
+from ..circuit_logic.calculator import CircuitCalculator
+from ..circuit_logic.spatial_index import SpatialGrid, component_bbox
+from ..circuit_logic.wire_system import WireSystem
+from ..hand_detection.inference_pool import InferencePool
+from ..hand_detection.pinch_detector import PinchDetector
+from ..ui.component_panel import ComponentPanel
+from ..utils.frame_buffers import FrameBuffers
+from ..utils.metrics import METRICS
+from .adaptive_encoder import AdaptiveEncoder
+from .broadcaster import FrameBroadcaster, format_mjpeg_part
+from .circuit_events import CircuitStateChannel
+from .frame_capture import CaptureThread, open_frame_source
+from .overlay_compositor import OverlayCompositor
+
+
+class WebCVStreamer:
+    def __init__(self, frame_source=None, inference_slots=None, startup=None):
+        """
+        Initialize web CV streamer
+        
+        Args:
+            frame_source: Index kamera, 'synthetic' atau path file video
+                          (default: env CV_FRAME_SOURCE atau kamera 0)
+            inference_slots: Semaphore bersama untuk membatasi jumlah frame
+                             yang diproses bersamaan lintas sesi (opsional)
+            startup: StartupReport opsional untuk mencatat durasi setiap fase
+        """
+        phase = startup.phase if startup is not None else (lambda name: nullcontext())
+        
+        # Initialize pygame for UI components
+        with phase('pygame_init'):
+            import pygame
+            pygame.init()
+        
+        # Initialize components
+        if frame_source is None:
+            frame_source = os.environ.get('CV_FRAME_SOURCE', '0')
+        self.frame_source = frame_source
+        self.inference_slots = inference_slots if inference_slots is not None else nullcontext()
+        with phase('camera_open'):
+            self.cap = open_frame_source(frame_source)
+        self.capture = None
+        
+        # Lock untuk state rangkaian (dibaca route Flask dari thread lain)
+        self.state_lock = threading.RLock()
+        # Warm-up dan start_streaming tidak boleh membaca kamera / detector bersamaan
+        self.lifecycle_lock = threading.Lock()
+        
+        # Push channel: delta berversi untuk /circuit_events (pengganti polling /circuit_data)
+        self.circuit_channel = CircuitStateChannel()
+        if not self.cap.isOpened():
+            # Tetap lanjut: start_streaming akan mencoba membuka ulang sumber frame
+            print("Error: Tidak dapat membuka kamera!")
+            
+        # Inference di proses terpisah (CV_INFERENCE_WORKERS > 0): worker dijalankan saat frame
+        # pertama diproses dan dihentikan oleh stop_streaming
+        inference_workers = int(os.environ.get('CV_INFERENCE_WORKERS', 0))
+        self.inference_pool = InferencePool(num_workers=inference_workers) if inference_workers > 0 else None
+        with phase('detector_init'):
+            self.pinch_detector = PinchDetector(inference_pool=self.inference_pool)
+        # Landmark & indikator pinch digambar di frame output (CV_DRAW_LANDMARKS=0: tidak)
+        self.draw_landmarks = os.environ.get('CV_DRAW_LANDMARKS', '1') != '0'
+        self.component_panel = ComponentPanel(800, 600)
+        self.wire_system = WireSystem()
+        self.calculator = CircuitCalculator()
+        
+        # Buffer mirror dipakai ulang setiap frame. Aman karena frame hasil process_frame
+        # selesai di-encode di producer sebelum frame berikutnya diproses
+        self.frame_buffers = FrameBuffers()
+        
+        # Overlay rangkaian di-cache; dirender ulang hanya saat versi rangkaian berubah
+        self.overlay = OverlayCompositor(alpha=0.3)
+        
+        # Web streaming state
+        self.is_running = False
+        self.current_frame = None
+        
+        # Satu producer meng-encode frame sekali, dibagikan ke semua client /video_feed
+        self.broadcaster = FrameBroadcaster()
+        self.producer_thread = None
+        
+        # Kualitas JPEG & skala resolusi adaptif per client untuk menjaga target FPS
+        self.encoder = AdaptiveEncoder(target_fps=int(os.environ.get('CV_STREAM_TARGET_FPS', 25)))
+        self.circuit_data = {
+            'components': [],
+            'calculations': {
+                'voltage': 0,
+                'current': 0,
+                'resistance': 0,
+                'power': 0
+            }
+        }
+        
+        # Application state
+        self.dragging_component = None
+        self.selected_component = None  # Add missing attribute
+        self.circuit_components = []
+        self.component_index = SpatialGrid()
+        
+        print("Web CV Streamer berhasil diinisialisasi!")
+    
+    def warm_up(self, startup=None):
+        """
+        Baca frame pertama dan siapkan detector (pemilihan backend, inisialisasi model)
+        sebelum client pertama meminta stream
+        
+        Args:
+            startup: StartupReport opsional untuk mencatat durasi setiap fase
+        """
+        phase = startup.phase if startup is not None else (lambda name: nullcontext())
+        with self.lifecycle_lock:
+            if self.capture is not None:
+                # Stream sudah berjalan: detector disiapkan oleh frame pertama
+                return
+            with phase('camera_first_frame'):
+                ret, frame = self.cap.read() if self.cap.isOpened() else (False, None)
+            if not ret or frame is None:
+                print("Warm-up: tidak ada frame dari kamera, detector disiapkan saat stream dimulai")
+                return
+            with phase('detector_warmup'):
+                self.pinch_detector.warm_up(self.frame_buffers.mirror(frame))
+    
+    def process_frame(self):
+        """Process single frame with CV detection"""
+        # Ambil frame terbaru dari capture thread (frame basi dibuang)
+        if self.capture is None:
+            return None
+        with METRICS.stage('capture_wait'):
+            _, frame = self.capture.read_latest(timeout=1.0)
+        if frame is None:
+            return None
+            
+        # Flip frame horizontally for mirror effect
+        # (ke buffer sendiri: frame dari capture thread tidak diubah)
+        with METRICS.stage('flip'):
+            frame = self.frame_buffers.mirror(frame)
+        views = self.frame_buffers.views(frame)
+        
+        # Detect hand gestures
+        with METRICS.stage('detect'):
+            pinch_results = self.pinch_detector.detect_pinch(frame, views)
+        
+        if pinch_results:
+            # Get pinch information
+            is_pinching = pinch_results.get('is_pinching', False)
+            position = pinch_results.get('position', (0, 0))
+            
+            # Update circuit state based on gestures
+            # TODO: Implement gesture-based circuit building
+            
+            # Handle pinch interactions
+            if is_pinching:
+                with self.state_lock:
+                    self.handle_pinch_interaction({
+                        'position': position,
+                        'is_pinching': is_pinching
+                    })
+        
+        # Render ulang overlay hanya jika rangkaian berubah (versi channel circuit_events)
+        with METRICS.stage('overlay'), self.state_lock:
+            self.overlay.update(frame.shape, self.circuit_channel.version,
+                                self.draw_circuit_overlay)
+        
+        # Campur overlay hanya di area yang tidak kosong (in-place di frame)
+        with METRICS.stage('blend'):
+            combined_frame = self.overlay.composite(frame)
+        
+        # Add UI elements
+        with METRICS.stage('ui'):
+            self.draw_ui_elements(combined_frame)
+        
+        # Anotasi tangan hanya di frame yang akan di-encode, dan hanya jika ada penonton
+        if self.draw_landmarks and self.broadcaster.subscriber_count():
+            with METRICS.stage('annotate'):
+                self.pinch_detector.annotate(combined_frame)
+        
+        return combined_frame
+    
+    def draw_circuit_overlay(self, overlay):
+        """Draw circuit visualization onto a black overlay (pixel hitam = transparan)"""
+        height, width = overlay.shape[:2]
+        
+        # Draw component panel area
+        cv2.rectangle(overlay, (0, 0), (width, 100), (50, 50, 50), -1)
+        
+        # Draw component icons in panel
+        self.draw_component_icons(overlay, width)
+        
+        # Draw workspace area
+        cv2.rectangle(overlay, (0, 100), (width, height), (30, 30, 30), 2)
+        
+        # Draw circuit components
+        for component in self.circuit_components:
+            self.draw_component(overlay, component)
+    
+    def draw_component_icons(self, overlay, width):
+        """Draw component icons in panel"""
+        icon_width = width // 4
+        
+        # Battery icon
+        cv2.rectangle(overlay, (icon_width//2 - 30, 25), (icon_width//2 + 30, 75), (0, 255, 0), 2)
+        cv2.putText(overlay, "BAT", (icon_width//2 - 20, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        
+        # Resistor icon  
+        x_center = icon_width + icon_width//2
+        cv2.rectangle(overlay, (x_center - 30, 25), (x_center + 30, 75), (0, 255, 255), 2)
+        cv2.putText(overlay, "RES", (x_center - 20, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        
+        # Wire icon
+        x_center = 2 * icon_width + icon_width//2
+        cv2.line(overlay, (x_center - 30, 50), (x_center + 30, 50), (128, 128, 128), 5)
+        cv2.putText(overlay, "WIRE", (x_center - 25, 75), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+    
+    def draw_component(self, overlay, component):
+        """Draw individual circuit component"""
+        x, y = component['position']
+        comp_type = component['type']
+        
+        if comp_type == 'battery':
+            cv2.rectangle(overlay, (x-20, y-15), (x+20, y+15), (0, 255, 0), -1)
+            cv2.putText(overlay, f"{component.get('value', 12)}V", (x-15, y+25), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        elif comp_type == 'resistor':
+            cv2.rectangle(overlay, (x-25, y-10), (x+25, y+10), (0, 255, 255), -1)
+            cv2.putText(overlay, f"{component.get('value', 100)}Ω", (x-20, y+25), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        elif comp_type == 'wire':
+            cv2.line(overlay, (x-20, y), (x+20, y), (128, 128, 128), 3)
+    
+    def draw_ui_elements(self, frame):
+        """Draw UI elements on frame"""
+        height, width = frame.shape[:2]
+        
+        # Draw calculations panel
+        calc_x = width - 200
+        calc_y = 120
+        
+        cv2.rectangle(frame, (calc_x, calc_y), (width-10, calc_y + 150), (0, 0, 0), -1)
+        cv2.rectangle(frame, (calc_x, calc_y), (width-10, calc_y + 150), (255, 255, 255), 2)
+        
+        # Draw calculation values
+        calcs = self.circuit_data['calculations']
+        cv2.putText(frame, "CALCULATIONS", (calc_x + 5, calc_y + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        cv2.putText(frame, f"V: {calcs['voltage']:.2f}V", (calc_x + 5, calc_y + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+        cv2.putText(frame, f"I: {calcs['current']:.3f}A", (calc_x + 5, calc_y + 60), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
+        cv2.putText(frame, f"R: {calcs['resistance']:.2f}Ω", (calc_x + 5, calc_y + 80), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 0), 1)
+        cv2.putText(frame, f"P: {calcs['power']:.3f}W", (calc_x + 5, calc_y + 100), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 0, 255), 1)
+        
+        # Draw instructions
+        instructions = [
+            "PINCH: Select & drag components",
+            "POINT: Navigate interface", 
+            "OPEN: Release components"
+        ]
+        
+        for i, instruction in enumerate(instructions):
+            cv2.putText(frame, instruction, (10, height - 60 + i*20), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+    
+    def handle_pinch_interaction(self, pinch_data):
+        """Handle pinch gesture interactions"""
+        if not pinch_data['is_pinching']:
+            if self.dragging_component:
+                # Place component at current position
+                self.place_component(pinch_data['position'])
+            return
+            
+        pos = pinch_data['position']
+        
+        # Check if pinching in component panel area
+        if pos[1] < 100:  # Top 100 pixels are component panel
+            self.select_component_from_panel(pos)
+        else:
+            # Check if pinching existing component
+            clicked_component = self.check_component_at_position(pos)
+            if clicked_component:
+                self.select_existing_component(clicked_component)
+            elif self.dragging_component:
+                # Move dragging component
+                self.update_dragging_position(pos)
+    
+    def check_component_at_position(self, pos):
+        """Check if there's a component at the given position"""
+        # Kandidat dari spatial index, lalu cek jarak ke tengah komponen
+        for component in self.component_index.query(pos, 50):
+            comp_pos = component.get('position', (0, 0))
+            distance = ((pos[0] - comp_pos[0])**2 + (pos[1] - comp_pos[1])**2)**0.5
+            if distance < 50:  # 50 pixel radius
+                return component
+        return None
+    
+    def select_existing_component(self, component):
+        """Select an existing component for dragging"""
+        self.selected_component = component
+        self.dragging_component = True
+    
+    def update_dragging_position(self, pos):
+        """Update position of dragging component"""
+        if self.selected_component:
+            self.selected_component['position'] = pos
+            self.component_index.update(self.selected_component['id'],
+                                        component_bbox(self.selected_component))
+            self.publish_circuit_state()
+    
+    def select_component_from_panel(self, pos):
+        """Select component type from panel"""
+        x = pos[0]
+        width = 800  # Assumed width
+        icon_width = width // 4
+        
+        if x < icon_width:
+            self.dragging_component = {'type': 'battery', 'value': 12}
+        elif x < 2 * icon_width:
+            self.dragging_component = {'type': 'resistor', 'value': 100}
+        elif x < 3 * icon_width:
+            self.dragging_component = {'type': 'wire', 'value': 0}
+    
+    def place_component(self, pos):
+        """Place component at position"""
+        if self.dragging_component and pos[1] > 100:  # Only place in workspace
+            new_component = {
+                'id': f"{self.dragging_component['type']}_{len(self.circuit_components)}",
+                'type': self.dragging_component['type'],
+                'position': pos,
+                'value': self.dragging_component['value']
+            }
+            self.circuit_components.append(new_component)
+            self.component_index.insert(new_component['id'], new_component,
+                                        component_bbox(new_component))
+            self.calculate_circuit()
+        
+        self.dragging_component = None
+    
+    def calculate_circuit(self):
+        """Calculate circuit values"""
+        # Komponen web menyimpan nilai sebagai angka; solver memakai format dict aplikasi utama
+        value_keys = {'battery': 'voltage', 'resistor': 'resistance'}
+        solver_components = [
+            dict(c, value={value_keys[c['type']]: c['value']}) if c['type'] in value_keys else c
+            for c in self.circuit_components
+        ]
+        results = self.calculator.calculate_circuit(
+            solver_components, self.wire_system.get_connected_components() or None)
+        
+        self.circuit_data['calculations'] = {
+            'voltage': results['voltage'],
+            'current': results['current'],
+            'resistance': results['resistance'],
+            'power': results['power'],
+            'circuit_type': results['circuit_type']
+        }
+        self.circuit_data['components'] = self.circuit_components
+        self.publish_circuit_state()
+    
+    def publish_circuit_state(self):
+        """Push a versioned delta to /circuit_events subscribers if anything changed"""
+        self.circuit_channel.update(self.circuit_components, self.circuit_data['calculations'])
+    
+    def get_circuit_data(self):
+        """Get a consistent snapshot of circuit data"""
+        with self.state_lock:
+            return {
+                'components': [dict(c) for c in self.circuit_data['components']],
+                'calculations': dict(self.circuit_data['calculations'])
+            }
+    
+    def _producer_loop(self):
+        """Process and encode each frame exactly once, then publish to all clients"""
+        while self.is_running:
+            # Sumber frame hilang (file selesai, kamera dicabut): akhiri stream client,
+            # /start_stream berikutnya membuka ulang sumber
+            if self.capture is not None and self.capture.source_lost:
+                self.is_running = False
+                self.broadcaster.close()
+                break
+            
+            # Tidak ada penonton: jangan buang CPU untuk inference dan encode
+            if not self.broadcaster.wait_for_subscribers(timeout=0.5):
+                continue
+            
+            # Slot worker dibatasi lintas sesi oleh SessionManager
+            wait_start = time.perf_counter()
+            with self.inference_slots:
+                METRICS.observe('slot_wait', time.perf_counter() - wait_start)
+                with METRICS.stage('frame'):
+                    frame = self.process_frame()
+                if frame is None:
+                    continue
+                
+                # Encode frame as JPEG, sekali per tier kualitas yang sedang dipakai client
+                with METRICS.stage('encode'):
+                    encoded = self.encoder.encode(frame, self.broadcaster.active_tiers())
+            self.broadcaster.tier_floor = self.encoder.tier_floor
+            if encoded:
+                with METRICS.stage('publish'):
+                    self.broadcaster.publish(encoded)
+                METRICS.inc('cv_frames_published_total')
+    
+    def generate_frames(self):
+        """Generate frames for streaming"""
+        subscriber = self.broadcaster.subscribe()
+        try:
+            while self.is_running:
+                # Client lambat melewati frame, tidak menahan producer
+                frame_data = subscriber.next_frame(timeout=1.0)
+                if frame_data is None:
+                    continue
+                yield format_mjpeg_part(frame_data, subscriber.last_timestamp)
+        finally:
+            subscriber.close()
+    
+    def start_streaming(self):
+        """Start streaming (menunggu warm-up yang sedang berjalan)"""
+        with self.lifecycle_lock:
+            if self.capture is None or not self.capture.is_running():
+                # Buka ulang sumber frame jika sudah dilepas oleh stop_streaming
+                if self.cap is None or not self.cap.isOpened():
+                    self.cap = open_frame_source(self.frame_source)
+                self.capture = CaptureThread(self.cap).start()
+            self.is_running = True
+            self.broadcaster.reopen()
+            if self.producer_thread is None or not self.producer_thread.is_alive():
+                self.producer_thread = threading.Thread(target=self._producer_loop,
+                                                        name='FrameProducer', daemon=True)
+                self.producer_thread.start()
+    
+    def stop_streaming(self):
+        """Stop streaming"""
+        self.is_running = False
+        self.broadcaster.close()
+        if self.producer_thread:
+            self.producer_thread.join(timeout=2.0)
+            self.producer_thread = None
+        if self.capture:
+            if not self.capture.stop():
+                # Thread capture masih di dalam read() dan akan melepas sumber sendiri;
+                # start_streaming harus membuka sumber baru, bukan memakai yang ini
+                self.cap = None
+            self.capture = None
+        elif self.cap:
+            self.cap.release()
+        if self.inference_pool:
+            self.inference_pool.close()
+    
+    def collect_metrics(self, session_id):
+        """
+        Metrics per sesi untuk /metrics: frame terbuang dan kedalaman antrean
+        
+        Returns:
+            list: (type, name, labels, value)
+        """
+        labels = {'session': session_id}
+        capture = self.get_capture_stats()
+        broadcast = self.broadcaster.get_stats()
+        subscribers = broadcast['subscribers']
+        metrics = [
+            ('counter', 'cv_capture_frames_total', labels, capture['frames_captured']),
+            ('counter', 'cv_capture_frames_dropped_total', labels, capture['frames_dropped']),
+            ('counter', 'cv_capture_read_failures_total', labels, capture['read_failures']),
+            ('gauge', 'cv_capture_buffer_depth', labels, capture['buffer_depth']),
+            ('gauge', 'cv_capture_source_lost', labels, int(capture['source_lost'])),
+            ('counter', 'cv_broadcast_frames_published_total', labels, broadcast['frames_published']),
+            ('counter', 'cv_broadcast_frames_skipped_total', labels,
+             sum(s['frames_skipped'] for s in subscribers)),
+            ('gauge', 'cv_broadcast_subscribers', labels, len(subscribers)),
+            ('gauge', 'cv_encoder_tier_floor', labels, self.encoder.tier_floor),
+        ]
+        if self.inference_pool is not None:
+            pool = self.inference_pool.get_stats()
+            metrics += [
+                ('gauge', 'cv_inference_in_flight', labels, pool['in_flight']),
+                ('counter', 'cv_inference_frames_dropped_total', labels, pool['frames_dropped']),
+            ]
+        return metrics
+    
+    def get_capture_stats(self):
+        """Get capture thread statistics (frames captured/dropped)"""
+        if self.capture is None:
+            return {'frames_captured': 0, 'frames_dropped': 0,
+                    'read_failures': 0, 'consecutive_failures': 0,
+                    'source_lost': False, 'buffer_depth': 0}
+        return self.capture.get_stats()
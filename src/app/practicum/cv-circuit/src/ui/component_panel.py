@@ -5,6 +5,7 @@ Panel untuk memilih komponen rangkaian listrik dengan visual yang menarik
 
 import pygame
 import math
+from .text_cache import TEXT_CACHE
 from .visual_components import ComponentRenderer
 
 # Initialize pygame and font system
@@ -66,8 +67,8 @@ class ComponentPanel:
         
         # Initialize pygame fonts with safety check
         pygame.font.init()  # Ensure pygame font is initialized
-        self.font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 18)
+        self.font = TEXT_CACHE.font(24)
+        self.small_font = TEXT_CACHE.font(18)
         self.renderer = ComponentRenderer()
         
     def render(self, screen):
@@ -137,16 +138,7 @@ class ComponentPanel:
         # Gambar komponen menggunakan visual renderer
         selected = (self.selected_component == comp_name)
         
-        if comp_name == 'battery':
-            self.renderer.draw_battery(screen, x, y, comp_data['size'], selected)
-        elif comp_name == 'lamp':
-            self.renderer.draw_lamp(screen, x, y, comp_data['size'], selected)
-        elif comp_name == 'resistor':
-            self.renderer.draw_resistor(screen, x, y, comp_data['size'], selected)
-        elif comp_name == 'switch':
-            self.renderer.draw_switch(screen, x, y, comp_data['size'], selected=selected)
-        elif comp_name == 'wire':
-            self.renderer.draw_wire(screen, x, y, comp_data['size'], selected)
+        self.renderer.draw_component(screen, comp_name, x, y, comp_data['size'], selected=selected)
         
         # Label nama komponen
         self.renderer.draw_component_label(screen, x, y + h//2 + 15, 
@@ -6,6 +6,10 @@ Interface utama aplikasi Circuit Builder CV dengan visual components yang menari
 import pygame
 import cv2
 import numpy as np
+
+from ..hand_detection.landmarks import annotate_hands
+from ..utils.metrics import METRICS
+from .text_cache import TEXT_CACHE
 from .visual_components import ComponentRenderer
 
 class MainInterface:
@@ -30,10 +34,12 @@ class MainInterface:
         self.workspace_y = self.panel_height
         self.workspace_height = screen_height - self.panel_height - self.info_panel_height
         
-        # Fonts
-        self.font_large = pygame.font.Font(None, 28)
-        self.font_medium = pygame.font.Font(None, 24)
-        self.font_small = pygame.font.Font(None, 20)
+        # Fonts (dari cache teks bersama; HUD tidak di-cache karena isinya berubah tiap frame)
+        TEXT_CACHE.preload()
+        self.font_large = TEXT_CACHE.font(28)
+        self.font_medium = TEXT_CACHE.font(24)
+        self.font_small = TEXT_CACHE.font(20)
+        self.font_hud = pygame.font.SysFont('monospace', 13)
         
         # Colors
         self.colors = {
@@ -65,6 +71,17 @@ class MainInterface:
         # Hand tracking overlay
         self.show_hand_overlay = True
         self.pointed_component = None
+        self.component_index = None  # Spatial index komponen dari frame terakhir (opsional)
+        
+        # Layer cache dan dirty rect
+        self._static_layer = None
+        self._static_key = None
+        self._base_layer = None
+        self._base_key = None
+        self._calculations_version = 0
+        self._frame_rects = []
+        self._restore_rects = []
+        self._full_update = True
         
         # Camera display area
         self.camera_width = 200
@@ -72,67 +89,179 @@ class MainInterface:
         self.camera_x = screen_width - self.camera_width - 10
         self.camera_y = self.workspace_y + 10
         
+        # Buffer inset kamera: surface pygame memakai memori array yang sama (tanpa copy)
+        self._camera_buffer = None
+        self._camera_convert = None
+        self._camera_surface = None
+        # Landmark & indikator pinch digambar di inset (resolusi tampil), bukan di frame kamera
+        self.draw_landmarks = True
+        
     def render(self, frame=None, pinch_data=None, components=None, 
-               dragging_component=None, temp_pos=None, wires=None):
+               dragging_component=None, temp_pos=None, wires=None, component_index=None,
+               active_wire=None, layer_version=None, hands=None, drags=None):
         """
         Render seluruh interface
         
+        Layer statis (background, panel, grid) dan layer rangkaian (komponen, kabel jadi,
+        panel perhitungan, instruksi) di-cache sebagai surface; hanya overlay tangan, kamera,
+        komponen yang di-drag dan kabel aktif yang digambar ulang setiap frame.
+        Area layar yang berubah tersedia lewat get_dirty_rects().
+        
         Args:
             frame: Frame kamera
             pinch_data: Data deteksi pinch
             components: List komponen rangkaian
             dragging_component: Komponen yang sedang di-drag
             temp_pos: Posisi temporary saat drag
-            wires: List kabel
+            wires: List kabel yang sudah jadi
+            component_index: CircuitModel/SpatialGrid untuk hit-test komponen
+                             (None = scan semua komponen)
+            active_wire: Kabel yang sedang ditarik (digambar per frame)
+            layer_version: Key perubahan komponen/kabel; layer rangkaian hanya digambar ulang
+                           jika berubah (None = gambar ulang setiap frame)
+            hands: Data semua tangan (list dict detect_hands); None = hanya pinch_data
+            drags: List (tipe komponen, posisi) yang sedang di-drag semua tangan;
+                   None = dragging_component/temp_pos
         """
-        # Update pinch status
-        self.current_pinch_status = pinch_data['is_pinching'] if pinch_data else False
+        self.component_index = component_index
+        if hands is None:
+            hands = [pinch_data] if pinch_data else []
+        if drags is None:
+            drags = [(dragging_component, temp_pos)]
+        
+        # Update pinch status (aktif jika salah satu tangan pinch)
+        self.current_pinch_status = any(hand['is_pinching'] for hand in hands)
+        
+        # Area yang digambar frame sebelumnya harus dikembalikan ke isi layer cache
+        self._restore_rects = self._frame_rects
+        self._frame_rects = []
+        
+        with METRICS.stage('render.layers'):
+            self._full_update = self._update_layers(components, wires, layer_version)
+            if self._full_update:
+                self.screen.blit(self._base_layer, (0, 0))
+            else:
+                for rect in self._restore_rects:
+                    self.screen.blit(self._base_layer, rect, rect)
+        
+        # Render dragging component dan kabel yang sedang ditarik
+        with METRICS.stage('render.dragging'):
+            for comp_type, pos in drags:
+                if comp_type and pos:
+                    self._render_dragging_component(comp_type, pos)
+            if active_wire:
+                self._render_wires(self.screen, [active_wire])
+                self._mark(self._wire_rect(active_wire))
+        
+        # Render hand tracking overlay (satu per tangan)
+        if frame is not None and hands:
+            with METRICS.stage('render.hand_overlay'):
+                for hand in hands:
+                    self._render_hand_overlay(hand, components)
+        
+        # Render camera feed
+        if frame is not None:
+            with METRICS.stage('render.camera'):
+                self._render_camera_feed(frame, pinch_data, hands)
         
-        # Clear screen
-        self.screen.fill(self.colors['background'])
+        # Render status pinch
+        self._render_pinch_status()
+    
+    def _update_layers(self, components, wires, layer_version):
+        """
+        Bangun ulang layer cache yang berubah
         
-        # Render panel komponen PERTAMA (di atas semua)
+        Returns:
+            bool: True jika layer dasar digambar ulang (seluruh layar perlu di-update)
+        """
         from .component_panel import ComponentPanel
         if not hasattr(self, 'component_panel'):
             self.component_panel = ComponentPanel(self.screen_width, self.screen_height)
-        self.component_panel.render(self.screen)
-        
-        # Render workspace area
-        self._render_workspace()
-        
-        # Render components
-        if components:
-            self._render_components(components)
-        
-        # Render dragging component
-        if dragging_component and temp_pos:
-            self._render_dragging_component(dragging_component, temp_pos)
-        
-        # Render wires
-        if wires:
-            self._render_wires(wires)
         
-        # Render hand tracking overlay
-        if frame is not None and pinch_data:
-            self._render_hand_overlay(pinch_data, components)
-        
-        # Render camera feed
-        if frame is not None:
-            self._render_camera_feed(frame, pinch_data)
+        # Layer statis: background, panel komponen dan grid workspace
+        static_key = self.component_panel.selected_component
+        if self._static_layer is None or self._static_key != static_key:
+            self._static_layer = pygame.Surface(self.screen.get_size(), 0, self.screen)
+            self._static_layer.fill(self.colors['background'])
+            self.component_panel.render(self._static_layer)
+            self._render_workspace(self._static_layer)
+            self._static_key = static_key
+            self._base_key = None
+        
+        # Layer dasar: layer statis + komponen, kabel jadi, panel perhitungan dan instruksi
+        base_key = (layer_version, self._calculations_version)
+        if self._base_layer is None or layer_version is None or self._base_key != base_key:
+            if self._base_layer is None:
+                self._base_layer = pygame.Surface(self.screen.get_size(), 0, self.screen)
+            self._base_layer.blit(self._static_layer, (0, 0))
+            if components:
+                self._render_components(self._base_layer, components)
+            if wires:
+                self._render_wires(self._base_layer, wires)
+            self._render_info_panel(self._base_layer)
+            self._render_instructions(self._base_layer)
+            self._base_key = base_key
+            return True
+        return False
+    
+    def _mark(self, rect):
+        """Catat area layar yang digambar frame ini (dirty rect)"""
+        self._frame_rects.append(rect)
+        return rect
+    
+    def _wire_rect(self, wire):
+        """Bounding rect kabel termasuk titik koneksinya"""
+        (x1, y1), (x2, y2) = wire['start_pos'], wire['end_pos']
+        rect = pygame.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+        return rect.inflate(16, 16)
+    
+    def get_dirty_rects(self):
+        """
+        Area layar yang berubah sejak frame sebelumnya (untuk pygame.display.update)
         
-        # Render info panel
-        self._render_info_panel()
+        Returns:
+            list: List pygame.Rect
+        """
+        if self._full_update:
+            return [self.screen.get_rect()]
+        return self._restore_rects + self._frame_rects
+    
+    def render_debug_hud(self, summary, fps=None):
+        """
+        Render HUD debug: latensi per tahap (rata-rata & p95 dari frame terakhir)
         
-        # Render instructions
-        self._render_instructions()
+        Args:
+            summary: Hasil METRICS.summary()
+            fps: FPS aktual loop (opsional)
+        """
+        lines = [f"FPS: {fps:.1f}"] if fps is not None else []
+        for name in sorted(summary):
+            stats = summary[name]
+            lines.append(f"{name:<22}{stats['mean_ms']:6.2f} {stats['p95_ms']:6.2f} ms")
+        if not lines:
+            lines.append("Metrics nonaktif (CV_METRICS=0)")
+        text_stats = TEXT_CACHE.get_stats()
+        lines.append(f"text cache {text_stats['hit_rate']:6.1%} ({text_stats['entries']} entry)")
+        
+        line_height = 16
+        width = 300
+        hud_rect = pygame.Rect(self.screen_width - width - 10, self.camera_y + self.camera_height + 10,
+                               width, line_height * len(lines) + 8)
+        hud_surface = pygame.Surface(hud_rect.size, pygame.SRCALPHA)
+        hud_surface.fill((0, 0, 0, 170))
+        self._mark(self.screen.blit(hud_surface, hud_rect.topleft))
+        
+        for i, line in enumerate(lines):
+            text = self.font_hud.render(line, True, self.colors['success'])
+            self._mark(self.screen.blit(text, (hud_rect.x + 6, hud_rect.y + 4 + i * line_height)))
     
-    def _render_workspace(self):
+    def _render_workspace(self, surface):
         """Render area workspace untuk praktikum"""
         workspace_rect = pygame.Rect(
             0, self.workspace_y, 
             self.screen_width, self.workspace_height
         )
-        pygame.draw.rect(self.screen, (40, 40, 50), workspace_rect)
+        pygame.draw.rect(surface, (40, 40, 50), workspace_rect)
         
         # Grid lines untuk membantu penempatan
         grid_size = 50
@@ -140,25 +269,25 @@ class MainInterface:
         
         # Vertical lines
         for x in range(0, self.screen_width, grid_size):
-            pygame.draw.line(self.screen, grid_color, 
+            pygame.draw.line(surface, grid_color, 
                            (x, self.workspace_y), 
                            (x, self.workspace_y + self.workspace_height))
         
         # Horizontal lines
         for y in range(self.workspace_y, self.workspace_y + self.workspace_height, grid_size):
-            pygame.draw.line(self.screen, grid_color, 
+            pygame.draw.line(surface, grid_color, 
                            (0, y), (self.screen_width, y))
         
         # Title workspace
         title = self.font_medium.render("AREA PRAKTIKUM", True, self.colors['text'])
-        self.screen.blit(title, (20, self.workspace_y + 10))
+        surface.blit(title, (20, self.workspace_y + 10))
     
-    def _render_components(self, components):
+    def _render_components(self, surface, components):
         """Render komponen yang sudah ditempatkan"""
         for component in components:
-            self._render_single_component(component)
+            self._render_single_component(surface, component)
     
-    def _render_single_component(self, component):
+    def _render_single_component(self, surface, component):
         """Render satu komponen dengan visual yang menarik di area praktikum"""
         pos = component['position']
         comp_type = component['type']
@@ -184,25 +313,16 @@ class MainInterface:
             pos[0] - detection_w//2, pos[1] - detection_h//2, 
             detection_w, detection_h
         )
-        pygame.draw.rect(self.screen, (100, 255, 100, 50), detection_rect, 1)  # Hijau transparan
+        pygame.draw.rect(surface, (100, 255, 100, 50), detection_rect, 1)  # Hijau transparan
         
-        # Gambar komponen menggunakan visual renderer
-        if comp_type == 'battery':
-            self.renderer.draw_battery(self.screen, pos[0], pos[1], size)
-        elif comp_type == 'lamp':
-            self.renderer.draw_lamp(self.screen, pos[0], pos[1], size)
-        elif comp_type == 'resistor':
-            self.renderer.draw_resistor(self.screen, pos[0], pos[1], size)
-        elif comp_type == 'switch':
-            state = comp_value.get('state', 'OFF')
-            self.renderer.draw_switch(self.screen, pos[0], pos[1], size, state)
-        elif comp_type == 'wire':
-            self.renderer.draw_wire(self.screen, pos[0], pos[1], size)
+        # Gambar komponen dari sprite atlas
+        self.renderer.draw_component(surface, comp_type, pos[0], pos[1], size,
+                                     state=comp_value.get('state', 'OFF'))
         
         # Value text dengan background yang jelas
         value_text = self._get_component_value_text(comp_type, comp_value)
         if value_text:
-            self.renderer.draw_component_label(self.screen, pos[0], pos[1] + size[1]//2 + 15, 
+            self.renderer.draw_component_label(surface, pos[0], pos[1] + size[1]//2 + 15, 
                                              value_text, self.font_small, (255, 255, 255))
         
         # Tambahkan icon kecil untuk menunjukkan komponen bisa dipindah
@@ -212,7 +332,7 @@ class MainInterface:
         for dx, dy in [(-1, -1), (1, -1), (-1, 1), (1, 1)]:
             icon_x = pos[0] + dx * (size[0]//2 - 5)
             icon_y = pos[1] + dy * (size[1]//2 - 5)
-            pygame.draw.circle(self.screen, move_icon_color, (icon_x, icon_y), 3)
+            pygame.draw.circle(surface, move_icon_color, (icon_x, icon_y), 3)
     
     def _get_component_value_text(self, comp_type, comp_value):
         """Dapatkan text nilai komponen"""
@@ -248,34 +368,25 @@ class MainInterface:
                 pos[0] - glow_size[0]//2, pos[1] - glow_size[1]//2,
                 glow_size[0], glow_size[1]
             )
-            pygame.draw.rect(self.screen, (255, 255, 100), glow_rect, 2)
+            self._mark(pygame.draw.rect(self.screen, (255, 255, 100), glow_rect, 2))
         
         # Gambar komponen dengan semi-transparansi
         temp_surface = pygame.Surface(size, pygame.SRCALPHA)
         
-        if comp_type == 'battery':
-            self.renderer.draw_battery(temp_surface, size[0]//2, size[1]//2, size)
-        elif comp_type == 'lamp':
-            self.renderer.draw_lamp(temp_surface, size[0]//2, size[1]//2, size)
-        elif comp_type == 'resistor':
-            self.renderer.draw_resistor(temp_surface, size[0]//2, size[1]//2, size)
-        elif comp_type == 'switch':
-            self.renderer.draw_switch(temp_surface, size[0]//2, size[1]//2, size)
-        elif comp_type == 'wire':
-            self.renderer.draw_wire(temp_surface, size[0]//2, size[1]//2, size)
+        self.renderer.draw_component(temp_surface, comp_type, size[0]//2, size[1]//2, size)
         
         # Buat semi-transparan
         temp_surface.set_alpha(180)
         
         # Blit ke layar
-        self.screen.blit(temp_surface, (pos[0] - size[0]//2, pos[1] - size[1]//2))
+        self._mark(self.screen.blit(temp_surface, (pos[0] - size[0]//2, pos[1] - size[1]//2)))
         
         # Label "DRAGGING"
         drag_label = self.font_small.render(f"DRAG {comp_type.upper()}", True, self.colors['warning'])
         label_pos = (pos[0] - drag_label.get_width()//2, pos[1] - size[1]//2 - 25)
-        self.screen.blit(drag_label, label_pos)
+        self._mark(self.screen.blit(drag_label, label_pos))
     
-    def _render_wires(self, wires):
+    def _render_wires(self, surface, wires):
         """Render kabel"""
         for wire in wires:
             start_pos = wire['start_pos']
@@ -287,33 +398,29 @@ class MainInterface:
             line_width = 4 if is_connected else 2
             
             # Draw wire
-            pygame.draw.line(self.screen, color, start_pos, end_pos, line_width)
+            pygame.draw.line(surface, color, start_pos, end_pos, line_width)
             
             # Connection points
             start_color = self.colors['success'] if wire.get('start_connection') else self.colors['error']
             end_color = self.colors['success'] if wire.get('end_connection') else self.colors['error']
             
-            pygame.draw.circle(self.screen, start_color, start_pos, 6)
-            pygame.draw.circle(self.screen, end_color, end_pos, 6)
+            pygame.draw.circle(surface, start_color, start_pos, 6)
+            pygame.draw.circle(surface, end_color, end_pos, 6)
     
-    def _render_camera_feed(self, frame, pinch_data):
+    def _render_camera_feed(self, frame, pinch_data, hands=None):
         """Render feed kamera di sudut kanan atas"""
-        # Resize frame
-        frame_resized = cv2.resize(frame, (self.camera_width, self.camera_height))
-        
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-        
-        # Convert to pygame surface
-        frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+        # Window diminimize: tidak ada yang melihat anotasi
+        if not (self.draw_landmarks and pygame.display.get_active()):
+            hands = None
+        frame_surface = self._update_camera_surface(frame, hands)
         
         # Border
         camera_rect = pygame.Rect(self.camera_x - 2, self.camera_y - 2, 
                                  self.camera_width + 4, self.camera_height + 4)
-        pygame.draw.rect(self.screen, self.colors['panel'], camera_rect)
+        self._mark(pygame.draw.rect(self.screen, self.colors['panel'], camera_rect))
         
         # Display frame
-        self.screen.blit(frame_surface, (self.camera_x, self.camera_y))
+        self._mark(self.screen.blit(frame_surface, (self.camera_x, self.camera_y)))
         
         # Pinch status overlay
         if pinch_data:
@@ -321,21 +428,55 @@ class MainInterface:
             status_text = "PINCH" if pinch_data['is_pinching'] else "OPEN"
             
             status_surface = self.font_small.render(status_text, True, status_color)
-            self.screen.blit(status_surface, (self.camera_x + 5, self.camera_y + 5))
+            self._mark(self.screen.blit(status_surface, (self.camera_x + 5, self.camera_y + 5)))
     
-    def _render_info_panel(self):
+    def _update_camera_surface(self, frame, hands=None):
+        """
+        Resize frame langsung ke buffer persisten yang menjadi memori surface inset
+        
+        Surface dibuat sekali dengan pygame.image.frombuffer dalam format BGR, sehingga
+        tidak ada konversi warna, swapaxes maupun surface baru per frame. Anotasi tangan
+        digambar setelah resize (di 200x150), sehingga frame kamera tidak diubah.
+        
+        Args:
+            frame: Frame kamera BGR
+            hands: Data tangan untuk anotasi (None = tanpa anotasi)
+        
+        Returns:
+            pygame.Surface: Surface inset kamera (selalu objek yang sama)
+        """
+        size = (self.camera_width, self.camera_height)
+        if self._camera_surface is None:
+            self._camera_buffer = np.empty((self.camera_height, self.camera_width, 3), dtype=np.uint8)
+            try:
+                self._camera_surface = pygame.image.frombuffer(self._camera_buffer, size, 'BGR')
+            except ValueError:
+                # pygame lama belum mendukung 'BGR': resize ke buffer terpisah lalu konversi ke RGB
+                self._camera_convert = np.empty_like(self._camera_buffer)
+                self._camera_surface = pygame.image.frombuffer(self._camera_buffer, size, 'RGB')
+        
+        target = self._camera_buffer if self._camera_convert is None else self._camera_convert
+        cv2.resize(frame, size, dst=target)
+        if hands:
+            with METRICS.stage('render.annotate'):
+                annotate_hands(target, hands, self.camera_width / frame.shape[1])
+        if self._camera_convert is not None:
+            cv2.cvtColor(self._camera_convert, cv2.COLOR_BGR2RGB, dst=self._camera_buffer)
+        return self._camera_surface
+    
+    def _render_info_panel(self, surface):
         """Render panel informasi perhitungan"""
         info_y = self.screen_height - self.info_panel_height
         
         # Background
         info_rect = pygame.Rect(0, info_y, self.screen_width, self.info_panel_height)
-        pygame.draw.rect(self.screen, self.colors['info_panel'], info_rect)
-        pygame.draw.line(self.screen, self.colors['accent'], 
+        pygame.draw.rect(surface, self.colors['info_panel'], info_rect)
+        pygame.draw.line(surface, self.colors['accent'], 
                         (0, info_y), (self.screen_width, info_y), 2)
         
         # Title
         title = self.font_medium.render("HASIL PERHITUNGAN HUKUM OHM", True, self.colors['text'])
-        self.screen.blit(title, (20, info_y + 10))
+        surface.blit(title, (20, info_y + 10))
         
         # Calculation values
         calc = self.current_calculations
@@ -351,30 +492,38 @@ class MainInterface:
         for i, (value, x_pos) in enumerate(zip(values, x_positions)):
             color = self.colors['success'] if calc['voltage'] > 0 else self.colors['text']
             value_surface = self.font_medium.render(value, True, color)
-            self.screen.blit(value_surface, (x_pos, info_y + 40))
+            surface.blit(value_surface, (x_pos, info_y + 40))
         
         # Circuit type (Indonesian)
         circuit_type_raw = calc['circuit_type'].lower()
         type_map = {
             'series': ('Seri', self.colors['success']),
             'parallel': ('Paralel', self.colors['warning']),
-            'open': ('Terbuka', self.colors['error'])
+            'mixed': ('Campuran', self.colors['accent']),
+            'open': ('Terbuka', self.colors['error']),
+            'short': ('Hubung Singkat', self.colors['error'])
         }
         type_label, type_color = type_map.get(circuit_type_raw, ('Tidak Diketahui', self.colors['text']))
         type_text = f"Rangkaian: {type_label}"
         type_surface = self.font_medium.render(type_text, True, type_color)
-        self.screen.blit(type_surface, (550, info_y + 40))
+        surface.blit(type_surface, (550, info_y + 40))
+        
+        if circuit_type_raw == 'short':
+            # Kutub baterai tersambung langsung tanpa beban
+            warning = self.font_small.render("PERINGATAN: kutub baterai terhubung langsung, periksa kabel!",
+                                             True, self.colors['error'])
+            surface.blit(warning, (550, info_y + 15))
     
-    def _render_instructions(self):
+    def _render_instructions(self, surface):
         """Render instruksi penggunaan dengan tampilan yang lebih jelas"""
         # Background untuk instruksi
         instruction_bg = pygame.Rect(10, self.workspace_y + self.workspace_height - 120, 400, 110)
-        pygame.draw.rect(self.screen, (0, 0, 0, 200), instruction_bg)
-        pygame.draw.rect(self.screen, self.colors['accent'], instruction_bg, 2)
+        pygame.draw.rect(surface, (0, 0, 0, 200), instruction_bg)
+        pygame.draw.rect(surface, self.colors['accent'], instruction_bg, 2)
         
         # Title instruksi
         title = self.font_medium.render("PANDUAN PENGGUNAAN:", True, self.colors['warning'])
-        self.screen.blit(title, (15, self.workspace_y + self.workspace_height - 115))
+        surface.blit(title, (15, self.workspace_y + self.workspace_height - 115))
         
         instructions = [
             "🤏 PINCH: Pilih & drag komponen dari panel atas",
@@ -388,17 +537,17 @@ class MainInterface:
             # Background untuk setiap instruksi
             text_surface = self.font_small.render(instruction, True, self.colors['text'])
             text_bg = pygame.Rect(15, y_start + i * 18 - 1, text_surface.get_width() + 4, 16)
-            pygame.draw.rect(self.screen, (40, 40, 40), text_bg)
-            self.screen.blit(text_surface, (17, y_start + i * 18))
-        
-        # Status pinch di sudut kanan bawah
-        if hasattr(self, 'current_pinch_status'):
-            status_text = f"PINCH: {'AKTIF' if self.current_pinch_status else 'TIDAK AKTIF'}"
-            status_color = self.colors['success'] if self.current_pinch_status else self.colors['error']
-            status_surface = self.font_small.render(status_text, True, status_color)
-            status_pos = (self.screen_width - status_surface.get_width() - 10, 
-                         self.screen_height - status_surface.get_height() - 10)
-            self.screen.blit(status_surface, status_pos)
+            pygame.draw.rect(surface, (40, 40, 40), text_bg)
+            surface.blit(text_surface, (17, y_start + i * 18))
+    
+    def _render_pinch_status(self):
+        """Status pinch di sudut kanan bawah (digambar per frame)"""
+        status_text = f"PINCH: {'AKTIF' if self.current_pinch_status else 'TIDAK AKTIF'}"
+        status_color = self.colors['success'] if self.current_pinch_status else self.colors['error']
+        status_surface = self.font_small.render(status_text, True, status_color)
+        status_pos = (self.screen_width - status_surface.get_width() - 10, 
+                     self.screen_height - status_surface.get_height() - 10)
+        self._mark(self.screen.blit(status_surface, status_pos))
     
     def update_calculations(self, calculations):
         """
@@ -407,7 +556,9 @@ class MainInterface:
         Args:
             calculations: Dict hasil perhitungan
         """
-        self.current_calculations.update(calculations)
+        if any(self.current_calculations.get(key) != value for key, value in calculations.items()):
+            self.current_calculations.update(calculations)
+            self._calculations_version += 1
     
     def _render_hand_overlay(self, pinch_data, components):
         """Render overlay hand tracking di workspace dengan feedback visual"""
@@ -433,15 +584,15 @@ class MainInterface:
             
             # Crosshair besar di posisi pinch
             crosshair_size = 30
-            pygame.draw.line(self.screen, color,
+            self._mark(pygame.draw.line(self.screen, color,
                            (pinch_pos[0] - crosshair_size, pinch_pos[1]),
-                           (pinch_pos[0] + crosshair_size, pinch_pos[1]), 4)
-            pygame.draw.line(self.screen, color,
+                           (pinch_pos[0] + crosshair_size, pinch_pos[1]), 4))
+            self._mark(pygame.draw.line(self.screen, color,
                            (pinch_pos[0], pinch_pos[1] - crosshair_size),
-                           (pinch_pos[0], pinch_pos[1] + crosshair_size), 4)
+                           (pinch_pos[0], pinch_pos[1] + crosshair_size), 4))
             
             # Lingkaran di sekitar posisi
-            pygame.draw.circle(self.screen, color, pinch_pos, circle_radius, 3)
+            self._mark(pygame.draw.circle(self.screen, color, pinch_pos, circle_radius, 3))
             
             # Animasi ripple effect untuk pinch
             if pinch_data['is_pinching']:
@@ -449,7 +600,7 @@ class MainInterface:
                     ripple_radius = circle_radius + (i * 10)
                     ripple_alpha = 255 - (i * 80)
                     ripple_color = (*color, ripple_alpha)
-                    pygame.draw.circle(self.screen, color, pinch_pos, ripple_radius, 2)
+                    self._mark(pygame.draw.circle(self.screen, color, pinch_pos, ripple_radius, 2))
             
             # Status text dengan background
             distance = pinch_data.get('distance', 0)
@@ -467,13 +618,13 @@ class MainInterface:
             text_height = len(status_lines) * 18
             text_bg = pygame.Rect(pinch_pos[0] + 40, pinch_pos[1] - 30, 
                                  text_width + 10, text_height + 10)
-            pygame.draw.rect(self.screen, (0, 0, 0, 200), text_bg)
-            pygame.draw.rect(self.screen, color, text_bg, 2)
+            self._mark(pygame.draw.rect(self.screen, (0, 0, 0, 200), text_bg))
+            self._mark(pygame.draw.rect(self.screen, color, text_bg, 2))
             
             # Render status text
             for i, line in enumerate(status_lines):
                 text_surface = self.font_small.render(line, True, (255, 255, 255))
-                self.screen.blit(text_surface, (pinch_pos[0] + 45, pinch_pos[1] - 25 + i * 18))
+                self._mark(self.screen.blit(text_surface, (pinch_pos[0] + 45, pinch_pos[1] - 25 + i * 18)))
             
             # Cek apakah menunjuk komponen tertentu
             pointed_component = self._get_pointed_component(pinch_pos, components)
@@ -484,18 +635,22 @@ class MainInterface:
         if 'thumb_pos' in pinch_data and 'index_pos' in pinch_data:
             self._render_finger_landmarks(pinch_data)
     
+    def _components_near(self, pos, radius, components):
+        """Kandidat komponen dalam radius dari posisi (spatial index jika tersedia)"""
+        if self.component_index is None:
+            return components
+        return self.component_index.query(pos, radius)
+    
     def _get_pointed_component(self, pinch_pos, components):
         """Cek komponen mana yang ditunjuk oleh posisi pinch"""
         if not components:
             return None
-            
-        for component in components:
+        
+        detection_radius = 40  # Radius deteksi
+        for component in self._components_near(pinch_pos, detection_radius, components):
             comp_pos = component['position']
             comp_type = component['type']
             
-            # Ukuran area deteksi berdasarkan tipe komponen
-            detection_radius = 40  # Radius deteksi
-            
             # Hitung jarak dari pinch ke komponen
             distance = ((pinch_pos[0] - comp_pos[0])**2 + (pinch_pos[1] - comp_pos[1])**2)**0.5
             
@@ -518,13 +673,13 @@ class MainInterface:
             effect_text = "MENUNJUK"
         
         # Highlight circle
-        pygame.draw.circle(self.screen, highlight_color, pos, 50, 4)
+        self._mark(pygame.draw.circle(self.screen, highlight_color, pos, 50, 4))
         
         # Pulsing effect
         for i in range(3):
             pulse_radius = 50 + (i * 8)
             pulse_alpha = 100 - (i * 30)
-            pygame.draw.circle(self.screen, highlight_color, pos, pulse_radius, 2)
+            self._mark(pygame.draw.circle(self.screen, highlight_color, pos, pulse_radius, 2))
         
         # Info komponen yang ditunjuk
         comp_info = f"{effect_text}: {comp_type.upper()}"
@@ -539,10 +694,10 @@ class MainInterface:
         info_surface = self.font_medium.render(comp_info, True, (255, 255, 255))
         info_bg = pygame.Rect(pos[0] - info_surface.get_width()//2 - 5, pos[1] - 70, 
                              info_surface.get_width() + 10, info_surface.get_height() + 6)
-        pygame.draw.rect(self.screen, (0, 0, 0, 200), info_bg)
-        pygame.draw.rect(self.screen, highlight_color, info_bg, 2)
+        self._mark(pygame.draw.rect(self.screen, (0, 0, 0, 200), info_bg))
+        self._mark(pygame.draw.rect(self.screen, highlight_color, info_bg, 2))
         
-        self.screen.blit(info_surface, (pos[0] - info_surface.get_width()//2, pos[1] - 67))
+        self._mark(self.screen.blit(info_surface, (pos[0] - info_surface.get_width()//2, pos[1] - 67)))
     
     def _render_finger_landmarks(self, pinch_data):
         """Render landmark jari (jempol dan telunjuk) di workspace"""
@@ -553,11 +708,11 @@ class MainInterface:
         if (thumb_pos[1] > self.panel_height and index_pos[1] > self.panel_height):
             
             # Gambar titik landmark
-            pygame.draw.circle(self.screen, (255, 0, 255), thumb_pos, 6)  # Jempol - magenta
-            pygame.draw.circle(self.screen, (0, 255, 255), index_pos, 6)  # Telunjuk - cyan
+            self._mark(pygame.draw.circle(self.screen, (255, 0, 255), thumb_pos, 6))  # Jempol - magenta
+            self._mark(pygame.draw.circle(self.screen, (0, 255, 255), index_pos, 6))  # Telunjuk - cyan
             
             # Garis antara jempol dan telunjuk
-            pygame.draw.line(self.screen, (255, 255, 100), thumb_pos, index_pos, 3)
+            self._mark(pygame.draw.line(self.screen, (255, 255, 100), thumb_pos, index_pos, 3))
             
             # Label
             thumb_label = self.font_small.render("JEMPOL", True, (255, 0, 255))
@@ -569,11 +724,11 @@ class MainInterface:
             index_bg = pygame.Rect(index_pos[0] + 8, index_pos[1] - 15, 
                                   index_label.get_width() + 4, index_label.get_height() + 2)
             
-            pygame.draw.rect(self.screen, (0, 0, 0, 180), thumb_bg)
-            pygame.draw.rect(self.screen, (0, 0, 0, 180), index_bg)
+            self._mark(pygame.draw.rect(self.screen, (0, 0, 0, 180), thumb_bg))
+            self._mark(pygame.draw.rect(self.screen, (0, 0, 0, 180), index_bg))
             
-            self.screen.blit(thumb_label, (thumb_pos[0] + 10, thumb_pos[1] - 13))
-            self.screen.blit(index_label, (index_pos[0] + 10, index_pos[1] - 13))
+            self._mark(self.screen.blit(thumb_label, (thumb_pos[0] + 10, thumb_pos[1] - 13)))
+            self._mark(self.screen.blit(index_label, (index_pos[0] + 10, index_pos[1] - 13)))
     
     def _convert_camera_to_workspace(self, camera_pos, camera_size, workspace_rect):
         """Convert posisi kamera ke workspace coordinates"""
@@ -615,20 +770,20 @@ class MainInterface:
                 
                 # Lingkaran untuk ujung jari
                 radius = 8 if finger_name == 'index' else 6  # Telunjuk lebih besar
-                pygame.draw.circle(self.screen, color, pos, radius)
-                pygame.draw.circle(self.screen, (255, 255, 255), pos, radius, 2)
+                self._mark(pygame.draw.circle(self.screen, color, pos, radius))
+                self._mark(pygame.draw.circle(self.screen, (255, 255, 255), pos, radius, 2))
                 
                 # Label jari
                 if finger_name == 'index':  # Highlight telunjuk
                     label = self.font_small.render("👆", True, (255, 255, 255))
                     label_pos = (pos[0] - 10, pos[1] - 25)
-                    self.screen.blit(label, label_pos)
+                    self._mark(self.screen.blit(label, label_pos))
         
         # Gambar garis koneksi (simplified)
         if 'wrist' in finger_positions and 'index' in finger_positions:
             if finger_positions['wrist'] and finger_positions['index']:
-                pygame.draw.line(self.screen, (100, 100, 100), 
-                               finger_positions['wrist'], finger_positions['index'], 2)
+                self._mark(pygame.draw.line(self.screen, (100, 100, 100), 
+                               finger_positions['wrist'], finger_positions['index'], 2))
     
     def _check_pointing_at_components(self, finger_positions, components):
         """Cek apakah telunjuk menunjuk ke komponen tertentu"""
@@ -642,7 +797,7 @@ class MainInterface:
         self.pointed_component = None
         min_distance = float('inf')
         
-        for component in components:
+        for component in self._components_near(index_pos, pointing_threshold, components):
             comp_pos = component['position']
             distance = self._calculate_distance(index_pos, comp_pos)
             
@@ -656,7 +811,7 @@ class MainInterface:
             comp_type = self.pointed_component['type']
             
             # Lingkaran highlight
-            pygame.draw.circle(self.screen, (255, 255, 0), comp_pos, 50, 4)
+            self._mark(pygame.draw.circle(self.screen, (255, 255, 0), comp_pos, 50, 4))
             
             # Info popup
             info_text = f"👆 {comp_type.upper()}"
@@ -672,12 +827,12 @@ class MainInterface:
                 info_surface.get_width() + 10,
                 info_surface.get_height() + 4
             )
-            pygame.draw.rect(self.screen, (0, 0, 0, 200), info_bg)
-            pygame.draw.rect(self.screen, (255, 255, 0), info_bg, 2)
+            self._mark(pygame.draw.rect(self.screen, (0, 0, 0, 200), info_bg))
+            self._mark(pygame.draw.rect(self.screen, (255, 255, 0), info_bg, 2))
             
             # Text info
             info_pos = (comp_pos[0] - info_surface.get_width()//2, comp_pos[1] - 68)
-            self.screen.blit(info_surface, info_pos)
+            self._mark(self.screen.blit(info_surface, info_pos))
     
     def _calculate_distance(self, pos1, pos2):
         """Hitung jarak euclidean antara dua posisi"""
@@ -0,0 +1,124 @@
+"""
+Sprite Atlas Module
+Pre-render gambar komponen (per tipe, ukuran, state dan status dipilih) sekali ke satu
+surface atlas, lalu gambar komponen cukup dengan satu blit dari atlas
+"""
+
+import pygame
+
+# Lebar atlas (pixel); tinggi bertambah otomatis saat atlas penuh
+ATLAS_WIDTH = 1024
+# Jarak antar sprite di atlas agar tidak ada bleeding antar sprite
+SPRITE_SPACING = 1
+
+
+class SpriteAtlas:
+    """Atlas sprite dengan shelf packing; variant baru dirender saat pertama kali diminta"""
+
+    def __init__(self, draw_functions, width=ATLAS_WIDTH, initial_height=256):
+        """
+        Initialize atlas
+
+        Args:
+            draw_functions: Dict tipe -> fungsi gambar primitif
+                            fn(surface, x, y, size, state, selected)
+            width: Lebar atlas
+            initial_height: Tinggi awal atlas
+        """
+        self.draw_functions = draw_functions
+        self.width = width
+        self.surface = pygame.Surface((width, initial_height), pygame.SRCALPHA)
+        self.sprites = {}  # key -> (area Rect di atlas, offset dari titik tengah komponen)
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+        self.hits = 0
+        self.misses = 0
+
+    def blit(self, surface, comp_type, x, y, size, state=None, selected=False):
+        """
+        Gambar komponen dari atlas dengan titik tengah di (x, y)
+
+        Args:
+            surface: Surface tujuan
+            comp_type: Tipe komponen
+            x, y: Posisi tengah komponen
+            size: Ukuran komponen (w, h)
+            state: State visual (misalnya 'ON'/'OFF' untuk saklar)
+            selected: Tampilkan highlight dipilih
+
+        Returns:
+            pygame.Rect: Area yang digambar di surface tujuan
+        """
+        key = (comp_type, tuple(size), state, bool(selected))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self.sprites[key] = self._render_sprite(key)
+        else:
+            self.hits += 1
+        area, (offset_x, offset_y) = sprite
+        return surface.blit(self.surface, (x + offset_x, y + offset_y), area)
+
+    def _render_sprite(self, key):
+        """Render satu variant dengan fungsi primitif lalu pack ke atlas"""
+        comp_type, size, state, selected = key
+        w, h = size
+        # Label dan highlight bisa keluar dari ukuran komponen: render di kanvas yang lebar
+        pad = max(w, h) // 2 + 48
+        canvas = pygame.Surface((w + 2 * pad, h + 2 * pad), pygame.SRCALPHA)
+        center_x, center_y = w // 2 + pad, h // 2 + pad
+        self.draw_functions[comp_type](canvas, center_x, center_y, size, state, selected)
+
+        # Pangkas area kosong
+        bounds = canvas.get_bounding_rect()
+        if bounds.width == 0 or bounds.height == 0:
+            bounds = pygame.Rect(center_x, center_y, 1, 1)
+        area = self._allocate(bounds.width, bounds.height)
+        self.surface.fill((0, 0, 0, 0), area)
+        self.surface.blit(canvas, area.topleft, bounds, special_flags=pygame.BLEND_RGBA_MAX)
+        return area, (bounds.x - center_x, bounds.y - center_y)
+
+    def _allocate(self, width, height):
+        """Cari tempat kosong di atlas (shelf packing), perbesar atlas jika perlu"""
+        if width > self.width:
+            self._grow(self.surface.get_height(), width)
+        if self._shelf_x + width > self.width:
+            # Shelf baru di bawah shelf sekarang
+            self._shelf_y += self._shelf_height + SPRITE_SPACING
+            self._shelf_x = 0
+            self._shelf_height = 0
+        if self._shelf_y + height > self.surface.get_height():
+            self._grow(max(self.surface.get_height() * 2, self._shelf_y + height), self.width)
+
+        area = pygame.Rect(self._shelf_x, self._shelf_y, width, height)
+        self._shelf_x += width + SPRITE_SPACING
+        self._shelf_height = max(self._shelf_height, height)
+        return area
+
+    def _grow(self, height, width):
+        """Buat atlas lebih besar dan salin isi lama (posisi sprite tidak berubah)"""
+        self.width = max(self.width, width)
+        grown = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        grown.blit(self.surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        self.surface = grown
+
+    def get_stats(self):
+        """
+        Statistik atlas
+
+        Returns:
+            dict: {'sprites', 'size', 'hits', 'misses'}
+        """
+        return {
+            'sprites': len(self.sprites),
+            'size': self.surface.get_size(),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def clear(self):
+        """Hapus semua sprite (dirender ulang saat diminta lagi)"""
+        self.sprites.clear()
+        self.surface.fill((0, 0, 0, 0))
+        self._shelf_x = self._shelf_y = self._shelf_height = 0
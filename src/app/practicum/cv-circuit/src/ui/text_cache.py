@@ -0,0 +1,146 @@
+"""
+Text Cache Module
+Layanan render teks bersama: objek font dibuat sekali dan surface teks disimpan dalam
+cache LRU dengan key (font, ukuran, teks, warna), sehingga frame steady-state tidak
+merasterisasi ulang glyph
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from ..utils.metrics import METRICS
+
+# Ukuran font default (pygame.font.Font(None, size)) yang dipakai UI
+PRELOAD_SIZES = (16, 18, 20, 24, 28)
+
+
+class CachedFont:
+    """Pengganti pygame.font.Font: render() mengambil surface dari cache TextCache"""
+
+    def __init__(self, cache, key, font):
+        self.cache = cache
+        self.key = key
+        self.font = font
+
+    def render(self, text, antialias, color, background=None):
+        """
+        Render teks (surface hasil cache, jangan dimodifikasi)
+
+        Args:
+            text: Teks
+            antialias: Antialiasing
+            color: Warna teks
+            background: Warna background (opsional)
+
+        Returns:
+            pygame.Surface
+        """
+        return self.cache.render_text(self, text, antialias, color, background)
+
+    def size(self, text):
+        """Ukuran teks (lebar, tinggi) tanpa render"""
+        return self.font.size(text)
+
+    def get_height(self):
+        """Tinggi baris font"""
+        return self.font.get_height()
+
+    def get_linesize(self):
+        """Jarak antar baris font"""
+        return self.font.get_linesize()
+
+
+class TextCache:
+    """Cache font dan surface teks dengan batas jumlah entry (LRU)"""
+
+    def __init__(self, max_entries=512):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Jumlah surface teks maksimum yang disimpan
+        """
+        self.max_entries = max_entries
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, name=None, sysfont=False):
+        """
+        Dapatkan font (dibuat sekali per kombinasi nama/ukuran)
+
+        Args:
+            size: Ukuran font
+            name: Nama/path font (None = font default pygame)
+            sysfont: True untuk pygame.font.SysFont(name, size)
+
+        Returns:
+            CachedFont
+        """
+        key = (name, size, sysfont)
+        font = self._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            raw = pygame.font.SysFont(name, size) if sysfont else pygame.font.Font(name, size)
+            font = self._fonts[key] = CachedFont(self, key, raw)
+        return font
+
+    def preload(self, sizes=PRELOAD_SIZES):
+        """Buat font default untuk ukuran yang dipakai UI"""
+        for size in sizes:
+            self.font(size)
+
+    def render_text(self, font, text, antialias, color, background=None):
+        """Render teks lewat cache (dipanggil oleh CachedFont.render)"""
+        key = (font.key, text, antialias, tuple(color),
+               None if background is None else tuple(background))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = font.font.render(text, antialias, color)
+        else:
+            surface = font.font.render(text, antialias, color, background)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def get_stats(self):
+        """
+        Statistik cache
+
+        Returns:
+            dict: {'hits', 'misses', 'hit_rate', 'entries', 'fonts'}
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._surfaces),
+            'fonts': len(self._fonts)
+        }
+
+    def clear(self):
+        """Kosongkan cache surface dan statistik (font tetap disimpan)"""
+        self._surfaces.clear()
+        self.hits = self.misses = 0
+
+    def collect_metrics(self):
+        """Collector untuk METRICS (/metrics)"""
+        yield 'counter', 'cv_text_cache_hits_total', {}, self.hits
+        yield 'counter', 'cv_text_cache_misses_total', {}, self.misses
+        yield 'gauge', 'cv_text_cache_entries', {}, len(self._surfaces)
+
+
+# Cache teks bersama untuk seluruh UI pygame
+TEXT_CACHE = TextCache()
+METRICS.add_collector(TEXT_CACHE.collect_metrics)
@@ -6,12 +6,54 @@ Menggambar komponen elektronik dengan bentuk visual yang menarik
 import pygame
 import math
 
+from .sprite_atlas import SpriteAtlas
+from .text_cache import TEXT_CACHE
+
 # Initialize pygame
 pygame.init()
 
 class ComponentRenderer:
     """Class untuk menggambar komponen dengan bentuk visual yang menarik"""
     
+    # Atlas sprite bersama (dibuat saat komponen pertama digambar)
+    atlas = None
+    
+    @classmethod
+    def get_atlas(cls):
+        """Atlas sprite komponen bersama"""
+        if cls.atlas is None:
+            cls.atlas = SpriteAtlas({
+                'battery': lambda s, x, y, size, state, selected: cls.draw_battery(s, x, y, size, selected),
+                'lamp': lambda s, x, y, size, state, selected: cls.draw_lamp(s, x, y, size, selected),
+                'resistor': lambda s, x, y, size, state, selected: cls.draw_resistor(s, x, y, size, selected),
+                'switch': lambda s, x, y, size, state, selected: cls.draw_switch(
+                    s, x, y, size, state or "OFF", selected),
+                'wire': lambda s, x, y, size, state, selected: cls.draw_wire(s, x, y, size, selected)
+            })
+        return cls.atlas
+    
+    def draw_component(self, surface, comp_type, x, y, size, state=None, selected=False):
+        """
+        Gambar komponen dari sprite atlas (satu blit, bukan puluhan primitif)
+        
+        Args:
+            surface: Surface tujuan
+            comp_type: 'battery', 'lamp', 'resistor', 'switch' atau 'wire'
+            x, y: Posisi tengah komponen
+            size: Ukuran (w, h)
+            state: State saklar ('ON'/'OFF'); diabaikan untuk tipe lain
+            selected: Highlight dipilih
+            
+        Returns:
+            pygame.Rect: Area yang digambar (None untuk tipe tidak dikenal)
+        """
+        atlas = self.get_atlas()
+        if comp_type not in atlas.draw_functions:
+            return None
+        if comp_type != 'switch':
+            state = None
+        return atlas.blit(surface, comp_type, x, y, size, state, selected)
+    
     @staticmethod
     def draw_battery(surface, x, y, size, selected=False):
         """Gambar baterai dengan bentuk visual yang menarik dan kontras tinggi"""
@@ -28,7 +70,7 @@ class ComponentRenderer:
         pygame.draw.rect(surface, (255, 255, 255), pos_terminal, 2)
         
         # Label + dan - dengan font yang lebih besar
-        font = pygame.font.Font(None, 28)
+        font = TEXT_CACHE.font(28)
         plus_text = font.render("+", True, (255, 255, 0))
         minus_text = font.render("-", True, (255, 255, 0))
         surface.blit(plus_text, (x + 15, y - 10))
@@ -89,7 +131,7 @@ class ComponentRenderer:
                            (line_x, y - 10), (line_x, y + 10), 4)
         
         # Label "RESISTOR"
-        font = pygame.font.Font(None, 20)
+        font = TEXT_CACHE.font(20)
         label_text = font.render("RESISTOR", True, (0, 0, 0))
         label_rect = label_text.get_rect(center=(x, y + 20))
         surface.blit(label_text, label_rect)
@@ -130,13 +172,13 @@ class ComponentRenderer:
             status_color = (192, 192, 192)
         
         # Label status
-        font = pygame.font.Font(None, 24)
+        font = TEXT_CACHE.font(24)
         label_text = font.render(status_text, True, status_color)
         label_rect = label_text.get_rect(center=(x, y + 18))
         surface.blit(label_text, label_rect)
         
         # Label "SAKLAR"
-        switch_font = pygame.font.Font(None, 20)
+        switch_font = TEXT_CACHE.font(20)
         switch_text = switch_font.render("SAKLAR", True, (255, 255, 255))
         switch_rect = switch_text.get_rect(center=(x, y - 20))
         surface.blit(switch_text, switch_rect)
@@ -163,7 +205,7 @@ class ComponentRenderer:
                            (x - 8, y), (x + 5, y - 8), 4)
         
         # Label ON/OFF
-        font = pygame.font.Font(None, 16)
+        font = TEXT_CACHE.font(16)
         state_text = font.render(state, True, lever_color)
         text_rect = state_text.get_rect(center=(x, y + 15))
         surface.blit(state_text, text_rect)
@@ -203,7 +245,7 @@ class ComponentRenderer:
         pygame.draw.circle(surface, (80, 80, 80), (x + w//2 - 15, y), terminal_size, 2)
         
         # Label "KABEL"
-        wire_font = pygame.font.Font(None, 18)
+        wire_font = TEXT_CACHE.font(18)
         wire_text = wire_font.render("KABEL", True, (255, 255, 255))
         wire_rect = wire_text.get_rect(center=(x, y + 15))
         surface.blit(wire_text, wire_rect)
@@ -2,6 +2,6 @@
 Utils Module Initialization
 """
 
-# Placeholder for utility functions
+from .profiling import NULL_TIMER, NullTimer, StageTimer, percentile
 
-__all__ = []
+__all__ = ['StageTimer', 'NullTimer', 'NULL_TIMER', 'percentile']
@@ -0,0 +1,126 @@
+"""
+Frame Buffers Module
+Buffer frame yang dipakai ulang antar frame (mirror, RGB, overlay, blend, resize) sehingga
+cv2.flip/cvtColor/addWeighted menulis ke memori yang sudah dialokasikan, dan turunan
+satu frame (RGB, versi kecil) dihitung paling banyak sekali lalu dipakai bersama
+"""
+
+import cv2
+import numpy as np
+
+
+class FrameBuffers:
+    """Pool buffer bernama; buffer dialokasikan ulang hanya jika ukuran frame berubah
+
+    Isi buffer ditimpa pada frame berikutnya: konsumen yang menyimpan frame lebih lama
+    dari satu langkah pipeline (antrian, thread lain) harus menyalinnya sendiri.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Dapatkan buffer (isinya tidak dibersihkan)
+
+        Args:
+            name: Nama buffer, misalnya 'mirror' atau 'overlay'
+            shape: Bentuk array
+            dtype: Tipe data
+
+        Returns:
+            np.ndarray
+        """
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(shape, dtype=dtype)
+            self.allocations += 1
+        return buffer
+
+    def zeros(self, name, shape, dtype=np.uint8):
+        """Buffer yang sudah diisi nol (pengganti np.zeros per frame)"""
+        buffer = self.get(name, shape, dtype)
+        buffer.fill(0)
+        return buffer
+
+    def mirror(self, frame, name='mirror'):
+        """Flip horizontal (efek cermin) ke buffer; frame sumber tidak diubah"""
+        return cv2.flip(frame, 1, dst=self.get(name, frame.shape, frame.dtype))
+
+    def copy(self, frame, name='copy'):
+        """Salin frame ke buffer (pengganti frame.copy() per frame)"""
+        buffer = self.get(name, frame.shape, frame.dtype)
+        np.copyto(buffer, frame)
+        return buffer
+
+    def blend(self, src1, alpha, src2, beta, gamma=0, name='blend'):
+        """cv2.addWeighted ke buffer"""
+        return cv2.addWeighted(src1, alpha, src2, beta, gamma,
+                               dst=self.get(name, src1.shape, src1.dtype))
+
+    def views(self, frame):
+        """
+        Bungkus frame BGR agar turunannya dihitung sekali per frame
+
+        Args:
+            frame: Frame BGR (biasanya hasil mirror)
+
+        Returns:
+            FrameViews
+        """
+        return FrameViews(frame, self)
+
+
+class FrameViews:
+    """Satu frame BGR beserta turunan yang dihitung saat pertama diminta"""
+
+    __slots__ = ('bgr', 'buffers', '_rgb', '_resized')
+
+    def __init__(self, bgr, buffers):
+        self.bgr = bgr
+        self.buffers = buffers
+        self._rgb = None
+        self._resized = {}
+
+    @property
+    def shape(self):
+        return self.bgr.shape
+
+    @property
+    def has_rgb(self):
+        """True jika versi RGB sudah dihitung untuk frame ini"""
+        return self._rgb is not None
+
+    def rgb(self):
+        """
+        Versi RGB frame (untuk MediaPipe)
+
+        Dihitung dari isi frame saat pertama kali diminta, jadi minta sebelum frame
+        dianotasi jika RGB harus bersih dari gambar landmark.
+        """
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB,
+                                     dst=self.buffers.get('rgb', self.bgr.shape, self.bgr.dtype))
+        return self._rgb
+
+    def resized(self, size, interpolation=cv2.INTER_AREA):
+        """
+        Versi BGR yang diperkecil/diperbesar
+
+        Args:
+            size: Ukuran tujuan (lebar, tinggi)
+            interpolation: Metode interpolasi OpenCV
+
+        Returns:
+            np.ndarray
+        """
+        size = tuple(size)
+        resized = self._resized.get(size)
+        if resized is None:
+            width, height = size
+            shape = (height, width) + self.bgr.shape[2:]
+            buffer = self.buffers.get(('resize', size), shape, self.bgr.dtype)
+            resized = self._resized[size] = cv2.resize(self.bgr, size, dst=buffer,
+                                                       interpolation=interpolation)
+        return resized
@@ -0,0 +1,214 @@
+"""
+Metrics Module
+Timer per tahap (histogram), counter dan gauge ringan untuk hot path, dengan output
+format Prometheus (/metrics) dan ringkasan untuk HUD debug pygame
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+
+from .profiling import percentile
+
+# Batas bucket histogram durasi tahap (detik)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+STAGE_METRIC = 'cv_stage_seconds'
+
+_NULL_CONTEXT = nullcontext()
+
+
+def _format_labels(labels):
+    """Format label Prometheus: {a="1",b="2"}"""
+    if not labels:
+        return ''
+    inner = ','.join(f'{key}="{str(value)}"' for key, value in labels)
+    return '{' + inner + '}'
+
+
+class _StageTimer:
+    """Context manager yang mencatat durasi satu tahap ke registry"""
+
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class Histogram:
+    """Histogram bucket kumulatif + jendela sampel terakhir untuk HUD"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=120):
+        """
+        Initialize histogram
+
+        Args:
+            buckets: Batas atas bucket (detik, naik)
+            window: Jumlah sampel terakhir yang disimpan untuk ringkasan HUD
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value):
+        """Catat satu nilai"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+
+class MetricsRegistry:
+    """Registry metrics thread-safe; saat disabled setiap panggilan hampir tanpa biaya"""
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize registry
+
+        Args:
+            enabled: Aktifkan pencatatan
+            buckets: Bucket histogram tahap (detik)
+        """
+        self.enabled = enabled
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._gauges = {}
+        self._collectors = []
+
+    def stage(self, name):
+        """
+        Context manager untuk mengukur satu tahap (interface sama dengan StageTimer)
+
+        Args:
+            name: Nama tahap, misalnya 'detect' atau 'render.camera'
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _StageTimer(self, name)
+
+    def observe(self, name, seconds):
+        """Catat durasi tahap (detik)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._stages.get(name)
+            if histogram is None:
+                histogram = self._stages[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        """Tambah counter"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        """Set nilai gauge"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def add_collector(self, collector):
+        """
+        Daftarkan callback yang dipanggil saat scrape
+
+        Args:
+            collector: Callable yang mengembalikan iterable (type, name, labels dict, value)
+                       dengan type 'counter' atau 'gauge' (misalnya queue depth per sesi)
+        """
+        self._collectors.append(collector)
+
+    def reset(self):
+        """Hapus semua nilai yang tercatat"""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def summary(self):
+        """
+        Ringkasan tahap dari jendela sampel terakhir (untuk HUD)
+
+        Returns:
+            dict: {stage: {'count', 'mean_ms', 'p95_ms'}}
+        """
+        with self._lock:
+            stages = {name: (h.count, list(h.recent)) for name, h in self._stages.items()}
+        result = {}
+        for name, (count, recent) in stages.items():
+            result[name] = {
+                'count': count,
+                'mean_ms': sum(recent) / len(recent) * 1000 if recent else 0.0,
+                'p95_ms': percentile(recent, 0.95) * 1000
+            }
+        return result
+
+    def render_prometheus(self):
+        """
+        Render semua metrics dalam format teks Prometheus
+
+        Returns:
+            str: Body untuk route /metrics
+        """
+        with self._lock:
+            stages = {name: (list(h.counts), h.count, h.sum) for name, h in self._stages.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        for collector in list(self._collectors):
+            try:
+                for metric_type, name, labels, value in collector():
+                    key = (name, tuple(sorted(labels.items())))
+                    (counters if metric_type == 'counter' else gauges)[key] = value
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+
+        lines = []
+        if stages:
+            lines.append(f'# HELP {STAGE_METRIC} Durasi tahap pipeline frame')
+            lines.append(f'# TYPE {STAGE_METRIC} histogram')
+            for name in sorted(stages):
+                counts, count, total = stages[name]
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    labels = _format_labels((('stage', name), ('le', le)))
+                    lines.append(f'{STAGE_METRIC}_bucket{labels} {cumulative}')
+                labels = _format_labels((('stage', name),))
+                lines.append(f'{STAGE_METRIC}_sum{labels} {total:.6f}')
+                lines.append(f'{STAGE_METRIC}_count{labels} {count}')
+
+        for metric_type, values in (('counter', counters), ('gauge', gauges)):
+            declared = set()
+            for (name, labels), value in sorted(values.items(), key=lambda item: item[0]):
+                if name not in declared:
+                    lines.append(f'# TYPE {name} {metric_type}')
+                    declared.add(name)
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Registry global; CV_METRICS=0 menonaktifkan pencatatan
+METRICS = MetricsRegistry(enabled=os.environ.get('CV_METRICS', '1') != '0')
@@ -0,0 +1,77 @@
+"""
+Profiling Utilities
+Pengukuran latensi per tahap pipeline (deteksi, interaksi, perhitungan, render)
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+
+def percentile(values, fraction):
+    """Hitung persentil sederhana (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class StageTimer:
+    """Kumpulkan durasi setiap tahap pipeline per frame (milidetik)"""
+
+    def __init__(self):
+        """Initialize timer"""
+        self.samples = defaultdict(list)
+        self.enabled = True
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Context manager untuk mengukur satu tahap
+
+        Args:
+            name: Nama tahap (misalnya 'detect', 'render')
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append((time.perf_counter() - start) * 1000)
+
+    def reset(self):
+        """Hapus semua sampel (misalnya setelah warm-up)"""
+        self.samples.clear()
+
+    def summary(self):
+        """
+        Ringkasan latensi per tahap
+
+        Returns:
+            dict: {stage: {'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}}
+        """
+        result = {}
+        for name, values in self.samples.items():
+            result[name] = {
+                'count': len(values),
+                'mean_ms': round(sum(values) / len(values), 3) if values else 0.0,
+                'p50_ms': round(percentile(values, 0.50), 3),
+                'p95_ms': round(percentile(values, 0.95), 3),
+                'p99_ms': round(percentile(values, 0.99), 3),
+                'max_ms': round(max(values), 3) if values else 0.0
+            }
+        return result
+
+
+class NullTimer:
+    """Timer tanpa biaya untuk loop aplikasi normal"""
+
+    def stage(self, name):
+        """Tidak mengukur apa pun"""
+        return nullcontext()
+
+
+NULL_TIMER = NullTimer()
@@ -0,0 +1,90 @@
+"""
+Startup Module
+Catat waktu cold start per fase (import, pygame, kamera, detector) dan status kesiapan
+server; hanya memakai standard library agar bisa diimpor sebelum modul berat dimuat
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from .metrics import METRICS
+
+STATE_STARTING = 'starting'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+
+class StartupReport:
+    """Durasi setiap fase startup dan status kesiapan (thread-safe)"""
+
+    def __init__(self, started_at=None):
+        """
+        Initialize report
+
+        Args:
+            started_at: Waktu mulai (time.perf_counter) untuk elapsed; default sekarang
+        """
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases = {}  # nama fase -> durasi (detik), urut sesuai selesai
+        self.state = STATE_STARTING
+        self.error = None
+        self.ready_at = None
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        """Simpan durasi satu fase (juga sebagai gauge cv_startup_phase_seconds)"""
+        with self._lock:
+            self.phases[name] = seconds
+        METRICS.set_gauge('cv_startup_phase_seconds', seconds, phase=name)
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager yang mengukur satu fase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def set_ready(self):
+        """Tandai startup selesai"""
+        with self._lock:
+            self.state = STATE_READY
+            self.error = None
+            self.ready_at = time.perf_counter()
+        METRICS.set_gauge('cv_startup_seconds', self.ready_at - self.started_at)
+
+    def set_failed(self, error):
+        """Tandai startup gagal (server tetap jalan, pipeline dibuat ulang saat diminta)"""
+        with self._lock:
+            self.state = STATE_FAILED
+            self.error = str(error)
+
+    @property
+    def is_ready(self):
+        return self.state == STATE_READY
+
+    def as_dict(self):
+        """
+        Ringkasan untuk endpoint /ready
+
+        Returns:
+            dict: {'state', 'ready', 'elapsed_ms', 'phases_ms', 'error'}
+        """
+        with self._lock:
+            end = self.ready_at if self.ready_at is not None else time.perf_counter()
+            return {
+                'state': self.state,
+                'ready': self.state == STATE_READY,
+                'elapsed_ms': round((end - self.started_at) * 1000, 1),
+                'phases_ms': {name: round(seconds * 1000, 1)
+                              for name, seconds in self.phases.items()},
+                'error': self.error
+            }
+
+    def format(self):
+        """Satu baris ringkasan untuk log"""
+        summary = self.as_dict()
+        phases = ', '.join(f"{name} {ms:.0f} ms" for name, ms in summary['phases_ms'].items())
+        return f"Cold start {summary['elapsed_ms']:.0f} ms ({phases})"
@@ -0,0 +1,293 @@
+"""
+Async Web Streaming Server untuk CV Application
+Alternatif asyncio (aiohttp) untuk web_cv_server.py: satu event loop melayani
+ratusan penonton MJPEG, inference dan encode berjalan di executor
+"""
+
+import time
+
+# Awal import modul server (fase 'server_imports' di /ready)
+_IMPORT_START = time.perf_counter()
+
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import jinja2
+from aiohttp import web
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.streaming.async_hub import AsyncCircuitEventHub, AsyncFrameHub
+from src.streaming.broadcaster import MJPEG_BOUNDARY, format_mjpeg_part
+from src.streaming.circuit_events import format_sse_event, parse_last_event_id
+from src.streaming.session_manager import SessionManager, sanitize_frame_source
+from src.streaming.web_common import (INDEX_TEMPLATE, create_streamer, session_metrics_collector,
+                                      start_warm_up)
+from src.utils.metrics import METRICS
+from src.utils.startup import StartupReport
+
+SESSION_MANAGER_KEY = web.AppKey('session_manager', SessionManager)
+EXECUTOR_KEY = web.AppKey('executor', ThreadPoolExecutor)
+HUBS_KEY = web.AppKey('hubs', dict)
+EVENT_HUBS_KEY = web.AppKey('event_hubs', dict)
+STARTUP_KEY = web.AppKey('startup', StartupReport)
+
+index_template = jinja2.Environment(autoescape=True).from_string(INDEX_TEMPLATE)
+
+
+async def get_request_session(request):
+    """Resolve the streaming session for the current request (?session=<id>)"""
+    payload = {}
+    if request.can_read_body:
+        try:
+            payload = await request.json()
+        except ValueError:
+            payload = {}
+    session_id = request.query.get('session') or payload.get('session') or 'default'
+    frame_source = sanitize_frame_source(request.query.get('source') or payload.get('source'))
+
+    # Membuat sesi baru memuat MediaPipe (blocking), jalankan di executor
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app[EXECUTOR_KEY],
+                                      request.app[SESSION_MANAGER_KEY].get_session,
+                                      session_id, frame_source)
+
+
+def session_error_response(error):
+    """Convert session errors to JSON responses"""
+    status = 400 if isinstance(error, ValueError) else 503
+    return web.json_response({'error': str(error)}, status=status)
+
+
+def get_frame_hub(app, session):
+    """Get (or create) the async hub for a session's broadcaster"""
+    hubs = app[HUBS_KEY]
+    hub = hubs.get(session.session_id)
+    if hub is None or hub.broadcaster is not session.streamer.broadcaster:
+        hub = AsyncFrameHub(session.streamer.broadcaster, app[EXECUTOR_KEY])
+        hubs[session.session_id] = hub
+    return hub
+
+
+def get_event_hub(app, session):
+    """Get (or create) the async SSE hub for a session's circuit channel"""
+    hubs = app[EVENT_HUBS_KEY]
+    hub = hubs.get(session.session_id)
+    if hub is None or hub.channel is not session.streamer.circuit_channel:
+        hub = AsyncCircuitEventHub(session.streamer.circuit_channel, app[EXECUTOR_KEY])
+        hubs[session.session_id] = hub
+    return hub
+
+
+async def index(request):
+    """Main page with embedded video stream"""
+    session_id = request.query.get('session', 'default')
+    video_feed_url = str(request.app.router['video_feed'].url_for().with_query(session=session_id))
+    html = index_template.render(session_id=session_id, video_feed_url=video_feed_url)
+    return web.Response(text=html, content_type='text/html')
+
+
+async def video_feed(request):
+    """Video streaming route"""
+    try:
+        session = await get_request_session(request)
+    except (ValueError, RuntimeError) as error:
+        return session_error_response(error)
+
+    response = web.StreamResponse(headers={
+        'Content-Type': f'multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}',
+        'Cache-Control': 'no-cache'
+    })
+    await response.prepare(request)
+
+    streamer = session.streamer
+    hub = get_frame_hub(request.app, session)
+    try:
+        async for data, timestamp in hub.frames(lambda: streamer.is_running):
+            await response.write(format_mjpeg_part(data, timestamp))
+    except (ConnectionResetError, asyncio.CancelledError):
+        # Client menutup koneksi
+        pass
+    return response
+
+
+async def start_stream(request):
+    """Start CV streaming"""
+    try:
+        session = await get_request_session(request)
+    except (ValueError, RuntimeError) as error:
+        return session_error_response(error)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(request.app[EXECUTOR_KEY], session.streamer.start_streaming)
+    return web.json_response({'status': 'started', 'session': session.session_id})
+
+
+async def stop_stream(request):
+    """Stop CV streaming"""
+    try:
+        session = await get_request_session(request)
+    except (ValueError, RuntimeError) as error:
+        return session_error_response(error)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(request.app[EXECUTOR_KEY], session.streamer.stop_streaming)
+    return web.json_response({'status': 'stopped', 'session': session.session_id})
+
+
+async def circuit_data(request):
+    """Get current circuit data"""
+    try:
+        session = await get_request_session(request)
+    except (ValueError, RuntimeError) as error:
+        return session_error_response(error)
+    return web.json_response(session.streamer.get_circuit_data())
+
+
+async def circuit_events(request):
+    """Push circuit changes as Server-Sent Events (versioned deltas)"""
+    try:
+        session = await get_request_session(request)
+    except (ValueError, RuntimeError) as error:
+        return session_error_response(error)
+
+    last_version = parse_last_event_id(request.headers.get('Last-Event-ID') or request.query.get('since'))
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    await response.prepare(request)
+
+    hub = get_event_hub(request.app, session)
+    try:
+        await response.write(b'retry: 2000\n\n')
+        async for event_type, payload in hub.events(last_version):
+            if event_type is None:
+                await response.write(b': keepalive\n\n')
+            else:
+                await response.write(format_sse_event(event_type, payload).encode('utf-8'))
+    except (ConnectionResetError, asyncio.CancelledError):
+        # Client menutup koneksi
+        pass
+    return response
+
+
+async def stream_stats(request):
+    """Get capture pipeline statistics"""
+    try:
+        session = await get_request_session(request)
+    except (ValueError, RuntimeError) as error:
+        return session_error_response(error)
+    stats = session.streamer.get_capture_stats()
+    stats['broadcast'] = session.streamer.broadcaster.get_stats()
+    stats['encoder'] = session.streamer.encoder.get_stats()
+    stats['overlay'] = session.streamer.overlay.get_stats()
+    stats['inference'] = session.streamer.pinch_detector.get_inference_stats()
+    hub = request.app[HUBS_KEY].get(session.session_id)
+    stats['async_viewers'] = hub.viewers if hub else 0
+    stats['async_quality'] = [c.get_stats() for c in list(hub.controllers)] if hub else []
+    return web.json_response(stats)
+
+
+async def sessions(request):
+    """List active streaming sessions"""
+    manager = request.app[SESSION_MANAGER_KEY]
+    return web.json_response({
+        'sessions': manager.list_sessions(),
+        'max_sessions': manager.max_sessions,
+        'evicted': manager.sessions_evicted
+    })
+
+
+async def ready(request):
+    """Readiness: 200 setelah kamera dan detector siap, 503 selama warm-up (plus durasi per fase)"""
+    status = request.app[STARTUP_KEY].as_dict()
+    return web.json_response(status, status=200 if status['ready'] else 503)
+
+
+async def metrics(request):
+    """Prometheus metrics: histogram per tahap, frame terbuang, kedalaman antrean"""
+    return web.Response(text=METRICS.render_prometheus(), content_type='text/plain')
+
+
+async def on_startup(app):
+    """Warm-up sesi default di background setelah server siap menerima koneksi"""
+    start_warm_up(app[SESSION_MANAGER_KEY], app[STARTUP_KEY])
+
+
+async def on_shutdown(app):
+    """Stop all sessions and the executor"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, app[SESSION_MANAGER_KEY].shutdown)
+    app[EXECUTOR_KEY].shutdown(wait=False)
+
+
+def create_app(frame_source=None, max_sessions=None, max_workers=None, idle_timeout=None):
+    """
+    Buat aplikasi aiohttp
+
+    Args:
+        frame_source: Sumber frame default (default: env CV_FRAME_SOURCE atau kamera 0)
+        max_sessions: Jumlah sesi maksimum
+        max_workers: Jumlah frame yang diproses bersamaan lintas sesi
+        idle_timeout: Timeout sesi tanpa penonton (detik)
+
+    Returns:
+        web.Application
+    """
+    if frame_source is None:
+        frame_source = os.environ.get('CV_FRAME_SOURCE', '0')
+    if max_sessions is None:
+        max_sessions = int(os.environ.get('CV_MAX_SESSIONS', 8))
+    if max_workers is None:
+        max_workers = int(os.environ.get('CV_MAX_WORKERS', os.cpu_count() or 4))
+    if idle_timeout is None:
+        idle_timeout = float(os.environ.get('CV_SESSION_IDLE_TIMEOUT', 120))
+
+    app = web.Application()
+    startup = app[STARTUP_KEY] = StartupReport(started_at=_IMPORT_START)
+    startup.record('server_imports', time.perf_counter() - _IMPORT_START)
+    app[SESSION_MANAGER_KEY] = SessionManager(
+        lambda source, inference_slots: create_streamer(source, inference_slots, startup),
+        default_source=frame_source,
+        max_sessions=max_sessions,
+        max_workers=max_workers,
+        idle_timeout=idle_timeout,
+        evict_after=float(os.environ.get('CV_SESSION_EVICT_AFTER', 30))
+    )
+    METRICS.add_collector(session_metrics_collector(app[SESSION_MANAGER_KEY]))
+    # Executor untuk kerja blocking: satu pump per sesi + start/stop + pembuatan sesi
+    app[EXECUTOR_KEY] = ThreadPoolExecutor(max_workers=max_sessions * 2 + 4,
+                                           thread_name_prefix='cv-async')
+    app[HUBS_KEY] = {}
+    app[EVENT_HUBS_KEY] = {}
+
+    app.router.add_get('/', index)
+    app.router.add_get('/video_feed', video_feed, name='video_feed')
+    app.router.add_post('/start_stream', start_stream)
+    app.router.add_post('/stop_stream', stop_stream)
+    app.router.add_get('/circuit_data', circuit_data)
+    app.router.add_get('/circuit_events', circuit_events)
+    app.router.add_get('/stream_stats', stream_stats)
+    app.router.add_get('/sessions', sessions)
+    app.router.add_get('/ready', ready)
+    app.router.add_get('/metrics', metrics)
+    app.on_startup.append(on_startup)
+    app.on_shutdown.append(on_shutdown)
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Async Embedded CV Circuit Builder server')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--source', default=None,
+                        help="Index kamera, 'synthetic' atau path file video")
+    args = parser.parse_args()
+
+    print("Starting Embedded CV Circuit Builder (async)...")
+    print(f"Access at: http://localhost:{args.port}")
+    web.run_app(create_app(frame_source=args.source), host=args.host, port=args.port)
@@ -33,10 +33,9 @@ export default function EmbeddedPythonCV() {
       })
 
       if (response.ok) {
-        // Wait a moment for server to fully start
-        setTimeout(() => {
-          setStatus('running')
-        }, 3000)
+        // Route menunggu sampai server menjawab /ready; warm-up kamera/detector
+        // berjalan di background dan /start_stream menunggunya
+        setStatus('running')
       } else if (response.status === 409) {
         // Server already running
         console.log('Server already running (409), switching to running state')